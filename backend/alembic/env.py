@@ -19,7 +19,23 @@ DATABASE_URL = os.getenv(
 from app.db import Base  # noqa: E402
 
 # Import all models so they register on Base.metadata
-from app.models import Assignment, File, User, Activity  # noqa: F401,E402
+from app.models import (  # noqa: F401,E402
+    Activity,
+    Assignment,
+    CalculationTemplate,
+    File,
+    IdempotencyKey,
+    Invoice,
+    InvoiceItem,
+    Job,
+    Notification,
+    NotificationCounter,
+    RateLimitBucket,
+    Reminder,
+    SchedulerState,
+    SyncTombstone,
+    User,
+)
 from app.models.master_data import Bank, Branch, Client, PropertyType  # noqa: F401,E402
 
 target_metadata = Base.metadata
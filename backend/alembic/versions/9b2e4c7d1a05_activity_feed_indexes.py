@@ -0,0 +1,47 @@
+"""activity feed indexes
+
+Revision ID: 9b2e4c7d1a05
+Revises: 4ed038042f28
+Create Date: 2026-10-19 10:12:41.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9b2e4c7d1a05'
+down_revision: Union[str, Sequence[str], None] = '4ed038042f28'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_activities_assignment_created',
+        'activities',
+        ['assignment_id', sa.text('created_at DESC')],
+        unique=False,
+    )
+    op.create_index(
+        'ix_activities_actor_created',
+        'activities',
+        ['actor_user_id', sa.text('created_at DESC')],
+        unique=False,
+    )
+    op.create_index(
+        'ix_activities_created_at_desc',
+        'activities',
+        [sa.text('created_at DESC')],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_activities_created_at_desc', table_name='activities')
+    op.drop_index('ix_activities_actor_created', table_name='activities')
+    op.drop_index('ix_activities_assignment_created', table_name='activities')
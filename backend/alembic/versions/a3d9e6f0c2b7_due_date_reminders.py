@@ -0,0 +1,75 @@
+"""due date reminders
+
+Revision ID: a3d9e6f0c2b7
+Revises: f7a2c5e8b1d6
+Create Date: 2026-10-19 17:12:44.207531
+
+reminders: one row per (assignment, kind, target date), written by the
+scheduler in app/utils/reminders.py. scheduler_state keeps each periodic
+job's watermark so a run only looks at new candidates.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3d9e6f0c2b7'
+down_revision: Union[str, Sequence[str], None] = 'f7a2c5e8b1d6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+OPEN_STATUS_SQL = "upper(coalesce(status, '')) NOT IN ('COMPLETED', 'CANCELLED')"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'reminders',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('assignment_id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=True),
+        sa.Column('kind', sa.String(length=32), nullable=False),
+        sa.Column('target_date', sa.Date(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['assignment_id'], ['assignments.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='SET NULL'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('assignment_id', 'kind', 'target_date', name='uq_reminder_assignment_kind_date'),
+    )
+    op.create_index(op.f('ix_reminders_id'), 'reminders', ['id'], unique=False)
+    op.create_index(
+        'ix_reminders_user_created',
+        'reminders',
+        ['user_id', sa.text('created_at DESC')],
+        unique=False,
+    )
+
+    op.create_table(
+        'scheduler_state',
+        sa.Column('name', sa.String(length=64), nullable=False),
+        sa.Column('state', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('name'),
+    )
+
+    op.create_index(
+        'ix_assignments_open_report_due',
+        'assignments',
+        ['report_due_date', 'id'],
+        unique=False,
+        postgresql_where=sa.text(OPEN_STATUS_SQL),
+    )
+    op.create_index('ix_assignments_updated_at', 'assignments', ['updated_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_assignments_updated_at', table_name='assignments')
+    op.drop_index('ix_assignments_open_report_due', table_name='assignments')
+    op.drop_table('scheduler_state')
+    op.drop_index('ix_reminders_user_created', table_name='reminders')
+    op.drop_index(op.f('ix_reminders_id'), table_name='reminders')
+    op.drop_table('reminders')
@@ -0,0 +1,91 @@
+"""delta sync
+
+Revision ID: a7d4c2e9f1b3
+Revises: f3b9d1e7a4c2
+Create Date: 2026-10-20 10:12:48.530917
+
+change_xid on every synced table, stamped by trigger with the writing
+transaction's id, plus sync_tombstones for deletes (app/utils/sync.py).
+
+Existing rows keep change_xid = 0 (constant default: no table rewrite), so
+they are part of every full sync and of no delta.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7d4c2e9f1b3'
+down_revision: Union[str, Sequence[str], None] = 'f3b9d1e7a4c2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SYNCED_TABLES = ('banks', 'branches', 'clients', 'property_types', 'assignments', 'files', 'activities')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'sync_tombstones',
+        sa.Column('id', sa.BigInteger(), nullable=False),
+        sa.Column('table_name', sa.String(length=32), nullable=False),
+        sa.Column('row_id', sa.Integer(), nullable=False),
+        sa.Column('change_xid', sa.BigInteger(), nullable=False),
+        sa.Column('deleted_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_sync_tombstones_change_xid', 'sync_tombstones', ['change_xid', 'id'], unique=False)
+    op.create_index('ix_sync_tombstones_deleted_at', 'sync_tombstones', ['deleted_at'], unique=False)
+
+    op.execute(
+        """
+        CREATE FUNCTION zen_sync_stamp() RETURNS trigger AS $$
+        BEGIN
+            NEW.change_xid := pg_current_xact_id()::text::bigint;
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+        """
+    )
+    # TG_ARGV[0] is the logical table name (activities rows live in partitions)
+    op.execute(
+        """
+        CREATE FUNCTION zen_sync_tombstone() RETURNS trigger AS $$
+        BEGIN
+            INSERT INTO sync_tombstones (table_name, row_id, change_xid, deleted_at)
+            VALUES (TG_ARGV[0], OLD.id, pg_current_xact_id()::text::bigint, now() AT TIME ZONE 'utc');
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+        """
+    )
+
+    for table in SYNCED_TABLES:
+        op.add_column(table, sa.Column('change_xid', sa.BigInteger(), server_default='0', nullable=False))
+        op.create_index(f'ix_{table}_change_xid', table, ['change_xid', 'id'], unique=False)
+        op.execute(
+            f'CREATE TRIGGER zen_sync_stamp BEFORE INSERT OR UPDATE ON "{table}" '
+            f'FOR EACH ROW EXECUTE FUNCTION zen_sync_stamp()'
+        )
+        op.execute(
+            f'CREATE TRIGGER zen_sync_tombstone AFTER DELETE ON "{table}" '
+            f"FOR EACH ROW EXECUTE FUNCTION zen_sync_tombstone('{table}')"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in reversed(SYNCED_TABLES):
+        op.execute(f'DROP TRIGGER zen_sync_tombstone ON "{table}"')
+        op.execute(f'DROP TRIGGER zen_sync_stamp ON "{table}"')
+        op.drop_index(f'ix_{table}_change_xid', table_name=table)
+        op.drop_column(table, 'change_xid')
+
+    op.execute('DROP FUNCTION zen_sync_tombstone()')
+    op.execute('DROP FUNCTION zen_sync_stamp()')
+
+    op.drop_index('ix_sync_tombstones_deleted_at', table_name='sync_tombstones')
+    op.drop_index('ix_sync_tombstones_change_xid', table_name='sync_tombstones')
+    op.drop_table('sync_tombstones')
@@ -0,0 +1,40 @@
+"""rate limit buckets
+
+Revision ID: b8e2f4a6c1d7
+Revises: a7d4c2e9f1b3
+Create Date: 2026-10-20 01:12:48.530117
+
+rate_limit_buckets: token buckets shared across workers
+(app/utils/rate_limit.py, ZEN_RATE_LIMIT_SHARED=1). UNLOGGED, since the
+state is disposable.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8e2f4a6c1d7'
+down_revision: Union[str, Sequence[str], None] = 'a7d4c2e9f1b3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'rate_limit_buckets',
+        sa.Column('key', sa.String(length=200), nullable=False),
+        sa.Column('tokens', sa.Float(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('key'),
+        prefixes=['UNLOGGED'],
+    )
+    op.create_index('ix_rate_limit_buckets_updated_at', 'rate_limit_buckets', ['updated_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_rate_limit_buckets_updated_at', table_name='rate_limit_buckets')
+    op.drop_table('rate_limit_buckets')
@@ -0,0 +1,36 @@
+"""assignment code year index
+
+Revision ID: c2a6e8f4d1b9
+Revises: b8e2f4a6c1d7
+Create Date: 2026-10-20 09:27:41.204816
+
+Expression index behind generate_assignment_code() (app/utils/assignment_code.py):
+the year's highest VAL/<year>/<n> is one backward index step instead of an
+aggregate over every code issued that year.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c2a6e8f4d1b9'
+down_revision: Union[str, Sequence[str], None] = 'b8e2f4a6c1d7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_assignments_code_year_seq',
+        'assignments',
+        [sa.text("split_part(assignment_code, '/', 2)"), sa.text('length(assignment_code)'), 'assignment_code'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_assignments_code_year_seq', table_name='assignments')
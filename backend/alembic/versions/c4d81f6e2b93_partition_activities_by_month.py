@@ -0,0 +1,156 @@
+"""partition activities by month
+
+Revision ID: c4d81f6e2b93
+Revises: 9b2e4c7d1a05
+Create Date: 2026-10-19 11:02:17.540913
+
+Converts `activities` into a RANGE-partitioned table on created_at:
+  - one partition per month that has data, plus the next 3 months
+  - activities_default catches anything outside those ranges
+  - PK becomes (id, created_at) (partition key must be in the PK)
+  - existing id sequence is kept so ids stay monotonic
+
+New months are created at app startup (ensure_activity_partitions) and
+old ones are exported + detached by `python -m app.utils.activity_archive`.
+"""
+from datetime import date
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4d81f6e2b93'
+down_revision: Union[str, Sequence[str], None] = '9b2e4c7d1a05'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+MONTHS_AHEAD = 3
+
+
+def _add_months(d: date, months: int) -> date:
+    idx = d.year * 12 + (d.month - 1) + months
+    return date(idx // 12, idx % 12 + 1, 1)
+
+
+def _create_indexes() -> None:
+    op.create_index('ix_activities_id', 'activities', ['id'], unique=False)
+    op.create_index('ix_activities_assignment_id', 'activities', ['assignment_id'], unique=False)
+    op.create_index('ix_activities_actor_user_id', 'activities', ['actor_user_id'], unique=False)
+    op.create_index(
+        'ix_activities_assignment_created',
+        'activities',
+        ['assignment_id', sa.text('created_at DESC')],
+        unique=False,
+    )
+    op.create_index(
+        'ix_activities_actor_created',
+        'activities',
+        ['actor_user_id', sa.text('created_at DESC')],
+        unique=False,
+    )
+    op.create_index(
+        'ix_activities_created_at_desc',
+        'activities',
+        [sa.text('created_at DESC')],
+        unique=False,
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+
+    op.execute("ALTER TABLE activities RENAME TO activities_unpartitioned")
+    # Keep the sequence alive when the old table is dropped.
+    op.execute("ALTER SEQUENCE activities_id_seq OWNED BY NONE")
+
+    op.execute(
+        """
+        CREATE TABLE activities (
+            id INTEGER NOT NULL DEFAULT nextval('activities_id_seq'),
+            assignment_id INTEGER REFERENCES assignments(id) ON DELETE SET NULL,
+            actor_user_id INTEGER REFERENCES users(id) ON DELETE SET NULL,
+            type VARCHAR(64) NOT NULL,
+            payload JSONB,
+            created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL
+        ) PARTITION BY RANGE (created_at)
+        """
+    )
+
+    row = bind.execute(
+        sa.text(
+            "SELECT date_trunc('month', min(created_at))::date, "
+            "date_trunc('month', max(created_at))::date "
+            "FROM activities_unpartitioned"
+        )
+    ).first()
+
+    this_month = date.today().replace(day=1)
+    first = row[0] if row and row[0] else this_month
+    last = _add_months(max(row[1] if row and row[1] else this_month, this_month), MONTHS_AHEAD)
+
+    month = first
+    while month <= last:
+        nxt = _add_months(month, 1)
+        op.execute(
+            f"CREATE TABLE activities_p{month.year:04d}{month.month:02d} PARTITION OF activities "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{nxt.isoformat()}')"
+        )
+        month = nxt
+    op.execute("CREATE TABLE activities_default PARTITION OF activities DEFAULT")
+
+    op.execute(
+        """
+        INSERT INTO activities (id, assignment_id, actor_user_id, type, payload, created_at)
+        SELECT id, assignment_id, actor_user_id, type, payload, created_at
+        FROM activities_unpartitioned
+        """
+    )
+    op.execute("DROP TABLE activities_unpartitioned")
+
+    op.execute("ALTER SEQUENCE activities_id_seq OWNED BY activities.id")
+    op.execute("ALTER TABLE activities ADD CONSTRAINT activities_pkey PRIMARY KEY (id, created_at)")
+    _create_indexes()
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("ALTER TABLE activities RENAME TO activities_partitioned")
+    op.execute("ALTER SEQUENCE activities_id_seq OWNED BY NONE")
+    op.execute("ALTER TABLE activities_partitioned DROP CONSTRAINT activities_pkey")
+    for name in (
+        'ix_activities_created_at_desc',
+        'ix_activities_actor_created',
+        'ix_activities_assignment_created',
+        'ix_activities_actor_user_id',
+        'ix_activities_assignment_id',
+        'ix_activities_id',
+    ):
+        op.execute(f"DROP INDEX IF EXISTS {name}")
+
+    op.execute(
+        """
+        CREATE TABLE activities (
+            id INTEGER NOT NULL DEFAULT nextval('activities_id_seq'),
+            assignment_id INTEGER REFERENCES assignments(id) ON DELETE SET NULL,
+            actor_user_id INTEGER REFERENCES users(id) ON DELETE SET NULL,
+            type VARCHAR(64) NOT NULL,
+            payload JSONB,
+            created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+            CONSTRAINT activities_pkey PRIMARY KEY (id)
+        )
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO activities (id, assignment_id, actor_user_id, type, payload, created_at)
+        SELECT id, assignment_id, actor_user_id, type, payload, created_at
+        FROM activities_partitioned
+        """
+    )
+    # Drops every attached partition too (detached/archived ones are left alone).
+    op.execute("DROP TABLE activities_partitioned")
+    op.execute("ALTER SEQUENCE activities_id_seq OWNED BY activities.id")
+    _create_indexes()
@@ -0,0 +1,94 @@
+"""invoices
+
+Revision ID: c5f1a9d3e7b2
+Revises: b8e2f4a6c1d3
+Create Date: 2026-10-19 19:22:10.481736
+
+invoices / invoice_items for set-based billing (app/utils/invoices.py),
+plus a partial index over completed-but-unpaid assignments per bank.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5f1a9d3e7b2'
+down_revision: Union[str, Sequence[str], None] = 'b8e2f4a6c1d3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'invoices',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('invoice_number', sa.String(length=32), nullable=False),
+        sa.Column('bank_id', sa.Integer(), nullable=False),
+        sa.Column('branch_id', sa.Integer(), nullable=True),
+        sa.Column('period_from', sa.Date(), nullable=False),
+        sa.Column('period_to', sa.Date(), nullable=False),
+        sa.Column('issue_date', sa.Date(), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('item_count', sa.Integer(), nullable=False),
+        sa.Column('total_amount', sa.BigInteger(), nullable=False),
+        sa.Column('payee_account_name', sa.String(length=200), nullable=True),
+        sa.Column('payee_account_number', sa.String(length=50), nullable=True),
+        sa.Column('payee_ifsc', sa.String(length=20), nullable=True),
+        sa.Column('payee_bank_name', sa.String(length=200), nullable=True),
+        sa.Column('payee_branch_name', sa.String(length=200), nullable=True),
+        sa.Column('payee_upi_id', sa.String(length=100), nullable=True),
+        sa.Column('notes', sa.String(length=500), nullable=True),
+        sa.Column('paid_at', sa.DateTime(), nullable=True),
+        sa.Column('created_by_user_id', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['bank_id'], ['banks.id'], ondelete='RESTRICT'),
+        sa.ForeignKeyConstraint(['branch_id'], ['branches.id'], ondelete='SET NULL'),
+        sa.ForeignKeyConstraint(['created_by_user_id'], ['users.id'], ondelete='SET NULL'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(op.f('ix_invoices_id'), 'invoices', ['id'], unique=False)
+    op.create_index(op.f('ix_invoices_invoice_number'), 'invoices', ['invoice_number'], unique=True)
+    op.create_index(op.f('ix_invoices_bank_id'), 'invoices', ['bank_id'], unique=False)
+    op.create_index(op.f('ix_invoices_branch_id'), 'invoices', ['branch_id'], unique=False)
+
+    op.create_table(
+        'invoice_items',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('invoice_id', sa.Integer(), nullable=False),
+        sa.Column('assignment_id', sa.Integer(), nullable=True),
+        sa.Column('assignment_code', sa.String(length=64), nullable=False),
+        sa.Column('borrower_name', sa.String(length=128), nullable=True),
+        sa.Column('branch_name', sa.String(length=128), nullable=True),
+        sa.Column('amount', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['invoice_id'], ['invoices.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['assignment_id'], ['assignments.id'], ondelete='SET NULL'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('assignment_id'),
+    )
+    op.create_index(op.f('ix_invoice_items_id'), 'invoice_items', ['id'], unique=False)
+    op.create_index('ix_invoice_items_invoice_id', 'invoice_items', ['invoice_id', 'id'], unique=False)
+
+    op.create_index(
+        'ix_assignments_billable',
+        'assignments',
+        ['bank_id', 'created_at'],
+        unique=False,
+        postgresql_where=sa.text("upper(coalesce(status, '')) = 'COMPLETED' AND NOT is_paid"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_assignments_billable', table_name='assignments')
+    op.drop_index('ix_invoice_items_invoice_id', table_name='invoice_items')
+    op.drop_index(op.f('ix_invoice_items_id'), table_name='invoice_items')
+    op.drop_table('invoice_items')
+    op.drop_index(op.f('ix_invoices_branch_id'), table_name='invoices')
+    op.drop_index(op.f('ix_invoices_bank_id'), table_name='invoices')
+    op.drop_index(op.f('ix_invoices_invoice_number'), table_name='invoices')
+    op.drop_index(op.f('ix_invoices_id'), table_name='invoices')
+    op.drop_table('invoices')
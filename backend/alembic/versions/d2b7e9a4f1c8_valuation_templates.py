@@ -0,0 +1,63 @@
+"""valuation templates
+
+Revision ID: d2b7e9a4f1c8
+Revises: c5f1a9d3e7b2
+Create Date: 2026-10-19 20:41:37.215904
+
+calculation_templates (formulas evaluated by app/utils/formula.py) and the
+assignment's valuation input / output JSON.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2b7e9a4f1c8'
+down_revision: Union[str, Sequence[str], None] = 'c5f1a9d3e7b2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'calculation_templates',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(length=200), nullable=False),
+        sa.Column('bank_id', sa.Integer(), nullable=True),
+        sa.Column('property_type_id', sa.Integer(), nullable=True),
+        sa.Column('version', sa.Integer(), nullable=False),
+        sa.Column('formula_definitions_json', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column('required_fields_json', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column('is_active', sa.Boolean(), nullable=False),
+        sa.Column('created_by_user_id', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['bank_id'], ['banks.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['property_type_id'], ['property_types.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['created_by_user_id'], ['users.id'], ondelete='SET NULL'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(op.f('ix_calculation_templates_id'), 'calculation_templates', ['id'], unique=False)
+    op.create_index(
+        'uq_calculation_templates_active_scope',
+        'calculation_templates',
+        [sa.text('coalesce(bank_id, 0)'), sa.text('coalesce(property_type_id, 0)')],
+        unique=True,
+        postgresql_where=sa.text('is_active'),
+    )
+
+    op.add_column('assignments', sa.Column('valuation_input_json', postgresql.JSONB(astext_type=sa.Text()), nullable=True))
+    op.add_column('assignments', sa.Column('valuation_output_json', postgresql.JSONB(astext_type=sa.Text()), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('assignments', 'valuation_output_json')
+    op.drop_column('assignments', 'valuation_input_json')
+    op.drop_index('uq_calculation_templates_active_scope', table_name='calculation_templates')
+    op.drop_index(op.f('ix_calculation_templates_id'), table_name='calculation_templates')
+    op.drop_table('calculation_templates')
@@ -0,0 +1,38 @@
+"""job requesters
+
+Revision ID: d4b8f2a6e1c3
+Revises: c2a6e8f4d1b9
+Create Date: 2026-10-20 11:06:52.918344
+
+jobs.requested_by_user_ids: users whose enqueue was deduplicated onto a job
+someone else created, so GET /api/jobs/{id} shows it to them too.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4b8f2a6e1c3'
+down_revision: Union[str, Sequence[str], None] = 'c2a6e8f4d1b9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'jobs',
+        sa.Column('requested_by_user_ids', postgresql.ARRAY(sa.Integer()), server_default='{}', nullable=False),
+    )
+    op.create_index(
+        'ix_jobs_requested_by_user_ids', 'jobs', ['requested_by_user_ids'], unique=False, postgresql_using='gin'
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_jobs_requested_by_user_ids', table_name='jobs')
+    op.drop_column('jobs', 'requested_by_user_ids')
@@ -0,0 +1,52 @@
+"""assignment workload indexes
+
+Revision ID: e1f3a7c9d2b4
+Revises: c4d81f6e2b93
+Create Date: 2026-10-19 14:05:12.402117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e1f3a7c9d2b4'
+down_revision: Union[str, Sequence[str], None] = 'c4d81f6e2b93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Must match app.models.assignment.OPEN_STATUS_SQL
+OPEN_STATUS_SQL = "upper(coalesce(status, '')) NOT IN ('COMPLETED', 'CANCELLED')"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_assignments_open_assignee_due',
+        'assignments',
+        ['assigned_to', 'report_due_date'],
+        unique=False,
+        postgresql_where=sa.text(OPEN_STATUS_SQL),
+    )
+    op.create_index(
+        'ix_assignments_site_visit_assignee',
+        'assignments',
+        ['site_visit_date', 'assigned_to'],
+        unique=False,
+    )
+    # Without stats on the expression the planner guesses most rows are open
+    # and seq-scans instead of using the partial index (PG14+).
+    op.execute(
+        "CREATE STATISTICS IF NOT EXISTS st_assignments_status_norm "
+        "ON (upper(coalesce(status, ''))) FROM assignments"
+    )
+    op.execute("ANALYZE assignments")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP STATISTICS IF EXISTS st_assignments_status_norm")
+    op.drop_index('ix_assignments_site_visit_assignee', table_name='assignments')
+    op.drop_index('ix_assignments_open_assignee_due', table_name='assignments')
@@ -0,0 +1,78 @@
+"""job queue
+
+Revision ID: e6c3a8f2d9b5
+Revises: d2b7e9a4f1c8
+Create Date: 2026-10-19 21:58:12.604117
+
+jobs table for the Postgres-backed queue (app/utils/jobs.py, app/worker.py).
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e6c3a8f2d9b5'
+down_revision: Union[str, Sequence[str], None] = 'd2b7e9a4f1c8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'jobs',
+        sa.Column('id', sa.BigInteger(), nullable=False),
+        sa.Column('kind', sa.String(length=64), nullable=False),
+        sa.Column('payload', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column('status', sa.String(length=16), nullable=False),
+        sa.Column('priority', sa.SmallInteger(), nullable=False),
+        sa.Column('dedup_key', sa.String(length=200), nullable=True),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('max_attempts', sa.Integer(), nullable=False),
+        sa.Column('run_at', sa.DateTime(), nullable=False),
+        sa.Column('locked_by', sa.String(length=128), nullable=True),
+        sa.Column('heartbeat_at', sa.DateTime(), nullable=True),
+        sa.Column('progress', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        sa.Column('result', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('created_by_user_id', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('started_at', sa.DateTime(), nullable=True),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['created_by_user_id'], ['users.id'], ondelete='SET NULL'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(op.f('ix_jobs_created_by_user_id'), 'jobs', ['created_by_user_id'], unique=False)
+    op.create_index(
+        'ix_jobs_queued',
+        'jobs',
+        [sa.text('priority DESC'), 'run_at', 'id'],
+        unique=False,
+        postgresql_where=sa.text("status = 'QUEUED'"),
+    )
+    op.create_index(
+        'ix_jobs_running_heartbeat',
+        'jobs',
+        ['heartbeat_at'],
+        unique=False,
+        postgresql_where=sa.text("status = 'RUNNING'"),
+    )
+    op.create_index(
+        'uq_jobs_dedup_key_active',
+        'jobs',
+        ['dedup_key'],
+        unique=True,
+        postgresql_where=sa.text("status IN ('QUEUED', 'RUNNING') AND dedup_key IS NOT NULL"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('uq_jobs_dedup_key_active', table_name='jobs')
+    op.drop_index('ix_jobs_running_heartbeat', table_name='jobs')
+    op.drop_index('ix_jobs_queued', table_name='jobs')
+    op.drop_index(op.f('ix_jobs_created_by_user_id'), table_name='jobs')
+    op.drop_table('jobs')
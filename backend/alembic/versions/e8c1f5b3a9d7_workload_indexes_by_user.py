@@ -0,0 +1,61 @@
+"""workload indexes by user
+
+Revision ID: e8c1f5b3a9d7
+Revises: d4b8f2a6e1c3
+Create Date: 2026-10-20 12:31:09.775203
+
+GET /api/assignments/workload now groups by assigned_to_user_id instead of
+the free-text assigned_to; its two indexes follow.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e8c1f5b3a9d7'
+down_revision: Union[str, Sequence[str], None] = 'd4b8f2a6e1c3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Must match app.models.assignment.OPEN_STATUS_SQL
+OPEN_STATUS_SQL = "upper(coalesce(status, '')) NOT IN ('COMPLETED', 'CANCELLED')"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_assignments_open_assignee_user_due',
+        'assignments',
+        ['assigned_to_user_id', 'report_due_date'],
+        unique=False,
+        postgresql_where=sa.text(OPEN_STATUS_SQL),
+    )
+    op.create_index(
+        'ix_assignments_site_visit_assignee_user',
+        'assignments',
+        ['site_visit_date', 'assigned_to_user_id'],
+        unique=False,
+    )
+    op.drop_index('ix_assignments_site_visit_assignee', table_name='assignments')
+    op.drop_index('ix_assignments_open_assignee_due', table_name='assignments')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index(
+        'ix_assignments_open_assignee_due',
+        'assignments',
+        ['assigned_to', 'report_due_date'],
+        unique=False,
+        postgresql_where=sa.text(OPEN_STATUS_SQL),
+    )
+    op.create_index(
+        'ix_assignments_site_visit_assignee',
+        'assignments',
+        ['site_visit_date', 'assigned_to'],
+        unique=False,
+    )
+    op.drop_index('ix_assignments_site_visit_assignee_user', table_name='assignments')
+    op.drop_index('ix_assignments_open_assignee_user_due', table_name='assignments')
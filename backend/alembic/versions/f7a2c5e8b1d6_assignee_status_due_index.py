@@ -0,0 +1,41 @@
+"""assignee status due index
+
+Revision ID: f7a2c5e8b1d6
+Revises: e1f3a7c9d2b4
+Create Date: 2026-10-19 15:41:03.558120
+
+assignments.assigned_to_user_id (FK -> users.id) already exists since
+76cd23c58399. This adds the composite index behind GET /api/assignments/mine
+and drops the single-column index it makes redundant.
+
+Existing rows are backfilled separately, in batches:
+    python -m app.utils.assignees
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f7a2c5e8b1d6'
+down_revision: Union[str, Sequence[str], None] = 'e1f3a7c9d2b4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_assignments_assignee_status_due',
+        'assignments',
+        ['assigned_to_user_id', 'status', 'report_due_date'],
+        unique=False,
+    )
+    op.drop_index('ix_assignments_assigned_to_user_id', table_name='assignments')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index('ix_assignments_assigned_to_user_id', 'assignments', ['assigned_to_user_id'], unique=False)
+    op.drop_index('ix_assignments_assignee_status_due', table_name='assignments')
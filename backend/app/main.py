@@ -1,26 +1,81 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from fastapi.staticfiles import StaticFiles
+from starlette.concurrency import run_in_threadpool
 
 # Import Base ONLY so models can be registered in metadata.
-from app.db import Base, SessionLocal  # noqa: F401
+from app.db import (  # noqa: F401
+    REPLICA_DATABASE_URL,
+    USE_ASYNC_DB,
+    Base,
+    SessionLocal,
+    async_engine,
+    async_replica_engine,
+)
 
 # IMPORTANT: importing models registers tables for Alembic autogenerate
-from app.models import Assignment, File, User, Activity  # noqa: F401
+from app.models import (  # noqa: F401
+    Activity,
+    Assignment,
+    CalculationTemplate,
+    File,
+    IdempotencyKey,
+    Invoice,
+    InvoiceItem,
+    Job,
+    Notification,
+    NotificationCounter,
+    RateLimitBucket,
+    Reminder,
+    SchedulerState,
+    SyncTombstone,
+    User,
+)
 from app.models.master_data import Bank, Branch, Client, PropertyType  # noqa: F401
 
 from app.routers.assignments import router as assignments_router
 from app.routers.auth import router as auth_router
 from app.routers.master_data import router as master_data_router
 from app.routers.files import router as files_router
+from app.routers.invoices import router as invoices_router
+from app.routers.jobs import router as jobs_router
 from app.routers.activity import router as activity_router
+from app.routers.async_reads import router as async_reads_router
+from app.routers.metrics import router as metrics_router
+from app.routers.notifications import router as notifications_router
+from app.routers.stream import router as stream_router
+from app.routers.sync import router as sync_router
+from app.routers.valuations import router as valuations_router
 
+from app.utils.broadcast import start_listener, stop_listener
+from app.utils.compression import ENABLED as COMPRESSION_ENABLED, CompressionMiddleware
+from app.utils.idempotency import register as register_idempotency_purge
+from app.utils.invoice_pdf import shutdown_pool as shutdown_pdf_pool
+from app.utils.partitions import JOB_NAME as PARTITION_JOB, register as register_partition_job
+from app.utils.rate_limit import ENABLED as RATE_LIMIT_ENABLED, RateLimitMiddleware
+from app.utils.rate_limit import register as register_rate_limit_purge
+from app.utils.read_routing import WRITE_METHODS, pin_to_primary, publish_pin, request_subject
+from app.utils.reminders import register as register_reminder_job
+from app.utils.scheduler import run_job, start_scheduler, stop_scheduler
+from app.utils.valuation_recompute import register as register_recompute_job
+from app.utils.sql_instrumentation import install_sql_instrumentation, sql_stats_middleware
 from app.utils.seed_admin import seed_admin_if_missing
+from app.utils.sync import register as register_tombstone_purge
 
-app = FastAPI(title="Zen Ops API", version="0.1.0")
+app = FastAPI(
+    title="Zen Ops API",
+    version="0.1.0",
+    # orjson renders JSON several times faster than stdlib json
+    default_response_class=ORJSONResponse,
+)
 
 origins = ["http://localhost:5173", "http://127.0.0.1:5173"]
 
+# Token buckets per caller and route class; added before CORS so 429s still carry CORS headers
+if RATE_LIMIT_ENABLED:
+    app.add_middleware(RateLimitMiddleware)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=origins,
@@ -29,6 +84,30 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# gzip / brotli for JSON and text bodies over ZEN_COMPRESS_MIN_BYTES
+if COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware)
+
+
+@app.middleware("http")
+async def pin_writers_to_primary(request: Request, call_next):
+    # Read-your-writes: after a successful write, this user's reads skip the replica for a few seconds
+    response = await call_next(request)
+    if request.method in WRITE_METHODS and response.status_code < 400:
+        subject = request_subject(request)
+        if subject:
+            pin_to_primary(subject)
+            if REPLICA_DATABASE_URL:
+                # Before the response goes out, so the next request finds the pin on any worker
+                await run_in_threadpool(publish_pin, subject)
+    return response
+
+
+# Per-request query count / DB time / N+1 detection (see /api/metrics)
+install_sql_instrumentation()
+app.middleware("http")(sql_stats_middleware)
+
+
 # Serve uploaded files at /uploads/...
 app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
 
@@ -42,13 +121,81 @@ def startup_seed_admin():
         db.close()
 
 
+@app.on_event("startup")
+def startup_activity_partitions():
+    # activities is partitioned by month; make sure upcoming months exist
+    # before serving. Under the scheduler's advisory lock so workers don't
+    # race on the DDL; the scheduler job keeps creating months after this.
+    register_partition_job()
+    try:
+        run_job(PARTITION_JOB)
+    except Exception as e:
+        print(f"[PARTITIONS] startup check failed, the scheduler will retry: {e!r}")
+
+
+@app.on_event("startup")
+async def startup_scheduler():
+    # Due-date reminders, valuation recomputes, activity partitions,
+    # idempotency-key, sync tombstone and shared rate-limit bucket cleanup;
+    # every worker runs the loop, an advisory lock per job picks one worker
+    # per tick
+    register_partition_job()
+    register_reminder_job()
+    register_recompute_job()
+    register_idempotency_purge()
+    register_tombstone_purge()
+    register_rate_limit_purge()
+    start_scheduler()
+
+
+@app.on_event("startup")
+async def startup_event_listener():
+    # One LISTEN connection per worker feeds /api/stream subscribers and
+    # evicts in-process cache entries (app/utils/cache.py)
+    start_listener()
+
+
+@app.on_event("shutdown")
+async def shutdown_scheduler():
+    await stop_scheduler()
+
+
+@app.on_event("shutdown")
+async def shutdown_event_listener():
+    await stop_listener()
+
+
+@app.on_event("shutdown")
+def shutdown_pdf_workers():
+    shutdown_pdf_pool()
+
+
+@app.on_event("shutdown")
+async def shutdown_async_engine():
+    await async_engine.dispose()
+    if async_replica_engine is not None:
+        await async_replica_engine.dispose()
+
+
 @app.get("/api/health")
 def health_check():
     return {"status": "ok"}
 
 
+# Async read handlers must be registered first so they take precedence
+# over the sync handlers for the same paths.
+if USE_ASYNC_DB:
+    app.include_router(async_reads_router)
+
 app.include_router(assignments_router)
 app.include_router(auth_router)
 app.include_router(master_data_router)
 app.include_router(files_router)
-app.include_router(activity_router)
\ No newline at end of file
+app.include_router(invoices_router)
+app.include_router(jobs_router)
+app.include_router(activity_router)
+app.include_router(metrics_router)
+app.include_router(notifications_router)
+app.include_router(stream_router)
+app.include_router(sync_router)
+app.include_router(valuations_router)
@@ -9,6 +9,30 @@ from app.models.rbac import Role, Permission, RolePermission  # ✅ add
 # Master Data (tagging engine)
 from app.models.master_data import Bank, Branch, Client, PropertyType
 
+# Background jobs
+from app.models.reminder import Reminder, SchedulerState
+
+# Bell
+from app.models.notification import Notification, NotificationCounter
+
+# Billing
+from app.models.invoice import Invoice, InvoiceItem
+
+# Valuation engine
+from app.models.valuation import CalculationTemplate
+
+# Background job queue
+from app.models.job import Job
+
+# Idempotency-Key replay
+from app.models.idempotency import IdempotencyKey
+
+# Delta sync
+from app.models.sync import SyncTombstone
+
+# Shared rate limit buckets
+from app.models.rate_limit import RateLimitBucket
+
 __all__ = [
     "User",
     "Assignment",
@@ -18,4 +42,15 @@ __all__ = [
     "Branch",
     "Client",
     "PropertyType",
+    "Reminder",
+    "SchedulerState",
+    "Notification",
+    "NotificationCounter",
+    "Invoice",
+    "InvoiceItem",
+    "CalculationTemplate",
+    "Job",
+    "IdempotencyKey",
+    "SyncTombstone",
+    "RateLimitBucket",
 ]
\ No newline at end of file
@@ -1,7 +1,7 @@
 # backend/app/models/activity.py
 from datetime import datetime
 
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, String
+from sqlalchemy import BigInteger, Column, DateTime, ForeignKey, Index, Integer, String
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 
@@ -10,8 +10,11 @@ from app.db import Base
 
 class Activity(Base):
     __tablename__ = "activities"
+    # Monthly RANGE partitions on created_at (see app/utils/partitions.py).
+    # Postgres requires the partition key in the primary key, hence (id, created_at).
+    __table_args__ = {"postgresql_partition_by": "RANGE (created_at)"}
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True, autoincrement=True, index=True)
 
     # IMPORTANT:
     # Use SET NULL (not CASCADE), so audit trail survives even if assignment is deleted.
@@ -39,7 +42,19 @@ class Activity(Base):
     # Flexible event data for Postgres
     payload = Column(JSONB, nullable=True)
 
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    created_at = Column(DateTime, primary_key=True, default=datetime.utcnow, nullable=False)
+
+    # Set by trigger to the inserting/updating transaction id (app/utils/sync.py)
+    change_xid = Column(BigInteger, nullable=False, server_default="0")
 
     assignment = relationship("Assignment", back_populates="activities")
-    actor = relationship("User")
\ No newline at end of file
+    actor = relationship("User")
+
+
+# Feed indexes (keyset pagination walks these newest-first)
+Index("ix_activities_assignment_created", Activity.assignment_id, Activity.created_at.desc())
+Index("ix_activities_actor_created", Activity.actor_user_id, Activity.created_at.desc())
+Index("ix_activities_created_at_desc", Activity.created_at.desc())
+
+# Delta sync (GET /api/sync/changes)
+Index("ix_activities_change_xid", Activity.change_xid, Activity.id)
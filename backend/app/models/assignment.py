@@ -1,16 +1,21 @@
 from datetime import datetime
 
 from sqlalchemy import (
+    BigInteger,
     Boolean,
     Column,
     Date,
     DateTime,
     Float,
     ForeignKey,
+    Index,
     Integer,
     String,
     Text,
+    func,
+    text,
 )
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 
 from app.db import Base
@@ -74,9 +79,16 @@ class Assignment(Base):
 
     status = Column(String(32), nullable=False, default="SITE_VISIT")
 
-    # TEMP: string-based assignment (no FK yet)
+    # Display name of the assignee (legacy free text, kept in sync with the FK)
     assigned_to = Column(String(128), nullable=True)
 
+    # Assignee FK (column added in 76cd23c58399; indexed via ix_assignments_assignee_status_due)
+    assigned_to_user_id = Column(
+        Integer,
+        ForeignKey("users.id", ondelete="SET NULL"),
+        nullable=True,
+    )
+
     site_visit_date = Column(Date, nullable=True)
     report_due_date = Column(Date, nullable=True)
 
@@ -85,6 +97,14 @@ class Assignment(Base):
 
     notes = Column(Text, nullable=True)
 
+    # -------------------------
+    # Valuation (app/utils/valuation.py)
+    # -------------------------
+    # Values the valuer entered for the template's required fields
+    valuation_input_json = Column(JSONB, nullable=True)
+    # {"template_id", "template_version", "values": {...}, "error", "computed_at"}
+    valuation_output_json = Column(JSONB, nullable=True)
+
     # -------------------------
     # Relationships
     # -------------------------
@@ -104,6 +124,65 @@ class Assignment(Base):
     branch = relationship("Branch", foreign_keys=[branch_id])
     client = relationship("Client", foreign_keys=[client_id])
     property_type_ref = relationship("PropertyType", foreign_keys=[property_type_id])
+    assignee = relationship("User", foreign_keys=[assigned_to_user_id])
 
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
\ No newline at end of file
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+    # Writing transaction's id, stamped by a trigger (see app/utils/sync.py)
+    change_xid = Column(BigInteger, nullable=False, server_default="0")
+
+
+# Statuses that count as open work (everything except COMPLETED / CANCELLED)
+OPEN_STATUSES = ("PENDING", "SITE_VISIT", "UNDER_PROCESS", "SUBMITTED")
+
+# "Open" = not closed. Shared verbatim by the partial index below and the
+# workload query so the planner can match the index predicate.
+OPEN_STATUS_SQL = "upper(coalesce(status, '')) NOT IN ('COMPLETED', 'CANCELLED')"
+
+# Workload indexes: open work per assignee by due date, site visits by date
+Index(
+    "ix_assignments_open_assignee_user_due",
+    Assignment.assigned_to_user_id,
+    Assignment.report_due_date,
+    postgresql_where=text(OPEN_STATUS_SQL),
+)
+Index("ix_assignments_site_visit_assignee_user", Assignment.site_visit_date, Assignment.assigned_to_user_id)
+
+# "My Work": equality on assignee + status, then due date in index order
+Index(
+    "ix_assignments_assignee_status_due",
+    Assignment.assigned_to_user_id,
+    Assignment.status,
+    Assignment.report_due_date,
+)
+
+# Due-date reminder scanner (app/utils/reminders.py): keyset walk over open
+# work by due date, and "changed since the last run" re-checks
+Index(
+    "ix_assignments_open_report_due",
+    Assignment.report_due_date,
+    Assignment.id,
+    postgresql_where=text(OPEN_STATUS_SQL),
+)
+Index("ix_assignments_updated_at", Assignment.updated_at)
+
+# Delta sync (GET /api/sync/changes): keyset walk over changes since a token
+Index("ix_assignments_change_xid", Assignment.change_xid, Assignment.id)
+
+# Invoice generation: completed-but-unpaid work per bank by date
+Index(
+    "ix_assignments_billable",
+    Assignment.bank_id,
+    Assignment.created_at,
+    postgresql_where=text("upper(coalesce(status, '')) = 'COMPLETED' AND NOT is_paid"),
+)
+
+# Next assignment code: newest VAL/<year>/<n> is the first row backwards
+# within the year (longer suffix = bigger number, then text order)
+Index(
+    "ix_assignments_code_year_seq",
+    func.split_part(Assignment.assignment_code, "/", 2),
+    func.length(Assignment.assignment_code),
+    Assignment.assignment_code,
+)
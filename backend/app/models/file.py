@@ -1,7 +1,7 @@
 # backend/app/models/file.py
 from datetime import datetime
 
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, BigInteger
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, BigInteger, Index
 from sqlalchemy.orm import relationship
 
 from app.db import Base
@@ -27,4 +27,11 @@ class File(Base):
 
     uploaded_at = Column(DateTime, default=datetime.utcnow, nullable=False)
 
-    assignment = relationship("Assignment", back_populates="files")
\ No newline at end of file
+    # Last writing transaction (trigger-maintained, for /api/sync/changes)
+    change_xid = Column(BigInteger, nullable=False, server_default="0")
+
+    assignment = relationship("Assignment", back_populates="files")
+
+
+# Delta sync (GET /api/sync/changes)
+Index("ix_files_change_xid", File.change_xid, File.id)
@@ -0,0 +1,44 @@
+# backend/app/models/idempotency.py
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, SmallInteger, String, UniqueConstraint
+from sqlalchemy.dialects.postgresql import JSONB
+
+from app.db import Base
+
+
+class IdempotencyKey(Base):
+    """
+    One client-supplied Idempotency-Key (app/utils/idempotency.py).
+
+    response_status is NULL while the first request is still running; after
+    that the stored response is replayed to retries until expires_at.
+    """
+
+    __tablename__ = "idempotency_keys"
+    __table_args__ = (UniqueConstraint("user_id", "scope", "key", name="uq_idempotency_keys_user_scope_key"),)
+
+    id = Column(Integer, primary_key=True)
+
+    user_id = Column(
+        Integer,
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+
+    # Endpoint the key was used on, e.g. "assignments.create"
+    scope = Column(String(64), nullable=False)
+    key = Column(String(255), nullable=False)
+
+    # sha256 of the request; the same key with a different request is rejected
+    fingerprint = Column(String(64), nullable=False)
+
+    response_status = Column(SmallInteger, nullable=True)
+    response_body = Column(JSONB, nullable=True)
+
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    expires_at = Column(DateTime, nullable=False)
+
+
+# Cleanup of expired keys
+Index("ix_idempotency_keys_expires_at", IdempotencyKey.expires_at)
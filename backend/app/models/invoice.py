@@ -0,0 +1,109 @@
+# backend/app/models/invoice.py
+from datetime import datetime
+
+from sqlalchemy import BigInteger, Column, Date, DateTime, ForeignKey, Index, Integer, String
+from sqlalchemy.orm import relationship
+
+from app.db import Base
+
+
+class Invoice(Base):
+    """
+    One bill to a bank (or one of its branches) for a period.
+
+    Payee fields are copied from the Bank when the invoice is generated, so
+    later edits to the bank's account details don't rewrite issued invoices.
+    """
+
+    __tablename__ = "invoices"
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    # INV/<year>/<0001>
+    invoice_number = Column(String(32), unique=True, index=True, nullable=False)
+
+    bank_id = Column(
+        Integer,
+        ForeignKey("banks.id", ondelete="RESTRICT"),
+        nullable=False,
+        index=True,
+    )
+    # NULL = whole-bank invoice
+    branch_id = Column(
+        Integer,
+        ForeignKey("branches.id", ondelete="SET NULL"),
+        nullable=True,
+        index=True,
+    )
+
+    period_from = Column(Date, nullable=False)
+    period_to = Column(Date, nullable=False)
+    issue_date = Column(Date, nullable=False)
+
+    # ISSUED / PAID
+    status = Column(String(20), nullable=False, default="ISSUED")
+
+    item_count = Column(Integer, nullable=False, default=0)
+    total_amount = Column(BigInteger, nullable=False, default=0)
+
+    # --- Payee (snapshot of Bank.account_* / upi_id / invoice_notes) ---
+    payee_account_name = Column(String(200), nullable=True)
+    payee_account_number = Column(String(50), nullable=True)
+    payee_ifsc = Column(String(20), nullable=True)
+    payee_bank_name = Column(String(200), nullable=True)
+    payee_branch_name = Column(String(200), nullable=True)
+    payee_upi_id = Column(String(100), nullable=True)
+    notes = Column(String(500), nullable=True)
+
+    paid_at = Column(DateTime, nullable=True)
+
+    created_by_user_id = Column(
+        Integer,
+        ForeignKey("users.id", ondelete="SET NULL"),
+        nullable=True,
+    )
+
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+    bank = relationship("Bank")
+    branch = relationship("Branch")
+    items = relationship(
+        "InvoiceItem",
+        back_populates="invoice",
+        order_by="InvoiceItem.id",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+    )
+
+
+class InvoiceItem(Base):
+    """One billed assignment. An assignment is billed at most once (unique assignment_id)."""
+
+    __tablename__ = "invoice_items"
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    invoice_id = Column(
+        Integer,
+        ForeignKey("invoices.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    assignment_id = Column(
+        Integer,
+        ForeignKey("assignments.id", ondelete="SET NULL"),
+        nullable=True,
+        unique=True,
+    )
+
+    # Snapshot of the assignment at billing time
+    assignment_code = Column(String(64), nullable=False)
+    borrower_name = Column(String(128), nullable=True)
+    branch_name = Column(String(128), nullable=True)
+    amount = Column(Integer, nullable=False, default=0)
+
+    invoice = relationship("Invoice", back_populates="items")
+    assignment = relationship("Assignment")
+
+
+Index("ix_invoice_items_invoice_id", InvoiceItem.invoice_id, InvoiceItem.id)
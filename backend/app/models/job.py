@@ -0,0 +1,85 @@
+# backend/app/models/job.py
+from datetime import datetime
+
+from sqlalchemy import BigInteger, Column, DateTime, ForeignKey, Index, Integer, SmallInteger, String, Text, text
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB
+
+from app.db import Base
+
+
+class Job(Base):
+    """
+    One unit of background work (app/utils/jobs.py), run by `python -m app.worker`.
+
+    QUEUED -> RUNNING -> SUCCEEDED
+                      -> QUEUED again (retry, run_at pushed back) ... -> FAILED
+    QUEUED -> CANCELLED
+    """
+
+    __tablename__ = "jobs"
+
+    id = Column(BigInteger, primary_key=True)
+
+    # Handler name, e.g. "invoice_pdf.month"
+    kind = Column(String(64), nullable=False)
+    payload = Column(JSONB, nullable=False, default=dict)
+
+    # QUEUED / RUNNING / SUCCEEDED / FAILED / CANCELLED
+    status = Column(String(16), nullable=False, default="QUEUED")
+
+    # Higher runs first
+    priority = Column(SmallInteger, nullable=False, default=0)
+
+    # At most one QUEUED/RUNNING job per key (see uq_jobs_dedup_key_active)
+    dedup_key = Column(String(200), nullable=True)
+
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=5)
+
+    # Not picked up before this (retry backoff, delayed jobs)
+    run_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    # Set while RUNNING; a stale heartbeat means the worker died
+    locked_by = Column(String(128), nullable=True)
+    heartbeat_at = Column(DateTime, nullable=True)
+
+    # Handler-reported progress, e.g. {"done": 400, "total": 1200}
+    progress = Column(JSONB, nullable=True)
+    result = Column(JSONB, nullable=True)
+    last_error = Column(Text, nullable=True)
+
+    created_by_user_id = Column(
+        Integer,
+        ForeignKey("users.id", ondelete="SET NULL"),
+        nullable=True,
+        index=True,
+    )
+    # Everyone else whose enqueue was deduplicated onto this job; they can see it too
+    requested_by_user_ids = Column(ARRAY(Integer), nullable=False, default=list, server_default="{}")
+
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+
+
+# Dequeue: highest priority, then oldest due, among QUEUED only
+Index(
+    "ix_jobs_queued",
+    Job.priority.desc(),
+    Job.run_at,
+    Job.id,
+    postgresql_where=text("status = 'QUEUED'"),
+)
+
+# GET /api/jobs for a user who requested a job someone else created
+Index("ix_jobs_requested_by_user_ids", Job.requested_by_user_ids, postgresql_using="gin")
+
+# Reaper: running jobs by heartbeat
+Index("ix_jobs_running_heartbeat", Job.heartbeat_at, postgresql_where=text("status = 'RUNNING'"))
+
+Index(
+    "uq_jobs_dedup_key_active",
+    Job.dedup_key,
+    unique=True,
+    postgresql_where=text("status IN ('QUEUED', 'RUNNING') AND dedup_key IS NOT NULL"),
+)
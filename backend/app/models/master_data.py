@@ -1,12 +1,14 @@
 from __future__ import annotations
 
 from sqlalchemy import (
+    BigInteger,
     Column,
     DateTime,
     Float,
     ForeignKey,
     Integer,
     String,
+    Index,
     UniqueConstraint,
     Boolean,
     func,
@@ -49,6 +51,8 @@ class Bank(Base):
         nullable=False,
     )
 
+    change_xid = Column(BigInteger, nullable=False, server_default="0")
+
     branches = relationship(
         "Branch",
         back_populates="bank",
@@ -111,6 +115,8 @@ class Branch(Base):
         nullable=False,
     )
 
+    change_xid = Column(BigInteger, nullable=False, server_default="0")
+
     bank = relationship("Bank", back_populates="branches")
 
 
@@ -139,6 +145,8 @@ class Client(Base):
         nullable=False,
     )
 
+    change_xid = Column(BigInteger, nullable=False, server_default="0")
+
 
 # =========================
 # PROPERTY TYPE
@@ -160,4 +168,14 @@ class PropertyType(Base):
         server_default=func.now(),
         onupdate=func.now(),
         nullable=False,
-    )
\ No newline at end of file
+    )
+
+    change_xid = Column(BigInteger, nullable=False, server_default="0")
+
+
+# Delta sync (GET /api/sync/changes): change_xid is stamped by a trigger
+# with the writing transaction's id, see app/utils/sync.py
+Index("ix_banks_change_xid", Bank.change_xid, Bank.id)
+Index("ix_branches_change_xid", Branch.change_xid, Branch.id)
+Index("ix_clients_change_xid", Client.change_xid, Client.id)
+Index("ix_property_types_change_xid", PropertyType.change_xid, PropertyType.id)
@@ -0,0 +1,78 @@
+# backend/app/models/notification.py
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String, text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import relationship
+
+from app.db import Base
+
+
+class Notification(Base):
+    """
+    One bell entry for one user. Written only through app/utils/notifications.py,
+    which keeps NotificationCounter in step within the same transaction.
+    """
+
+    __tablename__ = "notifications"
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    user_id = Column(
+        Integer,
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+
+    # Examples:
+    # ASSIGNMENT_CREATED
+    # ASSIGNED
+    # STATUS_CHANGED
+    # MENTIONED
+    # REPORT_DUE_SOON / REPORT_OVERDUE / SITE_VISIT_UPCOMING (from reminders)
+    type = Column(String(64), nullable=False)
+
+    assignment_id = Column(
+        Integer,
+        ForeignKey("assignments.id", ondelete="SET NULL"),
+        nullable=True,
+    )
+
+    actor_user_id = Column(
+        Integer,
+        ForeignKey("users.id", ondelete="SET NULL"),
+        nullable=True,
+    )
+
+    payload = Column(JSONB, nullable=True)
+
+    read_at = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    user = relationship("User", foreign_keys=[user_id])
+    actor = relationship("User", foreign_keys=[actor_user_id])
+    assignment = relationship("Assignment")
+
+
+# Bell list (keyset, newest first) and "mark all read" (touches unread rows only)
+Index("ix_notifications_user_created", Notification.user_id, Notification.created_at.desc(), Notification.id.desc())
+Index(
+    "ix_notifications_user_unread",
+    Notification.user_id,
+    Notification.id,
+    postgresql_where=text("read_at IS NULL"),
+)
+
+
+class NotificationCounter(Base):
+    """Per-user unread count, so the bell reads one row instead of counting."""
+
+    __tablename__ = "notification_counters"
+
+    user_id = Column(
+        Integer,
+        ForeignKey("users.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    unread = Column(Integer, nullable=False, default=0, server_default=text("0"))
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
@@ -0,0 +1,26 @@
+# backend/app/models/rate_limit.py
+from sqlalchemy import Column, DateTime, Float, Index, String
+
+from app.db import Base
+
+
+class RateLimitBucket(Base):
+    """
+    A token bucket shared by all workers (app/utils/rate_limit.py, only with
+    ZEN_RATE_LIMIT_SHARED=1).
+
+    UNLOGGED: losing the buckets in a crash just refills them.
+    """
+
+    __tablename__ = "rate_limit_buckets"
+    __table_args__ = {"prefixes": ["UNLOGGED"]}
+
+    # "<route class>:<user or ip:address>"
+    key = Column(String(200), primary_key=True)
+
+    tokens = Column(Float, nullable=False)
+    updated_at = Column(DateTime, nullable=False)
+
+
+# Cleanup of idle (long since refilled) buckets
+Index("ix_rate_limit_buckets_updated_at", RateLimitBucket.updated_at)
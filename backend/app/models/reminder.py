@@ -0,0 +1,61 @@
+# backend/app/models/reminder.py
+from datetime import datetime
+
+from sqlalchemy import Column, Date, DateTime, ForeignKey, Index, Integer, String, UniqueConstraint
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import relationship
+
+from app.db import Base
+
+
+class Reminder(Base):
+    """
+    One due-date reminder produced by the scheduler (app/utils/reminders.py).
+
+    Unique per (assignment, kind, target_date): re-scanning the same window is a
+    no-op, and a moved due date yields a fresh reminder.
+    """
+
+    __tablename__ = "reminders"
+    __table_args__ = (
+        UniqueConstraint("assignment_id", "kind", "target_date", name="uq_reminder_assignment_kind_date"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    assignment_id = Column(
+        Integer,
+        ForeignKey("assignments.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+
+    # Assignee at the time the reminder was generated (may be NULL if unassigned)
+    user_id = Column(
+        Integer,
+        ForeignKey("users.id", ondelete="SET NULL"),
+        nullable=True,
+    )
+
+    # REPORT_DUE_SOON / REPORT_OVERDUE / SITE_VISIT_UPCOMING
+    kind = Column(String(32), nullable=False)
+
+    # The report_due_date / site_visit_date that triggered it
+    target_date = Column(Date, nullable=False)
+
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    assignment = relationship("Assignment")
+    user = relationship("User")
+
+
+Index("ix_reminders_user_created", Reminder.user_id, Reminder.created_at.desc())
+
+
+class SchedulerState(Base):
+    """Per-job watermark for periodic background jobs (see app/utils/scheduler.py)."""
+
+    __tablename__ = "scheduler_state"
+
+    name = Column(String(64), primary_key=True)
+    state = Column(JSONB, nullable=False, default=dict)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
@@ -0,0 +1,30 @@
+# backend/app/models/sync.py
+from datetime import datetime
+
+from sqlalchemy import BigInteger, Column, DateTime, Index, Integer, String
+
+from app.db import Base
+
+
+class SyncTombstone(Base):
+    """
+    A deleted row, so delta-sync clients can drop their copy
+    (GET /api/sync/changes). Written by the zen_sync_tombstone() trigger;
+    purged after ZEN_SYNC_TOMBSTONE_DAYS.
+    """
+
+    __tablename__ = "sync_tombstones"
+
+    id = Column(BigInteger, primary_key=True)
+
+    # Synced table the row was deleted from, e.g. "assignments"
+    table_name = Column(String(32), nullable=False)
+    row_id = Column(Integer, nullable=False)
+
+    # Deleting transaction's id
+    change_xid = Column(BigInteger, nullable=False)
+    deleted_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+
+Index("ix_sync_tombstones_change_xid", SyncTombstone.change_xid, SyncTombstone.id)
+Index("ix_sync_tombstones_deleted_at", SyncTombstone.deleted_at)
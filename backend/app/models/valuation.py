@@ -0,0 +1,67 @@
+# backend/app/models/valuation.py
+from datetime import datetime
+
+from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Index, Integer, String, text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import relationship
+
+from app.db import Base
+
+
+class CalculationTemplate(Base):
+    """
+    Valuation formulas for a bank and/or property type (NULL = any).
+
+    formula_definitions_json: {output: expression} (order doesn't matter), e.g.
+        {"land_value": "land_area * land_rate", ..., "market_value": "land_value + building_value"}
+    required_fields_json: inputs the user fills in, ["land_rate", {"name": "life_years", "default": 60}]
+
+    Evaluated by app/utils/formula.py. Editing the formulas or fields bumps
+    `version`, which is what compiled templates are cached by.
+    """
+
+    __tablename__ = "calculation_templates"
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    name = Column(String(200), nullable=False)
+
+    bank_id = Column(
+        Integer,
+        ForeignKey("banks.id", ondelete="CASCADE"),
+        nullable=True,
+    )
+    property_type_id = Column(
+        Integer,
+        ForeignKey("property_types.id", ondelete="CASCADE"),
+        nullable=True,
+    )
+
+    version = Column(Integer, nullable=False, default=1)
+
+    formula_definitions_json = Column(JSONB, nullable=False)
+    required_fields_json = Column(JSONB, nullable=False, default=list)
+
+    is_active = Column(Boolean, nullable=False, default=True)
+
+    created_by_user_id = Column(
+        Integer,
+        ForeignKey("users.id", ondelete="SET NULL"),
+        nullable=True,
+    )
+
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+    bank = relationship("Bank")
+    property_type = relationship("PropertyType")
+
+
+# At most one active template per (bank, property type) slot, NULL counting as "any"
+Index(
+    "uq_calculation_templates_active_scope",
+    text("coalesce(bank_id, 0)"),
+    text("coalesce(property_type_id, 0)"),
+    unique=True,
+    postgresql_where=text("is_active"),
+)
@@ -1,36 +1,91 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends
+from typing import Any, Dict, Optional
+
+from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
 
-from app.db import get_db
+from app.db import get_read_db
 from app.models.activity import Activity
 from app.routers.auth import get_current_user
+from app.utils.activity import activity_feed_query, activity_row_out
+from app.utils.pagination import apply_keyset, encode_cursor
 
 router = APIRouter(prefix="/api/activity", tags=["activity"])
 
 
+# ---------------------------
+# Helpers
+# ---------------------------
+
+def _page(query, cursor: Optional[str], limit: int) -> Dict[str, Any]:
+    """
+    Keyset page over (created_at DESC, id DESC).
+    Fetches limit + 1 rows to know whether another page exists.
+    """
+    query = apply_keyset(query, Activity.created_at, Activity.id, cursor)
+    rows = query.limit(limit + 1).all()
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    next_cursor = None
+    if has_more and rows:
+        last = rows[-1]
+        next_cursor = encode_cursor(last.created_at, last.id)
+
+    return {"items": [activity_row_out(r) for r in rows], "next_cursor": next_cursor}
+
+
+# ---------------------------
+# Routes
+# ---------------------------
+
 @router.get("/assignment/{assignment_id}")
 def get_assignment_activity(
     assignment_id: int,
-    db: Session = Depends(get_db),
+    limit: int = Query(default=200, ge=1, le=500),
+    types: Optional[str] = Query(default=None, description="Comma-separated activity types"),
+    db: Session = Depends(get_read_db),
+    current_user=Depends(get_current_user),
+):
+    """Legacy shape (plain list, newest first) — now bounded. Use /feed/assignment/{id} to page."""
+    query = activity_feed_query(db, types).filter(Activity.assignment_id == assignment_id)
+    return _page(query, None, limit)["items"]
+
+
+@router.get("/feed")
+def global_feed(
+    cursor: Optional[str] = Query(default=None),
+    limit: int = Query(default=50, ge=1, le=200),
+    types: Optional[str] = Query(default=None, description="Comma-separated activity types"),
+    db: Session = Depends(get_read_db),
+    current_user=Depends(get_current_user),
+):
+    return _page(activity_feed_query(db, types), cursor, limit)
+
+
+@router.get("/feed/assignment/{assignment_id}")
+def assignment_feed(
+    assignment_id: int,
+    cursor: Optional[str] = Query(default=None),
+    limit: int = Query(default=50, ge=1, le=200),
+    types: Optional[str] = Query(default=None, description="Comma-separated activity types"),
+    db: Session = Depends(get_read_db),
+    current_user=Depends(get_current_user),
+):
+    query = activity_feed_query(db, types).filter(Activity.assignment_id == assignment_id)
+    return _page(query, cursor, limit)
+
+
+@router.get("/feed/actor/{user_id}")
+def actor_feed(
+    user_id: int,
+    cursor: Optional[str] = Query(default=None),
+    limit: int = Query(default=50, ge=1, le=200),
+    types: Optional[str] = Query(default=None, description="Comma-separated activity types"),
+    db: Session = Depends(get_read_db),
     current_user=Depends(get_current_user),
 ):
-    rows = (
-        db.query(Activity)
-        .filter(Activity.assignment_id == assignment_id)
-        .order_by(Activity.created_at.desc())
-        .all()
-    )
-
-    # JSON-friendly output
-    return [
-        {
-            "id": a.id,
-            "type": a.type,
-            "payload": a.payload,
-            "actor_user_id": a.actor_user_id,
-            "created_at": a.created_at.isoformat() if a.created_at else None,
-        }
-        for a in rows
-    ]
\ No newline at end of file
+    query = activity_feed_query(db, types).filter(Activity.actor_user_id == user_id)
+    return _page(query, cursor, limit)
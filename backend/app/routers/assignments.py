@@ -4,21 +4,27 @@ from __future__ import annotations
 from datetime import date, datetime, time, timedelta
 from typing import List, Optional, Dict, Any
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy import func, case
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, BackgroundTasks, Depends, Header, HTTPException, Query, status
+from sqlalchemy import and_, case, func, or_, text
+from sqlalchemy.orm import Session, joinedload, load_only
 
-from app.db import get_db
-from app.models.assignment import Assignment
+from app.db import get_db, get_read_db
+from app.models.activity import Activity
+from app.models.assignment import OPEN_STATUS_SQL, OPEN_STATUSES, Assignment
 from app.models.master_data import Bank, Branch, Client, PropertyType
 from app.models.user import User
-from app.routers.auth import get_current_user
+from app.routers.auth import get_current_user, require_admin_or_hr_or_ops
 from app.schemas.assignment import AssignmentCreate, AssignmentRead, AssignmentUpdate
 from app.schemas.file import FileRead
 from app.utils.assignment_code import generate_assignment_code
+from app.utils.assignees import assignee_key_sql, resolve_assignee_id
+from app.utils.fastjson import parse_fields, rows_response, rows_to_dicts, schema_columns
+from app.utils import idempotency
+from app.utils.notifications import on_assignment_created, on_assignment_updated
+from app.utils.pagination import apply_due_keyset, encode_due_cursor
 
 # ✅ activity logger
-from app.utils.activity import log_activity
+from app.utils.activity import activity_feed_query, activity_row_out, log_activity
 
 router = APIRouter(prefix="/api/assignments", tags=["assignments"])
 
@@ -163,6 +169,27 @@ def _fill_names_from_ids(payload_dict: dict, db: Session) -> dict:
     return payload_dict
 
 
+def _fill_assignee(payload_dict: dict, db: Session, provided: set) -> dict:
+    """
+    Keep assigned_to (display name) and assigned_to_user_id in sync.
+    `provided` = fields the client actually sent (pydantic model_fields_set):
+      - assigned_to_user_id given -> validated, assigned_to filled from the user
+      - only assigned_to given    -> mapped to a user when it matches exactly one
+    """
+    if payload_dict.get("assigned_to_user_id") is not None:
+        user = db.query(User).filter(User.id == payload_dict["assigned_to_user_id"]).first()
+        if not user:
+            raise HTTPException(status_code=400, detail="Invalid assigned_to_user_id")
+        payload_dict["assigned_to"] = user.full_name or user.email
+    elif "assigned_to_user_id" in provided:
+        # explicit null clears the assignee
+        payload_dict["assigned_to"] = None
+    elif "assigned_to" in provided:
+        payload_dict["assigned_to_user_id"] = resolve_assignee_id(db, payload_dict.get("assigned_to"))
+
+    return payload_dict
+
+
 def _validate_by_case_type(case_type: str, data: dict):
     """
     Strict rules:
@@ -205,9 +232,11 @@ def _list_assignments_impl(
     sort_by: Optional[str],
     sort_dir: Optional[str],
     db: Session,
-) -> List[Assignment]:
+    fields: Optional[List[str]] = None,
+) -> list:
+    """Returns Core row tuples with AssignmentRead's columns, or just `fields` (no ORM hydration)."""
     completion_norm = _normalize_completion(completion)
-    query = db.query(Assignment)
+    query = db.query(*schema_columns(Assignment, AssignmentRead, fields))
     query = _apply_filters(query, bank_id, branch_id, created_from, created_to, completion_norm, is_paid)
     query = _apply_sort(query, sort_by or "created_at", sort_dir or "desc")
     return query.offset(skip).limit(limit).all()
@@ -232,10 +261,12 @@ def list_assignments(
     sort_by: Optional[str] = Query(default="created_at"),
     sort_dir: Optional[str] = Query(default="desc"),
 
-    db: Session = Depends(get_db),
+    fields: Optional[str] = Query(default=None, description="Comma-separated columns to return (default: all)"),
+
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
-    return _list_assignments_impl(
+    rows = _list_assignments_impl(
         skip=skip,
         limit=limit,
         bank_id=bank_id,
@@ -247,7 +278,9 @@ def list_assignments(
         sort_by=sort_by,
         sort_dir=sort_dir,
         db=db,
+        fields=parse_fields(fields, AssignmentRead),
     )
+    return rows_response(rows)
 
 
 @router.get("/summary")
@@ -258,7 +291,7 @@ def assignments_summary(
     created_from: Optional[date] = Query(default=None, description="YYYY-MM-DD"),
     created_to: Optional[date] = Query(default=None, description="YYYY-MM-DD"),
 
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ) -> Dict[str, Any]:
     completed_value = _completed_status_value()
@@ -290,17 +323,135 @@ def assignments_summary(
     }
 
 
+# Statuses where the site visit has NOT happened (or won't); excluded via notin_ below
+_PRE_VISIT_STATUSES = ("", "PENDING", "SITE_VISIT", "CANCELLED")
+
+
+@router.get("/workload")
+def assignments_workload(
+    period_from: Optional[date] = Query(default=None, description="YYYY-MM-DD (default: Monday of this week)"),
+    period_to: Optional[date] = Query(default=None, description="YYYY-MM-DD (default: Sunday of this week)"),
+
+    bank_id: Optional[int] = Query(default=None),
+    branch_id: Optional[int] = Query(default=None),
+
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(require_admin_or_hr_or_ops),
+) -> Dict[str, Any]:
+    """
+    Per-assignee workload in ONE grouped query:
+      open, overdue (report_due_date < today), due_this_week (today..Sunday),
+      site_visits_scheduled / site_visits_completed (site_visit_date within the period).
+
+    Assignees are users (assigned_to_user_id, named by full_name or email).
+    Rows not mapped to a user yet are grouped by their normalised free-text
+    assigned_to, so "Ravi" and "ravi " count once; assignee_user_id is null.
+    """
+    today = date.today()
+    week_start = today - timedelta(days=today.weekday())
+    week_end = week_start + timedelta(days=6)
+
+    period_from = period_from or week_start
+    period_to = period_to or week_end
+    if period_to < period_from:
+        raise HTTPException(status_code=400, detail="period_to must be on or after period_from")
+
+    is_open = text(OPEN_STATUS_SQL)
+    in_period = Assignment.site_visit_date.between(period_from, period_to)
+    status_upper = func.upper(func.coalesce(Assignment.status, ""))
+    # Free text only matters for rows no user is mapped to
+    text_key = case((Assignment.assigned_to_user_id.is_(None), assignee_key_sql(Assignment.assigned_to)))
+
+    query = db.query(
+        User.id,
+        func.coalesce(func.nullif(func.btrim(User.full_name), ""), User.email),
+        func.min(func.btrim(func.regexp_replace(Assignment.assigned_to, r"\s+", " ", "g"))),
+        func.count().filter(is_open),
+        func.count().filter(and_(is_open, Assignment.report_due_date < today)),
+        func.count().filter(and_(is_open, Assignment.report_due_date.between(today, week_end))),
+        func.count().filter(in_period),
+        func.count().filter(
+            and_(in_period, Assignment.site_visit_date <= today, status_upper.notin_(_PRE_VISIT_STATUSES))
+        ),
+    ).outerjoin(User, User.id == Assignment.assigned_to_user_id).filter(or_(is_open, in_period))
+
+    if bank_id is not None:
+        query = query.filter(Assignment.bank_id == bank_id)
+    if branch_id is not None:
+        query = query.filter(Assignment.branch_id == branch_id)
+
+    rows = query.group_by(User.id, text_key).all()
+
+    keys = ("open", "overdue", "due_this_week", "site_visits_scheduled", "site_visits_completed")
+    items = [
+        {
+            "assignee": (user_name if user_id is not None else free_text) or None,
+            "assignee_user_id": user_id,
+            **dict(zip(keys, map(int, counts))),
+        }
+        for user_id, user_name, free_text, *counts in rows
+    ]
+    items.sort(key=lambda r: (-r["open"], r["assignee"] is None, r["assignee"] or ""))
+
+    return {
+        "as_of": today.isoformat(),
+        "period": {"from": period_from.isoformat(), "to": period_to.isoformat()},
+        "items": items,
+        "totals": {k: sum(r[k] for r in items) for k in keys},
+    }
+
+
+@router.get("/mine")
+def my_assignments(
+    status_filter: Optional[str] = Query(
+        default=None,
+        alias="status",
+        description="Comma-separated statuses (default: open work — " + ", ".join(OPEN_STATUSES) + ")",
+    ),
+    cursor: Optional[str] = Query(default=None),
+    limit: int = Query(default=50, ge=1, le=200),
+    fields: Optional[str] = Query(default=None, description="Comma-separated columns to return (default: all)"),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user),
+) -> Dict[str, Any]:
+    """
+    The caller's assignments, most urgent first (report_due_date ASC, undated last).
+
+    Served from ix_assignments_assignee_status_due: equality on
+    (assigned_to_user_id, status) keeps the scan to this user's rows only.
+    """
+    statuses = [s.strip().upper() for s in (status_filter or "").split(",") if s.strip()] or list(OPEN_STATUSES)
+
+    # id + report_due_date always come back: the cursor is built from them
+    columns = schema_columns(Assignment, AssignmentRead, parse_fields(fields, AssignmentRead, ("id", "report_due_date")))
+    query = (
+        db.query(*columns)
+        .filter(Assignment.assigned_to_user_id == current_user.id)
+        .filter(Assignment.status.in_(statuses))
+    )
+    query = apply_due_keyset(query, Assignment.report_due_date, Assignment.id, cursor)
+    rows = query.limit(limit + 1).all()
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    next_cursor = encode_due_cursor(rows[-1].report_due_date, rows[-1].id) if has_more and rows else None
+
+    return {"items": rows_to_dicts(rows), "next_cursor": next_cursor}
+
+
 # ---------------------------
 # Create / Read / Detail / Update / Delete
 # ---------------------------
 
 def _create_assignment_impl(payload: AssignmentCreate, db: Session, current_user: User) -> Assignment:
+    """Assignment + its ASSIGNMENT_CREATED activity, flushed but not committed."""
     assignment_code = generate_assignment_code(db)
 
     data = payload.model_dump()
     data["case_type"] = _normalize_case_type(data.get("case_type"))
 
     data = _fill_names_from_ids(data, db)
+    data = _fill_assignee(data, db, payload.model_fields_set)
     _validate_by_case_type(data["case_type"], data)
 
     # employees cannot set money fields
@@ -326,6 +477,7 @@ def _create_assignment_impl(payload: AssignmentCreate, db: Session, current_user
         builtup_area=data.get("builtup_area"),
         status=data.get("status"),
         assigned_to=data.get("assigned_to"),
+        assigned_to_user_id=data.get("assigned_to_user_id"),
         site_visit_date=data.get("site_visit_date"),
         report_due_date=data.get("report_due_date"),
         fees=data.get("fees"),
@@ -334,11 +486,11 @@ def _create_assignment_impl(payload: AssignmentCreate, db: Session, current_user
     )
 
     db.add(obj)
-    db.commit()
-    db.refresh(obj)
+    db.flush()
 
     log_activity(
         db,
+        commit=False,
         assignment_id=obj.id,
         type="ASSIGNMENT_CREATED",
         actor=current_user,
@@ -359,10 +511,37 @@ def _create_assignment_impl(payload: AssignmentCreate, db: Session, current_user
 @router.post("/", response_model=AssignmentRead, status_code=status.HTTP_201_CREATED)
 def create_assignment(
     payload: AssignmentCreate,
+    background_tasks: BackgroundTasks,
+    idempotency_key: Optional[str] = Header(default=None),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    return _create_assignment_impl(payload, db, current_user)
+    """
+    With an Idempotency-Key header, a retried request returns the assignment
+    created the first time instead of allocating another code.
+    """
+    claim = idempotency.begin(
+        db,
+        current_user.id,
+        "assignments.create",
+        idempotency_key,
+        idempotency.fingerprint(payload.model_dump(mode="json")),
+    )
+    if claim and claim.replay:
+        return claim.replay
+
+    try:
+        obj = _create_assignment_impl(payload, db, current_user)
+        # Commits the assignment, its activity and the stored response together
+        response = idempotency.finish(
+            db, claim, status.HTTP_201_CREATED, AssignmentRead.model_validate(obj).model_dump(mode="json")
+        )
+    except BaseException:
+        idempotency.abandon(db, claim)
+        raise
+    # notifications fan out after the response is sent
+    background_tasks.add_task(on_assignment_created, obj.id, current_user.id)
+    return response
 
 
 @router.get("/{assignment_id}", response_model=AssignmentRead)
@@ -377,25 +556,104 @@ def get_assignment(
     return obj
 
 
+DETAIL_INCLUDES = {"files", "activity", "master"}
+
+
+def _parse_include(include: str | None) -> set[str]:
+    parts = {p.strip().lower() for p in (include or "").split(",") if p.strip()}
+    unknown = parts - DETAIL_INCLUDES
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"include must be a comma-separated subset of: {', '.join(sorted(DETAIL_INCLUDES))}",
+        )
+    return parts
+
+
+def _ref_out(obj) -> Optional[Dict[str, Any]]:
+    return {"id": obj.id, "name": obj.name} if obj is not None else None
+
+
+def _detail_load_options(parts: set[str], projection: Optional[List[str]]) -> list:
+    """Eager loads for the detail view; with ?fields= only those assignment columns are SELECTed."""
+    options = []
+    if projection:
+        options.append(load_only(*(getattr(Assignment, name) for name in projection)))
+    if "files" in parts:
+        options.append(joinedload(Assignment.files))
+    if "master" in parts:
+        options.extend(
+            [
+                joinedload(Assignment.bank),
+                joinedload(Assignment.branch),
+                joinedload(Assignment.client),
+                joinedload(Assignment.property_type_ref),
+            ]
+        )
+    return options
+
+
+def _detail_assignment_out(obj: Assignment, projection: Optional[List[str]]) -> Dict[str, Any]:
+    # Read only loaded attributes: touching a deferred one would lazy-load it
+    if projection:
+        return {name: getattr(obj, name) for name in projection}
+    return AssignmentRead.model_validate(obj).model_dump()
+
+
 @router.get("/{assignment_id}/detail")
 def get_assignment_detail(
     assignment_id: int,
+    include: Optional[str] = Query(default="files", description="Comma-separated: files,activity,master"),
+    activity_limit: int = Query(default=20, ge=1, le=200),
+    fields: Optional[str] = Query(default=None, description="Comma-separated assignment columns (default: all)"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    obj = db.query(Assignment).get(assignment_id)
+    """
+    Assignment + related data in at most two queries:
+      1) assignment JOIN files / bank / branch / client / property_type (joined eager load)
+      2) latest N activities JOIN users (only when include has "activity")
+    """
+    parts = _parse_include(include)
+    projection = parse_fields(fields, AssignmentRead)
+
+    options = _detail_load_options(parts, projection)
+    obj = db.query(Assignment).options(*options).filter(Assignment.id == assignment_id).first()
     if not obj:
         raise HTTPException(status_code=404, detail="Assignment not found")
 
-    assignment_out = AssignmentRead.model_validate(obj).model_dump()
-    files_out = [FileRead.model_validate(f).model_dump() for f in (obj.files or [])]
-    return {"assignment": assignment_out, "files": files_out}
+    out: Dict[str, Any] = {"assignment": _detail_assignment_out(obj, projection)}
+
+    if "files" in parts:
+        files = sorted(obj.files or [], key=lambda f: f.uploaded_at, reverse=True)
+        out["files"] = [FileRead.model_validate(f).model_dump() for f in files]
+
+    if "master" in parts:
+        out["master"] = {
+            "bank": _ref_out(obj.bank),
+            "branch": _ref_out(obj.branch),
+            "client": _ref_out(obj.client),
+            "property_type": _ref_out(obj.property_type_ref),
+        }
+
+    if "activity" in parts:
+        rows = (
+            activity_feed_query(db)
+            .filter(Activity.assignment_id == assignment_id)
+            .order_by(Activity.created_at.desc(), Activity.id.desc())
+            .limit(activity_limit)
+            .all()
+        )
+        out["activity"] = [activity_row_out(r) for r in rows]
+
+    return out
 
 
 @router.patch("/{assignment_id}", response_model=AssignmentRead)
 def update_assignment(
     assignment_id: int,
     payload: AssignmentUpdate,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
@@ -415,15 +673,19 @@ def update_assignment(
         update_data["case_type"] = _normalize_case_type(update_data.get("case_type"))
 
     update_data = _fill_names_from_ids(update_data, db)
+    if "assigned_to" in update_data or "assigned_to_user_id" in update_data:
+        update_data = _fill_assignee(update_data, db, set(update_data))
 
     ct = update_data.get("case_type") or obj.case_type
     _validate_by_case_type(ct, {**obj.__dict__, **update_data})
 
     changed_fields = []
+    before: Dict[str, Any] = {}
     for field, value in update_data.items():
         old = getattr(obj, field, None)
         if old != value:
             changed_fields.append(field)
+            before[field] = old
         setattr(obj, field, value)
 
     db.add(obj)
@@ -448,6 +710,10 @@ def update_assignment(
             payload={"from": before_status, "to": obj.status},
         )
 
+    notify_before = {k: v for k, v in before.items() if k in ("status", "notes", "assigned_to_user_id")}
+    if notify_before:
+        background_tasks.add_task(on_assignment_updated, obj.id, current_user.id, notify_before)
+
     return obj
 
 
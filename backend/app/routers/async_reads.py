@@ -0,0 +1,257 @@
+"""Async (asyncpg) versions of the hot read endpoints.
+
+Enabled with ZEN_ASYNC_DB=1. `app/main.py` then includes this router BEFORE the
+regular routers, so these handlers win for the same method + path, run on the
+event loop and never occupy Starlette's worker threads.
+
+Response shapes MUST stay identical to the sync handlers they shadow.
+"""
+from __future__ import annotations
+
+from datetime import date
+from typing import Any, Dict, List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import case, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db import get_async_db, get_async_read_db
+from app.models.activity import Activity
+from app.models.assignment import Assignment
+from app.models.file import File
+from app.models.master_data import Bank, Branch, Client, PropertyType
+from app.models.user import User
+from app.routers.assignments import (
+    _apply_filters,
+    _apply_sort,
+    _completed_status_value,
+    _detail_assignment_out,
+    _detail_load_options,
+    _normalize_completion,
+    _parse_include,
+    _ref_out,
+)
+from app.routers.auth import get_current_user_async
+from app.routers.master_data import (
+    BANKS_CACHE,
+    BRANCHES_CACHE,
+    CLIENTS_CACHE,
+    PROPERTY_TYPES_CACHE,
+    BankOut,
+    BranchOut,
+    ClientOut,
+    PropertyTypeOut,
+    _norm_name,
+)
+from app.schemas.assignment import AssignmentRead
+from app.schemas.file import FileRead
+from app.utils.activity import activity_feed_select, activity_row_out
+from app.utils.fastjson import json_bytes_response, parse_fields, rows_json, rows_response, schema_columns
+
+router = APIRouter(tags=["async-reads"])
+
+
+# ---------------------------
+# Assignments
+# ---------------------------
+
+@router.get("/api/assignments", response_model=List[AssignmentRead])
+@router.get("/api/assignments/", response_model=List[AssignmentRead])
+async def list_assignments(
+    skip: int = Query(default=0, ge=0),
+    limit: int = Query(default=50, ge=1, le=500),
+
+    bank_id: Optional[int] = Query(default=None),
+    branch_id: Optional[int] = Query(default=None),
+
+    created_from: Optional[date] = Query(default=None, description="YYYY-MM-DD"),
+    created_to: Optional[date] = Query(default=None, description="YYYY-MM-DD"),
+
+    completion: Optional[str] = Query(default="ALL", description="ALL | PENDING | COMPLETED"),
+    is_paid: Optional[bool] = Query(default=None),
+
+    sort_by: Optional[str] = Query(default="created_at"),
+    sort_dir: Optional[str] = Query(default="desc"),
+
+    fields: Optional[str] = Query(default=None, description="Comma-separated columns to return (default: all)"),
+
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: User = Depends(get_current_user_async),
+):
+    completion_norm = _normalize_completion(completion)
+
+    # select() supports .filter()/.order_by() just like Query, so the sync helpers apply as-is
+    stmt = select(*schema_columns(Assignment, AssignmentRead, parse_fields(fields, AssignmentRead)))
+    stmt = _apply_filters(stmt, bank_id, branch_id, created_from, created_to, completion_norm, is_paid)
+    stmt = _apply_sort(stmt, sort_by or "created_at", sort_dir or "desc")
+    stmt = stmt.offset(skip).limit(limit)
+
+    rows = (await db.execute(stmt)).all()
+    return rows_response(rows)
+
+
+@router.get("/api/assignments/summary")
+async def assignments_summary(
+    bank_id: Optional[int] = Query(default=None),
+    branch_id: Optional[int] = Query(default=None),
+
+    created_from: Optional[date] = Query(default=None, description="YYYY-MM-DD"),
+    created_to: Optional[date] = Query(default=None, description="YYYY-MM-DD"),
+
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: User = Depends(get_current_user_async),
+) -> Dict[str, Any]:
+    completed_value = _completed_status_value()
+    status_upper = func.upper(func.coalesce(Assignment.status, ""))
+
+    # All four counters in one pass
+    stmt = select(
+        func.count(Assignment.id),
+        func.count(case((status_upper == completed_value, 1))),
+        func.count(case((status_upper != completed_value, 1))),
+        func.count(case(((status_upper == completed_value) & (Assignment.is_paid == False), 1))),  # noqa: E712
+    )
+    stmt = _apply_filters(stmt, bank_id, branch_id, created_from, created_to, "ALL", None)
+
+    total, completed, pending, completed_unpaid = (await db.execute(stmt)).one()
+
+    return {
+        "total": int(total or 0),
+        "pending": int(pending or 0),
+        "completed": int(completed or 0),
+        "completed_unpaid": int(completed_unpaid or 0),
+    }
+
+
+@router.get("/api/assignments/{assignment_id}/detail")
+async def get_assignment_detail(
+    assignment_id: int,
+    include: Optional[str] = Query(default="files", description="Comma-separated: files,activity,master"),
+    activity_limit: int = Query(default=20, ge=1, le=200),
+    fields: Optional[str] = Query(default=None, description="Comma-separated assignment columns (default: all)"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
+):
+    parts = _parse_include(include)
+    projection = parse_fields(fields, AssignmentRead)
+
+    stmt = select(Assignment).options(*_detail_load_options(parts, projection)).where(Assignment.id == assignment_id)
+    obj = (await db.execute(stmt)).unique().scalar_one_or_none()
+    if not obj:
+        raise HTTPException(status_code=404, detail="Assignment not found")
+
+    out: Dict[str, Any] = {"assignment": _detail_assignment_out(obj, projection)}
+
+    if "files" in parts:
+        files = sorted(obj.files or [], key=lambda f: f.uploaded_at, reverse=True)
+        out["files"] = [FileRead.model_validate(f).model_dump() for f in files]
+
+    if "master" in parts:
+        out["master"] = {
+            "bank": _ref_out(obj.bank),
+            "branch": _ref_out(obj.branch),
+            "client": _ref_out(obj.client),
+            "property_type": _ref_out(obj.property_type_ref),
+        }
+
+    if "activity" in parts:
+        stmt = (
+            activity_feed_select()
+            .where(Activity.assignment_id == assignment_id)
+            .order_by(Activity.created_at.desc(), Activity.id.desc())
+            .limit(activity_limit)
+        )
+        rows = (await db.execute(stmt)).all()
+        out["activity"] = [activity_row_out(r) for r in rows]
+
+    return out
+
+
+# ---------------------------
+# Master data
+# ---------------------------
+
+@router.get("/api/master/banks", response_model=List[BankOut])
+async def list_banks(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
+):
+    stmt = select(*schema_columns(Bank, BankOut)).order_by(Bank.name.asc())
+
+    async def load() -> bytes:
+        return rows_json((await db.execute(stmt)).all())
+
+    return json_bytes_response(await BANKS_CACHE.get_or_load_async("all", load))
+
+
+@router.get("/api/master/branches", response_model=List[BranchOut])
+async def list_branches(
+    bank_id: Optional[int] = None,
+    q: Optional[str] = Query(default=None, description="Optional search (case-insensitive substring)"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
+):
+    stmt = select(*schema_columns(Branch, BranchOut))
+    if bank_id is not None:
+        stmt = stmt.where(Branch.bank_id == bank_id)
+    stmt = stmt.order_by(Branch.name.asc())
+    if q:
+        return rows_response((await db.execute(stmt.where(Branch.name.ilike(f"%{_norm_name(q)}%")))).all())
+
+    async def load() -> bytes:
+        return rows_json((await db.execute(stmt)).all())
+
+    return json_bytes_response(await BRANCHES_CACHE.get_or_load_async(bank_id, load))
+
+
+@router.get("/api/master/clients", response_model=List[ClientOut])
+async def list_clients(
+    q: Optional[str] = Query(default=None, description="Optional search (case-insensitive substring)"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
+):
+    stmt = select(*schema_columns(Client, ClientOut)).order_by(Client.name.asc())
+    if q:
+        return rows_response((await db.execute(stmt.where(Client.name.ilike(f"%{_norm_name(q)}%")))).all())
+
+    async def load() -> bytes:
+        return rows_json((await db.execute(stmt)).all())
+
+    return json_bytes_response(await CLIENTS_CACHE.get_or_load_async("all", load))
+
+
+@router.get("/api/master/property-types", response_model=List[PropertyTypeOut])
+async def list_property_types(
+    q: Optional[str] = Query(default=None, description="Optional search (case-insensitive substring)"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
+):
+    stmt = select(*schema_columns(PropertyType, PropertyTypeOut)).order_by(PropertyType.name.asc())
+    if q:
+        return rows_response(
+            (await db.execute(stmt.where(PropertyType.name.ilike(f"%{_norm_name(q)}%")))).all()
+        )
+
+    async def load() -> bytes:
+        return rows_json((await db.execute(stmt)).all())
+
+    return json_bytes_response(await PROPERTY_TYPES_CACHE.get_or_load_async("all", load))
+
+
+# ---------------------------
+# Files
+# ---------------------------
+
+@router.get("/api/files/{assignment_id}", response_model=List[FileRead])
+async def list_files(
+    assignment_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
+):
+    stmt = (
+        select(File)
+        .where(File.assignment_id == assignment_id)
+        .order_by(File.uploaded_at.desc())
+    )
+    files = (await db.execute(stmt)).scalars().all()
+    return [FileRead.model_validate(f) for f in files]
@@ -4,11 +4,14 @@ from __future__ import annotations
 from fastapi import APIRouter, Depends, Header, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from pydantic import BaseModel, Field
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.db import get_db
+from app.db import get_async_db, get_db
 from app.models.user import User
 from app.schemas.user import CreateUserRequest, LoginRequest
+from app.utils.fastjson import rows_response
 from app.utils.security import hash_password, verify_password
 
 # ✅ JWT helpers
@@ -153,6 +156,33 @@ def get_current_user(
     )
 
 
+async def get_current_user_async(
+    db: AsyncSession = Depends(get_async_db),
+    creds: HTTPAuthorizationCredentials | None = Depends(bearer_scheme),
+    x_user_email: str | None = Header(default=None, alias="X-User-Email"),
+) -> User:
+    """Same rules as get_current_user, resolved on the async (asyncpg) session."""
+    if creds and creds.scheme and creds.scheme.lower() == "bearer" and creds.credentials:
+        payload = decode_token(creds.credentials)
+        subject = (payload.get("sub") or "").strip().lower()
+        if not subject:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token subject")
+        email = subject
+    elif x_user_email:
+        email = x_user_email.strip().lower()
+    else:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Missing Authorization Bearer token (or X-User-Email header)",
+        )
+
+    u = (await db.execute(select(User).where(User.email == email))).scalar_one_or_none()
+    if not u:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid user")
+    _ensure_active(u)
+    return u
+
+
 def require_admin(current_user: User = Depends(get_current_user)) -> User:
     _require_roles(current_user, {"ADMIN"})
     return current_user
@@ -169,6 +199,17 @@ def require_admin_or_hr_or_ops(current_user: User = Depends(get_current_user)) -
     return current_user
 
 
+def require_permission(code: str):
+    """Dependency factory: the user's role must hold `code` in the RBAC tables (ADMIN holds all)."""
+
+    def _check(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)) -> User:
+        if code not in get_permissions_for_role(db, _get_user_role(current_user)):
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=f"Missing permission: {code}")
+        return current_user
+
+    return _check
+
+
 # ---------------------------
 # Legacy admin-header method (kept for backward compatibility)
 # ---------------------------
@@ -339,17 +380,13 @@ def list_users(
     """✅ Admin/HR/OPS_MANAGER: list all users (OPS_MANAGER is read-only)."""
     seed_rbac_if_empty(db)
 
-    users = db.query(User).order_by(User.id.asc()).all()
-    return [
-        {
-            "id": u.id,
-            "email": u.email,
-            "full_name": getattr(u, "full_name", None),
-            "role": _get_user_role(u),
-            "is_active": getattr(u, "is_active", True),
-        }
-        for u in users
-    ]
+    # Column tuples only (no ORM hydration); role is NOT NULL so no coercion needed.
+    rows = (
+        db.query(User.id, User.email, User.full_name, User.role, User.is_active)
+        .order_by(User.id.asc())
+        .all()
+    )
+    return rows_response(rows)
 
 
 @router.post("/users")
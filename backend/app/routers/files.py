@@ -1,9 +1,9 @@
 # backend/app/routers/files.py
 import os
 import uuid
-from typing import List
+from typing import List, Optional
 
-from fastapi import APIRouter, UploadFile, File as UploadFileType, Depends, HTTPException
+from fastapi import APIRouter, UploadFile, File as UploadFileType, Depends, Header, HTTPException
 from fastapi.responses import FileResponse
 from sqlalchemy.orm import Session
 
@@ -13,6 +13,7 @@ from app.models.assignment import Assignment
 from app.models.user import User
 from app.routers.auth import get_current_user
 from app.schemas.file import FileRead
+from app.utils import idempotency
 
 # ✅ NEW: activity logger
 from app.utils.activity import log_activity
@@ -27,9 +28,14 @@ os.makedirs(UPLOAD_DIR, exist_ok=True)
 async def upload_file(
     assignment_id: int,
     uploaded: UploadFile = UploadFileType(...),
+    idempotency_key: Optional[str] = Header(default=None),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
+    """
+    With an Idempotency-Key header, a retried upload returns the first
+    upload's file_id instead of writing the file again.
+    """
     assignment = db.query(Assignment).get(assignment_id)
     if not assignment:
         raise HTTPException(status_code=404, detail="Assignment not found")
@@ -37,43 +43,63 @@ async def upload_file(
     original_name = uploaded.filename or "file"
     ext = os.path.splitext(original_name)[1].lower()
 
-    stored_name = f"{assignment_id}_{uuid.uuid4().hex}{ext}"
-    disk_path = os.path.join(UPLOAD_DIR, stored_name)  # uploads/<stored_name>
-
     content = await uploaded.read()
     size_bytes = len(content)
 
-    with open(disk_path, "wb") as f:
-        f.write(content)
-
-    entry = File(
-        assignment_id=assignment_id,
-        filename=original_name,
-        filepath=f"{UPLOAD_DIR}/{stored_name}",  # keep relative path
-        stored_name=stored_name,
-        content_type=uploaded.content_type,
-        size_bytes=size_bytes,
-    )
-    db.add(entry)
-    db.commit()
-    db.refresh(entry)
-
-    # ✅ ACTIVITY LOG
-    log_activity(
+    claim = idempotency.begin(
         db,
-        assignment_id=assignment_id,
-        type="FILE_UPLOADED",
-        actor=current_user,
-        payload={
-            "file_id": entry.id,
-            "filename": entry.filename,
-            "stored_name": entry.stored_name,
-            "content_type": entry.content_type,
-            "size_bytes": entry.size_bytes,
-        },
+        current_user.id,
+        "files.upload",
+        idempotency_key,
+        idempotency.fingerprint(assignment_id, original_name, uploaded.content_type, content),
     )
+    if claim and claim.replay:
+        return claim.replay
+
+    stored_name = f"{assignment_id}_{uuid.uuid4().hex}{ext}"
+    disk_path = os.path.join(UPLOAD_DIR, stored_name)  # uploads/<stored_name>
 
-    return {"status": "ok", "file_id": entry.id}
+    try:
+        with open(disk_path, "wb") as f:
+            f.write(content)
+
+        entry = File(
+            assignment_id=assignment_id,
+            filename=original_name,
+            filepath=f"{UPLOAD_DIR}/{stored_name}",  # keep relative path
+            stored_name=stored_name,
+            content_type=uploaded.content_type,
+            size_bytes=size_bytes,
+        )
+        db.add(entry)
+        db.flush()
+
+        # ✅ ACTIVITY LOG
+        log_activity(
+            db,
+            commit=False,
+            assignment_id=assignment_id,
+            type="FILE_UPLOADED",
+            actor=current_user,
+            payload={
+                "file_id": entry.id,
+                "filename": entry.filename,
+                "stored_name": entry.stored_name,
+                "content_type": entry.content_type,
+                "size_bytes": entry.size_bytes,
+            },
+        )
+
+        # Commits the file row, its activity and the stored response together
+        return idempotency.finish(db, claim, 200, {"status": "ok", "file_id": entry.id})
+    except BaseException:
+        idempotency.abandon(db, claim)
+        # Nothing references the file any more
+        try:
+            os.remove(disk_path)
+        except OSError:
+            pass
+        raise
 
 
 @router.get("/{assignment_id}", response_model=List[FileRead])
@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
+from fastapi.responses import FileResponse
+from sqlalchemy.orm import Session, selectinload
+
+from app.db import get_db
+from app.models.invoice import Invoice
+from app.models.user import User
+from app.routers.auth import require_permission
+from app.schemas.invoice import (
+    InvoiceDetail,
+    InvoicePdfBatchRequest,
+    InvoiceGenerateRequest,
+    InvoiceGenerateResult,
+    InvoicePayee,
+    InvoiceRead,
+)
+from app.utils.invoice_pdf import content_key, invoice_snapshots, render_cached
+from app.utils.invoices import generate_invoices, mark_invoice_paid
+from app.utils.jobs import enqueue
+from app.utils.pagination import apply_keyset, encode_cursor
+
+router = APIRouter(prefix="/api/invoices", tags=["invoices"])
+
+
+@router.post("/generate", response_model=InvoiceGenerateResult)
+def generate(
+    payload: InvoiceGenerateRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_permission("invoices.create")),
+):
+    """
+    Bill every completed, unpaid, not-yet-invoiced assignment of a bank
+    (or one branch) created in [period_from, period_to].
+    """
+    try:
+        invoices = generate_invoices(
+            db,
+            bank_id=payload.bank_id,
+            branch_id=payload.branch_id,
+            period_from=payload.period_from,
+            period_to=payload.period_to,
+            per_branch=payload.per_branch,
+            preview=payload.preview,
+            payee=payload.model_dump(include=set(InvoicePayee.model_fields)),
+            actor_id=current_user.id,
+        )
+    except ValueError as e:
+        db.rollback()
+        raise HTTPException(status_code=404, detail=str(e))
+
+    if payload.preview:
+        db.rollback()
+    else:
+        db.commit()
+        if invoices:
+            print(
+                f"[INVOICE] {current_user.email} generated {len(invoices)} invoice(s) "
+                f"for bank {payload.bank_id} ({sum(i['item_count'] for i in invoices)} items)"
+            )
+
+    return {
+        "preview": payload.preview,
+        "invoices": invoices,
+        "item_count": sum(i["item_count"] for i in invoices),
+        "total_amount": sum(i["total_amount"] for i in invoices),
+    }
+
+
+@router.post("/pdf-batch", status_code=202)
+def queue_pdf_batch(
+    payload: InvoicePdfBatchRequest,
+    db: Session = Depends(get_db),
+    # Bulk CPU work on the workers: same permission as generating invoices, not read
+    current_user: User = Depends(require_permission("invoices.create")),
+):
+    """Pre-render every invoice PDF issued in a month on the job workers; poll /api/jobs/{job_id}."""
+    job = enqueue(
+        db,
+        "invoice_pdf.month",
+        {"month": payload.month, "force": payload.force},
+        priority=-1,  # bulk work yields to interactive jobs
+        # A forced re-render must not attach to a run that skips cached PDFs
+        dedup_key=f"invoice_pdf.month:{payload.month}" + (":force" if payload.force else ""),
+        user_id=current_user.id,
+    )
+    return {"job_id": job.id, "status": job.status}
+
+
+@router.get("")
+@router.get("/")
+def list_invoices(
+    bank_id: Optional[int] = Query(default=None),
+    status: Optional[str] = Query(default=None, description="ISSUED / PAID"),
+    cursor: Optional[str] = Query(default=None),
+    limit: int = Query(default=50, ge=1, le=200),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_permission("invoices.read")),
+):
+    """Newest first, keyset-paged over (created_at DESC, id DESC)."""
+    query = db.query(Invoice)
+    if bank_id is not None:
+        query = query.filter(Invoice.bank_id == bank_id)
+    if status:
+        query = query.filter(Invoice.status == status.strip().upper())
+
+    rows = apply_keyset(query, Invoice.created_at, Invoice.id, cursor).limit(limit + 1).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    next_cursor = None
+    if has_more and rows:
+        next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id)
+
+    items: List[dict] = [InvoiceRead.model_validate(r).model_dump(mode="json") for r in rows]
+    return {"items": items, "next_cursor": next_cursor}
+
+
+@router.get("/{invoice_id}", response_model=InvoiceDetail)
+def get_invoice(
+    invoice_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_permission("invoices.read")),
+):
+    obj = db.query(Invoice).options(selectinload(Invoice.items)).filter(Invoice.id == invoice_id).first()
+    if not obj:
+        raise HTTPException(status_code=404, detail="Invoice not found")
+    return obj
+
+
+@router.get("/{invoice_id}/pdf")
+def get_invoice_pdf(
+    invoice_id: int,
+    if_none_match: Optional[str] = Header(default=None),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_permission("invoices.read")),
+):
+    """
+    Rendered in the PDF process pool on first request, then served from the
+    content-hash cache. The hash doubles as a strong ETag.
+    """
+    docs = invoice_snapshots(db, [invoice_id])
+    if not docs:
+        raise HTTPException(status_code=404, detail="Invoice not found")
+    doc = docs[0]
+    db.close()  # don't hold a pooled connection while rendering
+
+    etag = f'"{content_key(doc)}"'
+    if if_none_match == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+
+    path = render_cached(doc)
+    return FileResponse(
+        path,
+        media_type="application/pdf",
+        filename=f"{doc['invoice_number'].replace('/', '-')}.pdf",
+        headers={"ETag": etag, "Cache-Control": "private, max-age=0, must-revalidate"},
+    )
+
+
+@router.post("/{invoice_id}/mark-paid", response_model=InvoiceRead)
+def mark_paid(
+    invoice_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_permission("invoices.mark_paid")),
+):
+    obj = db.query(Invoice).get(invoice_id)
+    if not obj:
+        raise HTTPException(status_code=404, detail="Invoice not found")
+    if obj.status != "ISSUED":
+        raise HTTPException(status_code=409, detail=f"Invoice is {obj.status}")
+
+    updated = mark_invoice_paid(db, invoice_id)
+    db.commit()
+    db.refresh(obj)
+    print(f"[INVOICE] {obj.invoice_number} marked paid by {current_user.email} ({updated} assignments)")
+    return obj
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+
+from app.db import get_db
+from app.models.job import Job
+from app.models.user import User
+from app.routers.auth import get_current_user
+from app.schemas.job import JobRead
+from app.utils.jobs import cancel
+
+router = APIRouter(prefix="/api/jobs", tags=["jobs"])
+
+
+def _is_admin(user: User) -> bool:
+    return (getattr(user, "role", "") or "").upper() == "ADMIN"
+
+
+def _get_visible_job(db: Session, job_id: int, user: User) -> Job:
+    obj = db.get(Job, job_id)
+    # Visible to whoever created or requested it (dedup); otherwise it looks missing
+    if not obj or (
+        obj.created_by_user_id != user.id
+        and user.id not in (obj.requested_by_user_ids or [])
+        and not _is_admin(user)
+    ):
+        raise HTTPException(status_code=404, detail="Job not found")
+    return obj
+
+
+@router.get("", response_model=List[JobRead])
+@router.get("/", response_model=List[JobRead])
+def list_my_jobs(
+    status: Optional[str] = Query(default=None, description="QUEUED / RUNNING / SUCCEEDED / FAILED / CANCELLED"),
+    limit: int = Query(default=20, ge=1, le=100),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """The caller's most recent jobs, including ones they requested that someone else started."""
+    query = db.query(Job).filter(
+        or_(Job.created_by_user_id == current_user.id, Job.requested_by_user_ids.contains([current_user.id]))
+    )
+    if status:
+        query = query.filter(Job.status == status.strip().upper())
+    return query.order_by(Job.id.desc()).limit(limit).all()
+
+
+@router.get("/{job_id}", response_model=JobRead)
+def get_job(
+    job_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Poll a job's status / progress / result."""
+    return _get_visible_job(db, job_id, current_user)
+
+
+@router.post("/{job_id}/cancel", response_model=JobRead)
+def cancel_job(
+    job_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    obj = _get_visible_job(db, job_id, current_user)
+    # Requesters share the job with its creator; only the creator can call it off
+    if obj.created_by_user_id != current_user.id and not _is_admin(current_user):
+        raise HTTPException(status_code=403, detail="Only the user who started this job can cancel it")
+    if not cancel(db, obj.id):
+        raise HTTPException(status_code=409, detail=f"Job is {obj.status}")
+    db.refresh(obj)
+    return obj
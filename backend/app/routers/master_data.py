@@ -10,9 +10,20 @@ from app.db import get_db
 from app.models.master_data import Bank, Branch, Client, PropertyType
 from app.models.user import User
 from app.routers.auth import get_current_user
+from app.utils.cache import invalidate, register_namespace
+from app.utils.fastjson import json_bytes_response, rows_json, rows_response, schema_columns
 
 router = APIRouter(prefix="/api/master", tags=["master-data"])
 
+# Encoded unfiltered lists (every form's dropdowns), shared with async_reads.
+# These endpoints read the primary: a cache miss right after a write must not
+# reload from a replica that hasn't replayed it yet.
+MASTER_CACHE_TTL = 600
+BANKS_CACHE = register_namespace("master.banks", ttl=MASTER_CACHE_TTL, max_entries=1)
+BRANCHES_CACHE = register_namespace("master.branches", ttl=MASTER_CACHE_TTL, max_entries=512)  # per bank_id
+CLIENTS_CACHE = register_namespace("master.clients", ttl=MASTER_CACHE_TTL, max_entries=1)
+PROPERTY_TYPES_CACHE = register_namespace("master.property_types", ttl=MASTER_CACHE_TTL, max_entries=1)
+
 
 # ---------------------------
 # Utilities
@@ -213,7 +224,10 @@ def list_banks(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    return db.query(Bank).order_by(Bank.name.asc()).all()
+    body = BANKS_CACHE.get_or_load(
+        "all", lambda: rows_json(db.query(*schema_columns(Bank, BankOut)).order_by(Bank.name.asc()).all())
+    )
+    return json_bytes_response(body)
 
 
 @router.post("/banks", response_model=BankOut)
@@ -234,6 +248,7 @@ def create_bank(
 
     bank = Bank(name=name)
     db.add(bank)
+    invalidate(db, "master.banks")
     db.commit()
     db.refresh(bank)
     return bank
@@ -277,6 +292,7 @@ def update_bank(
         setattr(bank, k, v)
 
     db.add(bank)
+    invalidate(db, "master.banks")
     db.commit()
     db.refresh(bank)
     return bank
@@ -293,12 +309,13 @@ def list_branches(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    query = db.query(Branch)
+    query = db.query(*schema_columns(Branch, BranchOut))
     if bank_id is not None:
         query = query.filter(Branch.bank_id == bank_id)
+    query = query.order_by(Branch.name.asc())
     if q:
-        query = query.filter(Branch.name.ilike(f"%{_norm_name(q)}%"))
-    return query.order_by(Branch.name.asc()).all()
+        return rows_response(query.filter(Branch.name.ilike(f"%{_norm_name(q)}%")).all())
+    return json_bytes_response(BRANCHES_CACHE.get_or_load(bank_id, lambda: rows_json(query.all())))
 
 
 @router.get("/branches/{branch_id}", response_model=BranchOut)
@@ -355,6 +372,7 @@ def create_branch(
         is_active=(payload.is_active if payload.is_active is not None else True),
     )
     db.add(branch)
+    invalidate(db, "master.branches")
     db.commit()
     db.refresh(branch)
     return branch
@@ -397,6 +415,7 @@ def update_branch(
         setattr(br, k, v)
 
     db.add(br)
+    invalidate(db, "master.branches")
     db.commit()
     db.refresh(br)
     return br
@@ -412,10 +431,10 @@ def list_clients(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    query = db.query(Client)
+    query = db.query(*schema_columns(Client, ClientOut)).order_by(Client.name.asc())
     if q:
-        query = query.filter(Client.name.ilike(f"%{_norm_name(q)}%"))
-    return query.order_by(Client.name.asc()).all()
+        return rows_response(query.filter(Client.name.ilike(f"%{_norm_name(q)}%")).all())
+    return json_bytes_response(CLIENTS_CACHE.get_or_load("all", lambda: rows_json(query.all())))
 
 
 @router.post("/clients", response_model=ClientOut)
@@ -439,6 +458,7 @@ def create_client(
         email=_norm_email(payload.email),
     )
     db.add(client)
+    invalidate(db, "master.clients")
     db.commit()
     db.refresh(client)
     return client
@@ -454,10 +474,10 @@ def list_property_types(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    query = db.query(PropertyType)
+    query = db.query(*schema_columns(PropertyType, PropertyTypeOut)).order_by(PropertyType.name.asc())
     if q:
-        query = query.filter(PropertyType.name.ilike(f"%{_norm_name(q)}%"))
-    return query.order_by(PropertyType.name.asc()).all()
+        return rows_response(query.filter(PropertyType.name.ilike(f"%{_norm_name(q)}%")).all())
+    return json_bytes_response(PROPERTY_TYPES_CACHE.get_or_load("all", lambda: rows_json(query.all())))
 
 
 @router.post("/property-types", response_model=PropertyTypeOut)
@@ -477,6 +497,7 @@ def create_property_type(
 
     pt = PropertyType(name=name)
     db.add(pt)
+    invalidate(db, "master.property_types")
     db.commit()
     db.refresh(pt)
     return pt
\ No newline at end of file
@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+import os
+
+from fastapi import APIRouter, Header, HTTPException, status
+from fastapi.responses import PlainTextResponse
+
+from app.utils.metrics import REGISTRY
+
+router = APIRouter(prefix="/api", tags=["metrics"])
+
+# Optional: require `Authorization: Bearer <token>` from the scraper.
+METRICS_TOKEN = os.getenv("ZEN_METRICS_TOKEN", "").strip()
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def metrics(authorization: str | None = Header(default=None)):
+    """Prometheus text exposition for this worker process."""
+    if METRICS_TOKEN and (authorization or "") != f"Bearer {METRICS_TOKEN}":
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid metrics token")
+
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+from typing import Any, Dict, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from app.db import get_db
+from app.models.assignment import Assignment
+from app.models.notification import Notification
+from app.models.user import User
+from app.routers.auth import get_current_user
+from app.utils.notifications import mark_all_read, mark_read, unread_count
+from app.utils.pagination import apply_keyset, encode_cursor
+
+router = APIRouter(prefix="/api/notifications", tags=["notifications"])
+
+
+def _row_out(r) -> Dict[str, Any]:
+    return {
+        "id": r.id,
+        "type": r.type,
+        "assignment_id": r.assignment_id,
+        "assignment_code": r.assignment_code,
+        "actor_user_id": r.actor_user_id,
+        "actor_name": r.actor_name,
+        "payload": r.payload,
+        "read": r.read_at is not None,
+        "created_at": r.created_at.isoformat() if r.created_at else None,
+    }
+
+
+# ---------------------------
+# Routes
+# ---------------------------
+
+@router.get("/unread-count")
+def get_unread_count(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Bell badge: a primary-key read of notification_counters.
+
+    Bell endpoints share get_current_user's session (get_db) rather than
+    get_read_db: one pooled connection per poll, and the count is never
+    behind the user's own mark-read.
+    """
+    return {"unread": unread_count(db, current_user.id)}
+
+
+@router.get("")
+@router.get("/")
+def list_notifications(
+    cursor: Optional[str] = Query(default=None),
+    limit: int = Query(default=20, ge=1, le=100),
+    unread_only: bool = Query(default=False),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Newest first, keyset-paged over (created_at DESC, id DESC)."""
+    query = (
+        db.query(
+            Notification.id,
+            Notification.type,
+            Notification.assignment_id,
+            Notification.actor_user_id,
+            Notification.payload,
+            Notification.read_at,
+            Notification.created_at,
+            Assignment.assignment_code,
+            User.full_name.label("actor_name"),
+        )
+        .outerjoin(Assignment, Assignment.id == Notification.assignment_id)
+        .outerjoin(User, User.id == Notification.actor_user_id)
+        .filter(Notification.user_id == current_user.id)
+    )
+    if unread_only:
+        query = query.filter(Notification.read_at.is_(None))
+
+    rows = apply_keyset(query, Notification.created_at, Notification.id, cursor).limit(limit + 1).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    next_cursor = None
+    if has_more and rows:
+        next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id)
+
+    return {"items": [_row_out(r) for r in rows], "next_cursor": next_cursor}
+
+
+@router.post("/{notification_id}/read")
+def read_one(
+    notification_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    if not mark_read(db, current_user.id, notification_id):
+        exists = (
+            db.query(Notification.id)
+            .filter(Notification.id == notification_id, Notification.user_id == current_user.id)
+            .first()
+        )
+        if not exists:
+            raise HTTPException(status_code=404, detail="Notification not found")
+    return {"unread": unread_count(db, current_user.id)}
+
+
+@router.post("/read-all")
+def read_all(
+    up_to_id: Optional[int] = Query(default=None, description="Only mark notifications with id <= this"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    updated = mark_all_read(db, current_user.id, up_to_id)
+    return {"updated": updated, "unread": unread_count(db, current_user.id)}
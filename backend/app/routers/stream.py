@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query, WebSocket, status
+from sqlalchemy import select
+
+from app.db import SessionLocal
+from app.models.user import User
+from app.utils.broadcast import broadcaster
+from app.utils.jwt import decode_token
+
+router = APIRouter(tags=["stream"])
+
+# Idle connections get a ping this often (keeps proxies from closing them)
+HEARTBEAT_SECONDS = 25.0
+
+
+def _load_user(token: Optional[str]) -> Optional[User]:
+    if not token:
+        return None
+    try:
+        subject = (decode_token(token).get("sub") or "").strip().lower()
+    except HTTPException:
+        return None
+    if not subject:
+        return None
+
+    db = SessionLocal()
+    try:
+        u = db.execute(select(User).where(User.email == subject)).scalar_one_or_none()
+        if not u or not u.is_active:
+            return None
+        db.expunge(u)
+        return u
+    finally:
+        db.close()
+
+
+async def _pump(websocket: WebSocket, queue: asyncio.Queue) -> None:
+    while True:
+        try:
+            event = await asyncio.wait_for(queue.get(), timeout=HEARTBEAT_SECONDS)
+        except asyncio.TimeoutError:
+            event = {"type": "ping"}
+        await websocket.send_json(event)
+
+
+@router.websocket("/api/stream")
+async def stream(websocket: WebSocket, token: Optional[str] = Query(default=None)):
+    """
+    Live change events (assignment / file / activity / notification).
+
+    Browsers can't set headers on a WebSocket, so the JWT comes as ?token=.
+    Messages are JSON objects with a "type"; on {"type": "stream.resync"}
+    the client should refetch what it shows. Anything the client sends is
+    ignored (it only keeps the socket alive).
+    """
+    user = await asyncio.to_thread(_load_user, token)
+    if user is None:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    await websocket.accept()
+    sub = broadcaster.subscribe(user.id, user.role)
+    await websocket.send_json({"type": "stream.ready", "user_id": user.id})
+
+    pump = asyncio.create_task(_pump(websocket, sub.queue))
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+    finally:
+        broadcaster.unsubscribe(sub)
+        pump.cancel()
+        try:
+            await pump
+        except (asyncio.CancelledError, Exception):
+            pass
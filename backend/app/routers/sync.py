@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from app.db import get_db
+from app.models.user import User
+from app.routers.auth import get_current_user
+from app.utils.sync import changes
+
+router = APIRouter(prefix="/api/sync", tags=["sync"])
+
+
+@router.get("/changes")
+def get_changes(
+    since: Optional[str] = Query(default=None, description="next_token from the previous call; omit for a full sync"),
+    limit: int = Query(default=500, ge=1, le=5000),
+    # Primary, not replica: a window must never be served from a replica that hasn't caught up to it
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Assignments, files, activities and master data changed since `since`.
+
+    Each change is {"table", "op": "upsert", "row"} or {"table", "op": "delete", "id"}.
+    Keep calling with next_token while has_more is true; store the last
+    next_token for the next sync. 410 = token too old, sync again without one.
+    """
+    return changes(db, since, limit)
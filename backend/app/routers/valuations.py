@@ -0,0 +1,262 @@
+from __future__ import annotations
+
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.db import get_db
+from app.models.assignment import Assignment
+from app.models.user import User
+from app.models.valuation import CalculationTemplate
+from app.routers.auth import require_permission
+from app.schemas.valuation import (
+    AssignmentInputsUpdate,
+    TemplateApplyRequest,
+    TemplateCreate,
+    TemplatePreviewRequest,
+    TemplateRead,
+    TemplateUpdate,
+)
+from app.utils.formula import FormulaError
+from app.utils.jobs import enqueue
+from app.utils.scheduler import load_state
+from app.utils.valuation_recompute import request_for_change, request_recompute, state_name
+from app.utils.valuation import (
+    evaluate_assignment,
+    evaluate_assignments,
+    evaluate_inputs,
+    find_template,
+    validate_template,
+)
+
+router = APIRouter(prefix="/api/valuations", tags=["valuations"])
+
+
+def _get_template(db: Session, template_id: int) -> CalculationTemplate:
+    obj = db.query(CalculationTemplate).get(template_id)
+    if not obj:
+        raise HTTPException(status_code=404, detail="Template not found")
+    return obj
+
+
+def _validate(definitions, fields) -> None:
+    try:
+        validate_template(definitions, fields)
+    except FormulaError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+
+def _commit_template(db: Session, obj: CalculationTemplate) -> CalculationTemplate:
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=409, detail="An active template already exists for this bank / property type")
+    db.refresh(obj)
+    return obj
+
+
+# ---------------------------
+# Templates
+# ---------------------------
+
+@router.get("/templates", response_model=list[TemplateRead])
+def list_templates(
+    bank_id: Optional[int] = Query(default=None),
+    property_type_id: Optional[int] = Query(default=None),
+    include_inactive: bool = Query(default=False),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_permission("assignments.read")),
+):
+    query = db.query(CalculationTemplate)
+    if bank_id is not None:
+        query = query.filter(CalculationTemplate.bank_id == bank_id)
+    if property_type_id is not None:
+        query = query.filter(CalculationTemplate.property_type_id == property_type_id)
+    if not include_inactive:
+        query = query.filter(CalculationTemplate.is_active.is_(True))
+    return query.order_by(CalculationTemplate.id).all()
+
+
+@router.post("/templates", response_model=TemplateRead, status_code=201)
+def create_template(
+    payload: TemplateCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_permission("masterdata.edit")),
+):
+    _validate(payload.formula_definitions_json, payload.required_fields_json)
+    obj = CalculationTemplate(**payload.model_dump(), version=1, created_by_user_id=current_user.id)
+    db.add(obj)
+    obj = _commit_template(db, obj)
+    if obj.is_active:
+        request_for_change(db, obj)
+    return obj
+
+
+@router.patch("/templates/{template_id}", response_model=TemplateRead)
+def update_template(
+    template_id: int,
+    payload: TemplateUpdate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_permission("masterdata.edit")),
+):
+    """
+    Changing the formulas or fields bumps `version`. A new version, or
+    switching the template on/off, queues a recompute of the assignments
+    affected (see app/utils/valuation_recompute.py).
+    """
+    obj = _get_template(db, template_id)
+    data = payload.model_dump(exclude_unset=True)
+    was_active = obj.is_active
+
+    definitions = data.get("formula_definitions_json", obj.formula_definitions_json)
+    fields = data.get("required_fields_json", obj.required_fields_json)
+    bumped = definitions != obj.formula_definitions_json or fields != obj.required_fields_json
+    if bumped:
+        _validate(definitions, fields)
+        obj.version = obj.version + 1
+
+    for field, value in data.items():
+        setattr(obj, field, value)
+    obj = _commit_template(db, obj)
+
+    if (bumped and obj.is_active) or obj.is_active != was_active:
+        queued = request_for_change(db, obj)
+        print(f"[VALUATION] template {obj.id} v{obj.version} changed by {current_user.email}; recompute queued for {queued}")
+    return obj
+
+
+@router.get("/templates/{template_id}/recompute")
+def get_recompute_progress(
+    template_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_permission("assignments.read")),
+):
+    """Progress of the template's last requested recompute ({} if none)."""
+    obj = _get_template(db, template_id)
+    return {"template_id": obj.id, "template_version": obj.version, **load_state(db, state_name(obj.id))}
+
+
+@router.post("/templates/{template_id}/recompute", status_code=202)
+def start_recompute(
+    template_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_permission("masterdata.edit")),
+):
+    """
+    Re-evaluate every open assignment using this template from scratch.
+    Queued as a "valuation.recompute" job; poll /api/jobs/{job_id}.
+    """
+    obj = _get_template(db, template_id)
+    if not obj.is_active:
+        raise HTTPException(status_code=409, detail="Template is not active")
+    state = request_recompute(db, obj)
+    job = enqueue(
+        db,
+        "valuation.recompute",
+        {"template_id": obj.id},
+        dedup_key=f"valuation.recompute:{obj.id}",
+        max_attempts=10,
+        user_id=current_user.id,
+    )
+    return {"template_id": obj.id, "job_id": job.id, **state}
+
+
+@router.post("/templates/{template_id}/preview")
+def preview_template(
+    template_id: int,
+    payload: TemplatePreviewRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_permission("assignments.read")),
+):
+    """Evaluate over ad-hoc inputs (the dynamic input form); nothing is stored."""
+    obj = _get_template(db, template_id)
+    try:
+        values = evaluate_inputs(obj, payload.inputs)
+    except FormulaError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return {"template_id": obj.id, "template_version": obj.version, "values": values}
+
+
+@router.post("/templates/{template_id}/apply")
+def apply_template(
+    template_id: int,
+    payload: TemplateApplyRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_permission("assignments.update")),
+):
+    """Evaluate one template over many assignments in a single pass."""
+    obj = _get_template(db, template_id)
+    try:
+        docs = evaluate_assignments(db, obj, payload.assignment_ids, persist=payload.persist)
+    except FormulaError as e:
+        db.rollback()
+        raise HTTPException(status_code=422, detail=str(e))
+
+    if payload.persist:
+        db.commit()
+    else:
+        db.rollback()
+
+    return {
+        "template_id": obj.id,
+        "template_version": obj.version,
+        "persisted": payload.persist,
+        "evaluated": len(docs),
+        "failed": sum(1 for d in docs.values() if d["error"]),
+        "skipped": len(set(payload.assignment_ids) - docs.keys()),
+        "results": [{"assignment_id": k, **v} for k, v in docs.items()],
+    }
+
+
+# ---------------------------
+# Assignments
+# ---------------------------
+
+def _assignment_out(obj: Assignment) -> dict:
+    return {
+        "assignment_id": obj.id,
+        "inputs": obj.valuation_input_json or {},
+        "output": obj.valuation_output_json,
+    }
+
+
+@router.get("/assignments/{assignment_id}")
+def get_assignment_valuation(
+    assignment_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_permission("assignments.read")),
+):
+    obj = db.query(Assignment).get(assignment_id)
+    if not obj:
+        raise HTTPException(status_code=404, detail="Assignment not found")
+
+    template = find_template(db, obj.bank_id, obj.property_type_id)
+    out = _assignment_out(obj)
+    out["template"] = TemplateRead.model_validate(template).model_dump(mode="json") if template else None
+    return out
+
+
+@router.put("/assignments/{assignment_id}")
+def update_assignment_valuation(
+    assignment_id: int,
+    payload: AssignmentInputsUpdate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_permission("assignments.update")),
+):
+    """Store the valuer's inputs and recompute with the matching template."""
+    obj = db.query(Assignment).get(assignment_id)
+    if not obj:
+        raise HTTPException(status_code=404, detail="Assignment not found")
+
+    obj.valuation_input_json = payload.inputs
+    try:
+        evaluate_assignment(db, obj)
+    except FormulaError as e:
+        db.rollback()
+        raise HTTPException(status_code=422, detail=str(e))
+    db.commit()
+    db.refresh(obj)
+    return _assignment_out(obj)
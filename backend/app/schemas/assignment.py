@@ -31,8 +31,10 @@ class AssignmentBase(BaseModel):
 
     status: str = Field(default="SITE_VISIT")
 
-    # ✅ Keep ONLY legacy assigned_to for now (DB column exists)
+    # Preferred: assigned_to_user_id. assigned_to is the display name (free text
+    # still accepted and mapped to a user when it matches exactly one).
     assigned_to: Optional[str] = None
+    assigned_to_user_id: Optional[int] = None
 
     site_visit_date: Optional[date] = None
     report_due_date: Optional[date] = None
@@ -70,6 +72,7 @@ class AssignmentUpdate(BaseModel):
 
     status: Optional[str] = None
     assigned_to: Optional[str] = None
+    assigned_to_user_id: Optional[int] = None
 
     site_visit_date: Optional[date] = None
     report_due_date: Optional[date] = None
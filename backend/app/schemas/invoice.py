@@ -0,0 +1,91 @@
+# backend/app/schemas/invoice.py
+from __future__ import annotations
+
+from datetime import date, datetime
+from typing import List, Optional
+
+from pydantic import BaseModel, Field, model_validator
+
+
+class InvoicePayee(BaseModel):
+    # Any field left out falls back to the bank's account_* / upi_id / invoice_notes
+    payee_account_name: Optional[str] = None
+    payee_account_number: Optional[str] = None
+    payee_ifsc: Optional[str] = None
+    payee_bank_name: Optional[str] = None
+    payee_branch_name: Optional[str] = None
+    payee_upi_id: Optional[str] = None
+    notes: Optional[str] = None
+
+
+class InvoiceGenerateRequest(InvoicePayee):
+    bank_id: int
+    branch_id: Optional[int] = None
+    period_from: date
+    period_to: date
+
+    # One invoice per branch instead of one for the whole bank
+    per_branch: bool = False
+
+    # Return the invoices that would be generated without writing anything
+    preview: bool = False
+
+    @model_validator(mode="after")
+    def _check_period(self):
+        if self.period_from > self.period_to:
+            raise ValueError("period_from must be on or before period_to")
+        return self
+
+
+class InvoicePdfBatchRequest(BaseModel):
+    month: str = Field(..., pattern=r"^\d{4}-(0[1-9]|1[0-2])$", examples=["2026-10"])
+    force: bool = False
+
+
+class InvoiceSummary(BaseModel):
+    id: Optional[int] = None
+    invoice_number: Optional[str] = None
+    branch_id: Optional[int] = None
+    item_count: int
+    total_amount: int
+
+
+class InvoiceGenerateResult(BaseModel):
+    preview: bool
+    invoices: List[InvoiceSummary]
+    item_count: int
+    total_amount: int
+
+
+class InvoiceItemRead(BaseModel):
+    id: int
+    assignment_id: Optional[int] = None
+    assignment_code: str
+    borrower_name: Optional[str] = None
+    branch_name: Optional[str] = None
+    amount: int
+
+    class Config:
+        from_attributes = True
+
+
+class InvoiceRead(InvoicePayee):
+    id: int
+    invoice_number: str
+    bank_id: int
+    branch_id: Optional[int] = None
+    period_from: date
+    period_to: date
+    issue_date: date
+    status: str = Field(..., example="ISSUED")  # ISSUED / PAID
+    item_count: int
+    total_amount: int
+    paid_at: Optional[datetime] = None
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class InvoiceDetail(InvoiceRead):
+    items: List[InvoiceItemRead] = []
@@ -0,0 +1,57 @@
+# backend/app/schemas/valuation.py
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Union
+
+from pydantic import BaseModel, Field
+
+
+class TemplateBase(BaseModel):
+    name: str
+    # NULL = any bank / any property type
+    bank_id: Optional[int] = None
+    property_type_id: Optional[int] = None
+
+    # {output: expression}; see app/utils/formula.py for the syntax
+    formula_definitions_json: Dict[str, Union[str, float]]
+    # ["land_rate", {"name": "life_years", "default": 60, "label": "Economic life (years)"}]
+    required_fields_json: List[Union[str, Dict[str, Any]]] = Field(default_factory=list)
+
+    is_active: bool = True
+
+
+class TemplateCreate(TemplateBase):
+    pass
+
+
+class TemplateUpdate(BaseModel):
+    name: Optional[str] = None
+    formula_definitions_json: Optional[Dict[str, Union[str, float]]] = None
+    required_fields_json: Optional[List[Union[str, Dict[str, Any]]]] = None
+    is_active: Optional[bool] = None
+
+
+class TemplateRead(TemplateBase):
+    id: int
+    version: int
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class TemplatePreviewRequest(BaseModel):
+    inputs: Dict[str, Any] = Field(default_factory=dict)
+
+
+class TemplateApplyRequest(BaseModel):
+    assignment_ids: List[int] = Field(..., min_length=1, max_length=1000)
+    # False = evaluate and return without storing
+    persist: bool = True
+
+
+class AssignmentInputsUpdate(BaseModel):
+    # Replaces valuation_input_json, then recomputes
+    inputs: Dict[str, Any]
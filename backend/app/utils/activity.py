@@ -1,11 +1,13 @@
 from __future__ import annotations
 
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from app.models.activity import Activity
 from app.models.user import User
+from app.utils.broadcast import ACTIVITY_EVENT_TYPES, publish_event
 
 
 def log_activity(
@@ -15,12 +17,16 @@ def log_activity(
     type: str,
     actor: Optional[User] = None,
     payload: Optional[Dict[str, Any]] = None,
+    commit: bool = True,
 ) -> Activity:
     """
     Writes an activity row (audit log) for an assignment.
 
-    Commits immediately so logs don't silently disappear.
+    Commits immediately so logs don't silently disappear; with commit=False
+    the caller commits it together with the change it records.
     Payload must be JSON-serializable.
+
+    Also publishes the matching /api/stream event, delivered on that commit.
     """
     a = Activity(
         assignment_id=assignment_id,
@@ -29,6 +35,75 @@ def log_activity(
         payload=payload or {},
     )
     db.add(a)
-    db.commit()
-    db.refresh(a)
-    return a
\ No newline at end of file
+    db.flush()
+    publish_event(
+        db,
+        ACTIVITY_EVENT_TYPES.get(type, "activity.created"),
+        assignment_id=assignment_id,
+        actor_id=a.actor_user_id,
+        data={"activity_id": a.id, "activity_type": type, **(payload or {})},
+    )
+    if commit:
+        db.commit()
+        db.refresh(a)
+    return a
+
+
+# ---------------------------
+# Feed reads
+# ---------------------------
+
+def parse_activity_types(types: Optional[str]) -> List[str]:
+    # "STATUS_CHANGED, file_uploaded" -> ["STATUS_CHANGED", "FILE_UPLOADED"]
+    return [t.strip().upper() for t in (types or "").split(",") if t.strip()]
+
+
+def _feed_columns() -> tuple:
+    return (
+        Activity.id,
+        Activity.assignment_id,
+        Activity.type,
+        Activity.payload,
+        Activity.actor_user_id,
+        Activity.created_at,
+        User.full_name.label("actor_name"),
+        User.email.label("actor_email"),
+    )
+
+
+def activity_feed_query(db: Session, types: Optional[str] = None):
+    """
+    Activity rows + actor name in ONE query (LEFT JOIN users).
+    Actor may be NULL (system events / deleted users).
+    """
+    query = db.query(*_feed_columns()).outerjoin(User, User.id == Activity.actor_user_id)
+
+    type_list = parse_activity_types(types)
+    if type_list:
+        query = query.filter(Activity.type.in_(type_list))
+
+    return query
+
+
+def activity_feed_select(types: Optional[str] = None):
+    """Same as activity_feed_query, as a 2.0 select() (for AsyncSession)."""
+    stmt = select(*_feed_columns()).outerjoin(User, User.id == Activity.actor_user_id)
+
+    type_list = parse_activity_types(types)
+    if type_list:
+        stmt = stmt.where(Activity.type.in_(type_list))
+
+    return stmt
+
+
+def activity_row_out(r) -> Dict[str, Any]:
+    return {
+        "id": r.id,
+        "assignment_id": r.assignment_id,
+        "type": r.type,
+        "payload": r.payload,
+        "actor_user_id": r.actor_user_id,
+        "actor_name": r.actor_name,
+        "actor_email": r.actor_email,
+        "created_at": r.created_at.isoformat() if r.created_at else None,
+    }
@@ -0,0 +1,157 @@
+"""
+Archive old activity partitions to compressed NDJSON, then detach them.
+
+Usage (from backend/):
+    python -m app.utils.activity_archive --keep-months 12 --out-dir archive/activities
+    python -m app.utils.activity_archive --keep-months 12 --drop     # also DROP after export
+    python -m app.utils.activity_archive --keep-months 12 --dry-run
+
+Each partition becomes <out-dir>/activities_pYYYYMM.ndjson.gz (one JSON object per line).
+The file is written to a temp name and renamed only after a complete export,
+so a crash never leaves a half-written archive next to a detached partition.
+Archived rows get sync_tombstones entries (detaching fires no delete
+trigger), so offline clients drop them on their next delta sync.
+"""
+from __future__ import annotations
+
+import argparse
+import gzip
+import json
+import os
+from datetime import date
+from typing import List
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.db import SessionLocal
+from app.utils.partitions import (
+    PARENT_TABLE,
+    add_months,
+    ensure_activity_partitions,
+    is_partitioned,
+    list_partitions,
+    month_start,
+)
+
+EXPORT_BATCH = 5000
+
+
+def _json_default(v):
+    # datetimes / dates / Decimals etc.
+    return v.isoformat() if hasattr(v, "isoformat") else str(v)
+
+
+def export_partition(db: Session, name: str, out_dir: str) -> tuple[str, int]:
+    """Stream one partition to <out_dir>/<name>.ndjson.gz. Returns (path, row_count)."""
+    os.makedirs(out_dir, exist_ok=True)
+    final_path = os.path.join(out_dir, f"{name}.ndjson.gz")
+    tmp_path = final_path + ".tmp"
+
+    result = db.connection().execution_options(stream_results=True).execute(
+        text(
+            f'SELECT id, assignment_id, actor_user_id, type, payload, created_at '
+            f'FROM "{name}" ORDER BY created_at, id'
+        )
+    )
+
+    count = 0
+    with gzip.open(tmp_path, "wt", encoding="utf-8") as fh:
+        for chunk in result.mappings().partitions(EXPORT_BATCH):
+            for row in chunk:
+                fh.write(json.dumps(dict(row), default=_json_default, separators=(",", ":")))
+                fh.write("\n")
+                count += 1
+
+    os.replace(tmp_path, final_path)
+    return final_path, count
+
+
+def archive_old_partitions(
+    db: Session,
+    *,
+    keep_months: int,
+    out_dir: str,
+    drop: bool = False,
+    dry_run: bool = False,
+) -> List[dict]:
+    """
+    Export + detach every monthly partition that ends before
+    (current month - keep_months). The current month is never touched.
+    """
+    if keep_months < 1:
+        raise ValueError("keep_months must be >= 1")
+    if not is_partitioned(db):
+        raise RuntimeError("activities is not partitioned (run alembic upgrade head)")
+
+    cutoff = add_months(month_start(date.today()), -keep_months)
+    report: List[dict] = []
+
+    for name, month in list_partitions(db):
+        if month >= cutoff:
+            continue
+
+        if dry_run:
+            report.append({"partition": name, "action": "would_archive"})
+            continue
+
+        path, rows = export_partition(db, name, out_dir)
+        db.rollback()  # end the read transaction before DDL
+
+        # DETACH/DROP fire no delete triggers: tombstone the rows ourselves, in the
+        # same transaction, so delta-sync clients drop their copies too
+        db.execute(
+            text(
+                "INSERT INTO sync_tombstones (table_name, row_id, change_xid, deleted_at) "
+                f"SELECT :t, id, pg_current_xact_id()::text::bigint, now() AT TIME ZONE 'utc' FROM \"{name}\""
+            ),
+            {"t": PARENT_TABLE},
+        )
+        db.execute(text(f'ALTER TABLE "{PARENT_TABLE}" DETACH PARTITION "{name}"'))
+        if drop:
+            db.execute(text(f'DROP TABLE "{name}"'))
+        db.commit()
+
+        report.append(
+            {
+                "partition": name,
+                "rows": rows,
+                "file": path,
+                "action": "dropped" if drop else "detached",
+            }
+        )
+
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Archive old activity partitions")
+    parser.add_argument("--keep-months", type=int, default=int(os.getenv("ZEN_ACTIVITY_KEEP_MONTHS", "12")))
+    parser.add_argument("--out-dir", default=os.getenv("ZEN_ACTIVITY_ARCHIVE_DIR", "archive/activities"))
+    parser.add_argument("--drop", action="store_true", help="DROP partitions after a successful export")
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        created = ensure_activity_partitions(db)
+        for name in created:
+            print(f"[ARCHIVE] created partition {name}")
+
+        report = archive_old_partitions(
+            db,
+            keep_months=args.keep_months,
+            out_dir=args.out_dir,
+            drop=args.drop,
+            dry_run=args.dry_run,
+        )
+        for r in report:
+            print(f"[ARCHIVE] {json.dumps(r)}")
+        if not report:
+            print("[ARCHIVE] nothing to archive")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
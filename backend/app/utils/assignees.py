@@ -0,0 +1,148 @@
+"""
+Map the legacy free-text Assignment.assigned_to onto users.
+
+A string matches a user when, after trimming / collapsing whitespace /
+lower-casing, it equals exactly one user's full_name or email. Ambiguous
+names (two users called "Rohan Patil") are never guessed.
+
+Backfill existing rows in id-range batches (each batch is its own short
+transaction, so the table is never locked for long):
+    python -m app.utils.assignees --batch-size 5000
+    python -m app.utils.assignees --dry-run          # only report what would match
+"""
+from __future__ import annotations
+
+import argparse
+import time
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import func, or_, text
+from sqlalchemy.orm import Session
+
+from app.db import SessionLocal
+from app.models.user import User
+
+# Same normalisation in Python and SQL
+_SQL_KEY = "lower(btrim(regexp_replace({col}, '\\s+', ' ', 'g')))"
+
+
+def assignee_key(value: Optional[str]) -> str:
+    return " ".join((value or "").split()).lower()
+
+
+def assignee_key_sql(col):
+    """assignee_key() as a SQL expression over `col`."""
+    return func.lower(func.btrim(func.regexp_replace(col, r"\s+", " ", "g")))
+
+
+def resolve_assignee_id(db: Session, value: Optional[str]) -> Optional[int]:
+    """User id for a free-text assignee, or None when unknown / ambiguous."""
+    key = assignee_key(value)
+    if not key:
+        return None
+    ids = (
+        db.query(User.id)
+        .filter(
+            or_(
+                assignee_key_sql(User.full_name) == key,
+                func.lower(User.email) == key,
+            )
+        )
+        .limit(2)
+        .all()
+    )
+    return ids[0][0] if len(ids) == 1 else None
+
+
+def build_assignee_map(db: Session) -> Dict[str, int]:
+    """key -> user id, dropping keys that point at more than one user."""
+    seen: Dict[str, Optional[int]] = {}
+    for uid, full_name, email in db.query(User.id, User.full_name, User.email).all():
+        for key in {assignee_key(full_name), assignee_key(email)}:
+            if not key:
+                continue
+            seen[key] = uid if seen.get(key, uid) == uid else None
+    return {k: v for k, v in seen.items() if v is not None}
+
+
+def backfill_assignee_ids(db: Session, batch_size: int = 5000, dry_run: bool = False) -> Tuple[int, List[tuple]]:
+    """
+    Set assigned_to_user_id where it is NULL and assigned_to maps to a user.
+    Returns (rows updated, [(unmatched assigned_to, count), ...] top 20).
+    """
+    mapping = build_assignee_map(db)
+
+    db.execute(text("CREATE TEMP TABLE IF NOT EXISTS assignee_map (key text PRIMARY KEY, user_id int NOT NULL)"))
+    db.execute(text("TRUNCATE assignee_map"))
+    if mapping:
+        db.execute(
+            text("INSERT INTO assignee_map (key, user_id) VALUES (:key, :user_id)"),
+            [{"key": k, "user_id": v} for k, v in mapping.items()],
+        )
+    db.execute(text("ANALYZE assignee_map"))
+
+    lo, hi = db.execute(
+        text(
+            "SELECT min(id), max(id) FROM assignments "
+            "WHERE assigned_to_user_id IS NULL AND assigned_to IS NOT NULL"
+        )
+    ).one()
+
+    key_sql = _SQL_KEY.format(col="a.assigned_to")
+    updated = 0
+    if lo is not None:
+        t0 = time.perf_counter()
+        for start in range(lo, hi + 1, batch_size):
+            params = {"lo": start, "hi": start + batch_size - 1}
+            if dry_run:
+                n = db.execute(
+                    text(
+                        f"SELECT count(*) FROM assignments a JOIN assignee_map m ON m.key = {key_sql} "
+                        "WHERE a.id BETWEEN :lo AND :hi AND a.assigned_to_user_id IS NULL"
+                    ),
+                    params,
+                ).scalar()
+            else:
+                n = db.execute(
+                    text(
+                        f"UPDATE assignments a SET assigned_to_user_id = m.user_id "
+                        f"FROM assignee_map m "
+                        f"WHERE a.id BETWEEN :lo AND :hi AND a.assigned_to_user_id IS NULL "
+                        f"AND m.key = {key_sql}"
+                    ),
+                    params,
+                ).rowcount
+                db.commit()
+            updated += int(n or 0)
+            print(f"[ASSIGNEE] ids {params['lo']}..{params['hi']}: {n} ({time.perf_counter() - t0:.1f}s)")
+
+    unmatched = db.execute(
+        text(
+            "SELECT a.assigned_to, count(*) FROM assignments a "
+            "WHERE a.assigned_to_user_id IS NULL AND btrim(coalesce(a.assigned_to, '')) <> '' "
+            f"AND NOT EXISTS (SELECT 1 FROM assignee_map m WHERE m.key = {key_sql}) "
+            "GROUP BY a.assigned_to ORDER BY count(*) DESC LIMIT 20"
+        )
+    ).all()
+    db.rollback() if dry_run else db.commit()
+    return updated, [tuple(r) for r in unmatched]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Backfill assignments.assigned_to_user_id from assigned_to")
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        updated, unmatched = backfill_assignee_ids(db, args.batch_size, args.dry_run)
+        print(f"[ASSIGNEE] {'would update' if args.dry_run else 'updated'} {updated} rows")
+        for name, count in unmatched:
+            print(f"[ASSIGNEE] unmatched: {name!r} x{count}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,6 @@
 from datetime import datetime
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from sqlalchemy import func
 
 from app.models.assignment import Assignment
 
@@ -12,33 +12,33 @@ def generate_assignment_code(db: Session) -> str:
 
     NOTE:
     - Do NOT rely on Assignment.id ordering (ids can have gaps due to deletes).
-    - We order by assignment_code (zero-padded suffix) so the latest code is correct.
+    - Compare the numeric suffix, not the string: past 9999 codes in a year the
+      suffix grows to 5 digits and "VAL/2026/9999" > "VAL/2026/10000" as text,
+      hence ordering by length first.
     """
 
     year = datetime.utcnow().year
     prefix = f"VAL/{year}/"
 
-    last = (
-        db.query(Assignment)
+    # Highest suffix first: longer suffix, then text order (no aggregate over
+    # the year's codes; walks ix_assignments_code_year_seq backwards)
+    last_code = (
+        db.query(Assignment.assignment_code)
         .filter(
-            and_(
-                Assignment.assignment_code.isnot(None),
-                Assignment.assignment_code.like(f"{prefix}%"),
-            )
+            func.split_part(Assignment.assignment_code, "/", 2) == str(year),
+            # skip malformed codes (other prefixes, non-numeric suffixes)
+            Assignment.assignment_code.op("~")(r"^VAL/\d{4}/\d+$"),
         )
-        # assignment_code ends with zero-padded 4 digits, so lexicographic sort works
-        .order_by(Assignment.assignment_code.desc())
-        .first()
+        .order_by(
+            func.split_part(Assignment.assignment_code, "/", 2).desc(),
+            func.length(Assignment.assignment_code).desc(),
+            Assignment.assignment_code.desc(),
+        )
+        .limit(1)
+        .scalar()
     )
+    last_seq = int(last_code.rsplit("/", 1)[1]) if last_code else 0
+
+    new_seq = last_seq + 1
 
-    if last and last.assignment_code:
-        try:
-            last_code = int(str(last.assignment_code).split("/")[-1])
-        except Exception:
-            # If the last row has a malformed code, fall back safely
-            last_code = 0
-        new_seq = last_code + 1
-    else:
-        new_seq = 1
-
-    return f"{prefix}{new_seq:04d}"
\ No newline at end of file
+    return f"{prefix}{new_seq:04d}"
@@ -0,0 +1,319 @@
+"""
+Change events for /api/stream.
+
+Writers call publish_event(db, ...) inside their transaction. It issues
+pg_notify on ZEN_EVENTS_CHANNEL, and Postgres delivers the notification only
+if that transaction commits, so clients never see a change that rolled back.
+
+Every worker keeps ONE asyncpg connection LISTENing on the channel. Each
+event (from any worker, this one included) is fanned out to that worker's
+WebSocket subscribers by the in-process Broadcaster, filtered per user:
+    - events addressed to a user (user_id set) go to that user only
+    - ADMIN / HR / OPS_MANAGER see every assignment event
+    - everyone else sees events for assignments assigned to them, or that
+      they caused
+
+Payloads stay small (ids, type, a few fields): pg_notify caps them at 8000
+bytes, so clients refetch what they need. If the listener reconnects, or a
+subscriber falls behind, clients get {"type": "stream.resync"} and should
+refetch instead of trusting the event stream to be complete.
+
+The same connection LISTENs on any channel registered with add_channel()
+(app/utils/cache.py uses it for cache invalidations).
+
+Env:
+    ZEN_STREAM_ENABLED      1
+    ZEN_EVENTS_CHANNEL      zen_events
+    ZEN_STREAM_QUEUE_SIZE   256   events buffered per subscriber before resync
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional, Set
+
+import orjson
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import Session
+
+from app.utils.metrics import REGISTRY
+
+logger = logging.getLogger("app.broadcast")
+
+ENABLED = os.getenv("ZEN_STREAM_ENABLED", "1").strip().lower() in ("1", "true", "yes", "on")
+CHANNEL = os.getenv("ZEN_EVENTS_CHANNEL", "zen_events").strip() or "zen_events"
+QUEUE_SIZE = int(os.getenv("ZEN_STREAM_QUEUE_SIZE", "256"))
+
+# pg_notify rejects payloads >= 8000 bytes; leave room for assignee_id
+MAX_PAYLOAD_BYTES = 7000
+
+STAFF_ROLES = {"ADMIN", "HR", "OPS_MANAGER"}
+
+EVENTS_RECEIVED = REGISTRY.counter("zen_stream_events_total", "Events received from LISTEN")
+STREAM_RESYNCS = REGISTRY.counter(
+    "zen_stream_resyncs_total", "Subscribers told to resync (slow consumer / listener reconnect)", ["reason"]
+)
+
+# Activity types -> stream event types
+ACTIVITY_EVENT_TYPES = {
+    "ASSIGNMENT_CREATED": "assignment.created",
+    "ASSIGNMENT_UPDATED": "assignment.updated",
+    "STATUS_CHANGED": "assignment.status_changed",
+    "ASSIGNMENT_DELETED": "assignment.deleted",
+    "FILE_UPLOADED": "file.uploaded",
+}
+
+
+# ---------------------------
+# Publishing (sync, inside the writer's transaction)
+# ---------------------------
+
+def publish_event(
+    db: Session,
+    type: str,
+    *,
+    assignment_id: Optional[int] = None,
+    actor_id: Optional[int] = None,
+    user_id: Optional[int] = None,
+    data: Optional[Dict[str, Any]] = None,
+) -> None:
+    """
+    Queue a change event on the current transaction (sent on commit).
+    assignee_id is looked up server-side in the same statement.
+    """
+    event = {
+        "type": type,
+        "assignment_id": assignment_id,
+        "actor_id": actor_id,
+        "user_id": user_id,
+        "at": datetime.utcnow().isoformat(),
+        "data": data or {},
+    }
+    body = orjson.dumps(event, default=str)
+    if len(body) > MAX_PAYLOAD_BYTES:
+        event["data"] = {"truncated": True}
+        body = orjson.dumps(event, default=str)
+
+    db.execute(
+        text(
+            "SELECT pg_notify(:channel, (CAST(:body AS jsonb) || jsonb_build_object("
+            "'assignee_id', (SELECT assigned_to_user_id FROM assignments WHERE id = :aid)))::text)"
+        ),
+        {"channel": CHANNEL, "body": body.decode(), "aid": assignment_id},
+    )
+
+
+def publish_user_events(db: Session, type: str, per_user: Dict[int, Dict[str, Any]]) -> None:
+    """Events addressed to individual users ({user_id: data}), in one statement."""
+    if not per_user:
+        return
+    at = datetime.utcnow().isoformat()
+    bodies = [
+        orjson.dumps({"type": type, "user_id": uid, "at": at, "data": data}, default=str).decode()
+        for uid, data in sorted(per_user.items())
+    ]
+    db.execute(
+        text("SELECT pg_notify(:channel, body) FROM unnest(CAST(:bodies AS text[])) AS body"),
+        {"channel": CHANNEL, "bodies": bodies},
+    )
+
+
+# ---------------------------
+# Fan-out (async, per worker)
+# ---------------------------
+
+@dataclass(eq=False)
+class Subscriber:
+    user_id: int
+    staff: bool
+    queue: asyncio.Queue = field(default_factory=lambda: asyncio.Queue(maxsize=QUEUE_SIZE))
+
+    def wants(self, event: Dict[str, Any]) -> bool:
+        target = event.get("user_id")
+        if target is not None:
+            return target == self.user_id
+        if self.staff:
+            return True
+        return self.user_id in (event.get("assignee_id"), event.get("actor_id"))
+
+
+class Broadcaster:
+    def __init__(self) -> None:
+        self.subs: Set[Subscriber] = set()
+
+    def subscribe(self, user_id: int, role: Optional[str]) -> Subscriber:
+        sub = Subscriber(user_id=user_id, staff=(role or "").upper() in STAFF_ROLES)
+        self.subs.add(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscriber) -> None:
+        self.subs.discard(sub)
+
+    def dispatch(self, event: Dict[str, Any]) -> None:
+        for sub in list(self.subs):
+            if sub.wants(event):
+                self._put(sub, event, "slow_consumer")
+
+    def resync_all(self, reason: str) -> None:
+        for sub in list(self.subs):
+            self._put(sub, {"type": "stream.resync", "reason": reason}, reason)
+
+    @staticmethod
+    def _put(sub: Subscriber, event: Dict[str, Any], reason: str) -> None:
+        try:
+            sub.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Drop the backlog; the client refetches instead of replaying it
+            while not sub.queue.empty():
+                sub.queue.get_nowait()
+            sub.queue.put_nowait({"type": "stream.resync", "reason": reason})
+            STREAM_RESYNCS.inc(reason=reason)
+
+
+broadcaster = Broadcaster()
+
+REGISTRY.gauge("zen_stream_subscribers", "Open /api/stream connections", [], lambda: [((), len(broadcaster.subs))])
+
+
+# ---------------------------
+# LISTEN bridge
+# ---------------------------
+
+_listener_task: Optional[asyncio.Task] = None
+
+
+@dataclass
+class _Channel:
+    on_message: Callable[[str], None]
+    # on_connect(reconnect) after LISTEN is in place; on_disconnect when the connection is lost
+    on_connect: Optional[Callable[[bool], None]] = None
+    on_disconnect: Optional[Callable[[], None]] = None
+
+
+# Channels sharing this worker's one LISTEN connection (stream events, cache invalidations)
+_channels: Dict[str, _Channel] = {}
+
+
+def add_channel(
+    name: str,
+    on_message: Callable[[str], None],
+    *,
+    on_connect: Optional[Callable[[bool], None]] = None,
+    on_disconnect: Optional[Callable[[], None]] = None,
+) -> None:
+    """LISTEN on another channel over the same connection; callbacks run on the event loop."""
+    if name in _channels:
+        raise ValueError(f"channel {name!r} already has a listener")
+    _channels[name] = _Channel(on_message, on_connect, on_disconnect)
+
+
+def _listen_dsn() -> str:
+    from app.db import DATABASE_URL
+
+    # asyncpg wants a plain postgresql:// DSN
+    return make_url(DATABASE_URL).set(drivername="postgresql").render_as_string(hide_password=False)
+
+
+def _on_event(payload: str) -> None:
+    EVENTS_RECEIVED.inc()
+    try:
+        event = orjson.loads(payload)
+    except orjson.JSONDecodeError:
+        logger.warning("Ignoring malformed event on %s", CHANNEL)
+        return
+    broadcaster.dispatch(event)
+
+
+def _on_reconnect(reconnect: bool) -> None:
+    if reconnect:
+        # Anything sent while we were disconnected is lost
+        broadcaster.resync_all("listener_reconnect")
+
+
+if ENABLED:
+    add_channel(CHANNEL, _on_event, on_connect=_on_reconnect)
+
+
+def _on_notify(conn, pid, channel, payload: str) -> None:
+    ch = _channels.get(channel)
+    if ch is None:
+        return
+    try:
+        ch.on_message(payload)
+    except Exception:
+        logger.exception("Listener for %s failed", channel)
+
+
+def _hooks(name: str, *args) -> None:
+    for channel, ch in list(_channels.items()):
+        hook = getattr(ch, name)
+        if hook is None:
+            continue
+        try:
+            hook(*args)
+        except Exception:
+            logger.exception("%s hook for %s failed", name, channel)
+
+
+async def _listen_forever() -> None:
+    import asyncpg
+
+    backoff = 1.0
+    first = True
+    while True:
+        conn = None
+        connected = False
+        try:
+            conn = await asyncpg.connect(_listen_dsn())
+            lost = asyncio.Event()
+            # Fires as soon as the socket drops, not just at the next ping
+            conn.add_termination_listener(lambda _conn: lost.set())
+            for channel in _channels:
+                await conn.add_listener(channel, _on_notify)
+            connected = True
+            _hooks("on_connect", not first)
+            first = False
+            backoff = 1.0
+            print(f"[LISTEN] listening on {', '.join(_channels)}")
+            while not lost.is_set():
+                try:
+                    await asyncio.wait_for(lost.wait(), timeout=30)
+                except asyncio.TimeoutError:
+                    await conn.execute("SELECT 1")  # notices a dead connection
+            raise ConnectionError("listener connection closed")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            if connected:
+                _hooks("on_disconnect")
+            print(f"[LISTEN] listener error: {e!r}; reconnecting in {backoff:.0f}s")
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, 30.0)
+        finally:
+            if conn is not None and not conn.is_closed():
+                await conn.close()
+
+
+def start_listener() -> None:
+    """Start the LISTEN task on the running event loop (call from an async startup hook)."""
+    global _listener_task
+    if not _channels or _listener_task is not None:
+        return
+    _listener_task = asyncio.get_running_loop().create_task(_listen_forever())
+
+
+async def stop_listener() -> None:
+    global _listener_task
+    if _listener_task is None:
+        return
+    _listener_task.cancel()
+    try:
+        await _listener_task
+    except asyncio.CancelledError:
+        pass
+    _listener_task = None
+    _hooks("on_disconnect")
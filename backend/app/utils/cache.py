@@ -0,0 +1,244 @@
+"""
+In-process caches that stay coherent across Uvicorn workers and hosts.
+
+    PERMISSIONS = register_namespace("rbac.permissions", ttl=300)
+
+    codes = PERMISSIONS.get_or_load(role, lambda: load_codes(db, role))
+
+    # writer, inside its transaction:
+    invalidate(db, "rbac.permissions", role)    # key None = whole namespace
+    db.commit()
+
+invalidate() queues pg_notify(ZEN_CACHE_CHANNEL, {"ns", "key", "version"})
+on the writer's transaction (version = its transaction id), so nothing is
+sent if it rolls back. Every worker receives it on the LISTEN connection it
+already holds for /api/stream (app/utils/broadcast.py) and evicts the entry.
+The writer's own worker also evicts as soon as the commit returns, so its
+next request can't read the old value before the NOTIFY arrives.
+
+Invalidations missed while the listener is down would leave stale entries,
+so caches only serve while it is connected. Until then (and in processes
+without a listener: app.worker, CLIs) every get_or_load calls the loader,
+and a reconnect drops everything. A load racing an invalidation is not
+stored. The per-namespace ttl bounds anything else, e.g. rows changed by
+hand in psql.
+
+Env:
+    ZEN_CACHE_ENABLED   1
+    ZEN_CACHE_CHANNEL   zen_cache
+"""
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+import orjson
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+
+from app.utils.broadcast import add_channel
+from app.utils.metrics import REGISTRY
+
+logger = logging.getLogger("app.cache")
+
+ENABLED = os.getenv("ZEN_CACHE_ENABLED", "1").strip().lower() in ("1", "true", "yes", "on")
+CHANNEL = os.getenv("ZEN_CACHE_CHANNEL", "zen_cache").strip() or "zen_cache"
+
+CACHE_REQUESTS = REGISTRY.counter(
+    "zen_cache_requests_total", "In-process cache lookups (bypass = invalidation bus down)", ["namespace", "result"]
+)
+CACHE_INVALIDATIONS = REGISTRY.counter(
+    "zen_cache_invalidations_total", "Cache invalidations applied by this worker", ["namespace"]
+)
+
+_MISSING = object()
+
+
+class Namespace:
+    """One named LRU with a ttl. Thread-safe: sync handlers run in Starlette's threadpool."""
+
+    def __init__(self, name: str, ttl: float, max_entries: int) -> None:
+        self.name = name
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Bumped by every invalidation; a load that started before one is not stored
+        self._generation = 0
+        self.last_version: Optional[int] = None
+
+    def get(self, key: Hashable) -> Any:
+        """Cached value, or _MISSING."""
+        if not _bus.live:
+            return _MISSING
+        with self._lock:
+            hit = self._entries.get(key)
+            if hit is None:
+                return _MISSING
+            expires, value = hit
+            if expires < time.monotonic():
+                del self._entries[key]
+                return _MISSING
+            self._entries.move_to_end(key)
+            return value
+
+    def _store(self, key: Hashable, value: Any, generation: int) -> None:
+        with self._lock:
+            if generation != self._generation or not _bus.live:
+                return
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        value = self.get(key)
+        if value is not _MISSING:
+            CACHE_REQUESTS.inc(namespace=self.name, result="hit")
+            return value
+        CACHE_REQUESTS.inc(namespace=self.name, result="miss" if _bus.live else "bypass")
+        generation = self._generation
+        value = loader()
+        self._store(key, value, generation)
+        return value
+
+    async def get_or_load_async(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        value = self.get(key)
+        if value is not _MISSING:
+            CACHE_REQUESTS.inc(namespace=self.name, result="hit")
+            return value
+        CACHE_REQUESTS.inc(namespace=self.name, result="miss" if _bus.live else "bypass")
+        generation = self._generation
+        value = await loader()
+        self._store(key, value, generation)
+        return value
+
+    def evict(self, key: Optional[Hashable] = None) -> None:
+        """Local eviction only; use invalidate() to reach every worker."""
+        with self._lock:
+            self._generation += 1
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+        CACHE_INVALIDATIONS.inc(namespace=self.name)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_namespaces: Dict[str, Namespace] = {}
+
+
+def register_namespace(name: str, ttl: float = 300.0, max_entries: int = 1024) -> Namespace:
+    if name in _namespaces:
+        raise ValueError(f"cache namespace {name!r} is already registered")
+    ns = Namespace(name, ttl, max_entries)
+    _namespaces[name] = ns
+    return ns
+
+
+def get_namespace(name: str) -> Optional[Namespace]:
+    return _namespaces.get(name)
+
+
+# ---------------------------
+# Publishing (sync, inside the writer's transaction)
+# ---------------------------
+
+def _key_text(key: Optional[Hashable]) -> Optional[str]:
+    # Keys travel as text; namespaces keyed by ints match on str(key)
+    return None if key is None else str(key)
+
+
+def invalidate(db: Session, namespace: str, key: Optional[Hashable] = None) -> None:
+    """
+    Evict (namespace, key) in every worker once the current transaction
+    commits; key None drops the whole namespace.
+    """
+    db.execute(
+        text(
+            "SELECT pg_notify(:channel, json_build_object("
+            "'ns', CAST(:ns AS text), 'key', CAST(:key AS text), "
+            "'version', pg_current_xact_id()::text::bigint)::text)"
+        ),
+        {"channel": CHANNEL, "ns": namespace, "key": _key_text(key)},
+    )
+    db.info.setdefault("cache_invalidations", set()).add((namespace, _key_text(key)))
+
+
+@event.listens_for(Session, "after_commit")
+def _evict_committed(session: Session) -> None:
+    for namespace, key in session.info.pop("cache_invalidations", ()):
+        _apply(namespace, key)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_rolled_back(session: Session) -> None:
+    session.info.pop("cache_invalidations", None)
+
+
+def _apply(namespace: str, key: Optional[str], version: Optional[int] = None) -> None:
+    ns = _namespaces.get(namespace)
+    if ns is None:
+        return
+    if key is None:
+        ns.evict()
+    else:
+        # Match int keys too: get_or_load(5, ...) is invalidated by key "5"
+        ns.evict(key)
+        if key.lstrip("-").isdigit():
+            ns.evict(int(key))
+    if version is not None:
+        ns.last_version = version
+
+
+# ---------------------------
+# LISTEN side (runs on the event loop)
+# ---------------------------
+
+class _Bus:
+    live = False
+
+
+_bus = _Bus()
+
+
+def _drop_all() -> None:
+    for ns in _namespaces.values():
+        ns.evict()
+
+
+def _on_connect(reconnect: bool) -> None:
+    # Anything cached before the connection was up may have missed an invalidation
+    _drop_all()
+    _bus.live = True
+
+
+def _on_disconnect() -> None:
+    _bus.live = False
+    _drop_all()
+
+
+def _on_message(payload: str) -> None:
+    try:
+        msg = orjson.loads(payload)
+        _apply(msg["ns"], msg.get("key"), msg.get("version"))
+    except (orjson.JSONDecodeError, KeyError, TypeError):
+        logger.warning("Ignoring malformed cache invalidation: %r", payload[:200])
+
+
+if ENABLED:
+    add_channel(CHANNEL, _on_message, on_connect=_on_connect, on_disconnect=_on_disconnect)
+
+
+REGISTRY.gauge(
+    "zen_cache_entries",
+    "Entries held per in-process cache namespace",
+    ["namespace"],
+    lambda: [((name,), len(ns)) for name, ns in _namespaces.items()],
+)
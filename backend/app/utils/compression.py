@@ -0,0 +1,127 @@
+"""
+Response compression: brotli when the client accepts it and the `brotli`
+package is installed, else gzip; small bodies and already-compressed content
+(images, PDFs, downloads) go out as-is.
+
+A 500-row assignments page is ~300 KB of JSON and compresses about 10x, which
+matters more on a site-visit phone connection than any server-side saving.
+
+Built on Starlette's GZipMiddleware responders (same buffering / streaming
+handling), with content-type selection and a brotli responder added.
+
+Env:
+    ZEN_COMPRESSION             1     0 disables
+    ZEN_COMPRESS_MIN_BYTES      1024  smaller bodies are sent uncompressed
+    ZEN_GZIP_LEVEL              6
+    ZEN_BROTLI_QUALITY          4     0-11; higher is much slower on dynamic responses
+"""
+from __future__ import annotations
+
+import os
+from typing import Optional
+
+from starlette.datastructures import Headers
+from starlette.middleware.gzip import GZipResponder, IdentityResponder
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # optional: gzip only
+    brotli = None
+
+ENABLED = os.getenv("ZEN_COMPRESSION", "1") != "0"
+MIN_BYTES = int(os.getenv("ZEN_COMPRESS_MIN_BYTES", "1024"))
+GZIP_LEVEL = int(os.getenv("ZEN_GZIP_LEVEL", "6"))
+BROTLI_QUALITY = int(os.getenv("ZEN_BROTLI_QUALITY", "4"))
+
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+    "text/",
+)
+
+
+class _Selective:
+    """Only compress text-like content types (PDFs and images are compressed already)."""
+
+    async def send_with_compression(self, message: Message) -> None:
+        await super().send_with_compression(message)
+        if message["type"] == "http.response.start":
+            content_type = Headers(raw=message["headers"]).get("content-type", "")
+            if content_type.startswith("text/event-stream") or not content_type.startswith(COMPRESSIBLE_TYPES):
+                self.content_type_is_excluded = True
+
+
+class _GZip(_Selective, GZipResponder):
+    pass
+
+
+class _Brotli(_Selective, IdentityResponder):
+    content_encoding = "br"
+
+    def __init__(self, app: ASGIApp, minimum_size: int, quality: int) -> None:
+        super().__init__(app, minimum_size)
+        self.compressor = brotli.Compressor(quality=quality)
+
+    def apply_compression(self, body: bytes, *, more_body: bool) -> bytes:
+        out = self.compressor.process(body)
+        # Flush each streamed chunk so the client can start decoding
+        return out + (self.compressor.flush() if more_body else self.compressor.finish())
+
+
+def _accepted(accept_encoding: str) -> set:
+    """Codings the client accepts (q=0 means "not this one")."""
+    out = set()
+    for part in accept_encoding.lower().split(","):
+        coding, _, params = part.strip().partition(";")
+        q = params.strip()
+        if q.startswith("q="):
+            try:
+                if float(q[2:]) == 0:
+                    continue
+            except ValueError:
+                continue
+        if coding:
+            out.add(coding.strip())
+    return out
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    accepted = _accepted(accept_encoding)
+    if brotli is not None and "br" in accepted:
+        return "br"
+    if "gzip" in accepted:
+        return "gzip"
+    return None
+
+
+class CompressionMiddleware:
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = MIN_BYTES,
+        gzip_level: int = GZIP_LEVEL,
+        brotli_quality: int = BROTLI_QUALITY,
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding == "br":
+            responder: ASGIApp = _Brotli(self.app, self.minimum_size, self.brotli_quality)
+        elif encoding == "gzip":
+            responder = _GZip(self.app, self.minimum_size, compresslevel=self.gzip_level)
+        else:
+            # Still adds "Vary: Accept-Encoding" so caches keep the variants apart
+            responder = IdentityResponder(self.app, self.minimum_size)
+
+        await responder(scope, receive, send)
@@ -0,0 +1,144 @@
+"""
+Connection-pool settings (env-driven) + pool telemetry.
+
+Env (per worker process — total connections = workers * (pool_size + max_overflow)):
+    ZEN_DB_POOL_SIZE              default 5
+    ZEN_DB_MAX_OVERFLOW           default 10
+    ZEN_DB_POOL_TIMEOUT           seconds to wait for a connection, default 30
+    ZEN_DB_POOL_RECYCLE           seconds before a connection is replaced, default 1800
+    ZEN_DB_POOL_PRE_PING          1/0, default 1 (drops dead connections after DB restarts)
+    ZEN_DB_STATEMENT_TIMEOUT_MS   Postgres statement_timeout, default 30000 (0 = off)
+
+Exposed on /api/metrics:
+    zen_db_pool_checkout_seconds   histogram of time spent waiting for a connection
+    zen_db_pool_timeouts_total     checkouts that gave up after pool_timeout
+    zen_db_pool_in_use / _idle / _overflow / _size   gauges read at scrape time
+"""
+from __future__ import annotations
+
+import os
+import time
+from typing import Any, Dict, List, Tuple
+
+from sqlalchemy import exc as sa_exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from app.utils.metrics import REGISTRY
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    return os.getenv(name, "1" if default else "0").strip().lower() in ("1", "true", "yes", "on")
+
+
+POOL_SIZE = _env_int("ZEN_DB_POOL_SIZE", 5)
+MAX_OVERFLOW = _env_int("ZEN_DB_MAX_OVERFLOW", 10)
+POOL_TIMEOUT = _env_int("ZEN_DB_POOL_TIMEOUT", 30)
+POOL_RECYCLE = _env_int("ZEN_DB_POOL_RECYCLE", 1800)
+POOL_PRE_PING = _env_bool("ZEN_DB_POOL_PRE_PING", True)
+STATEMENT_TIMEOUT_MS = _env_int("ZEN_DB_STATEMENT_TIMEOUT_MS", 30000)
+
+
+# ---------------------------
+# Telemetry
+# ---------------------------
+
+CHECKOUT_SECONDS = REGISTRY.histogram(
+    "zen_db_pool_checkout_seconds",
+    "Time spent waiting for a pooled DB connection",
+    ["pool"],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0),
+)
+CHECKOUT_TIMEOUTS = REGISTRY.counter(
+    "zen_db_pool_timeouts_total",
+    "Pool checkouts that timed out (pool exhausted)",
+    ["pool"],
+)
+
+# name -> pool, filled by the instrumented pool classes
+_POOLS: Dict[str, QueuePool] = {}
+
+
+def _gauge(fn) -> List[Tuple[Tuple[str, ...], float]]:
+    return [((name,), float(fn(pool))) for name, pool in list(_POOLS.items())]
+
+
+REGISTRY.gauge("zen_db_pool_size", "Configured pool size", ["pool"], lambda: _gauge(lambda p: p.size()))
+REGISTRY.gauge("zen_db_pool_in_use", "Connections checked out", ["pool"], lambda: _gauge(lambda p: p.checkedout()))
+REGISTRY.gauge("zen_db_pool_idle", "Connections idle in the pool", ["pool"], lambda: _gauge(lambda p: p.checkedin()))
+REGISTRY.gauge(
+    "zen_db_pool_overflow",
+    "Overflow connections open beyond pool_size",
+    ["pool"],
+    lambda: _gauge(lambda p: max(p.overflow(), 0)),
+)
+
+
+class _InstrumentedMixin:
+    """Times QueuePool._do_get (the blocking checkout) and counts timeouts."""
+
+    metrics_name = "primary"
+
+    def _do_get(self):
+        t0 = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except sa_exc.TimeoutError:
+            CHECKOUT_TIMEOUTS.inc(pool=self.metrics_name)
+            CHECKOUT_SECONDS.observe(time.perf_counter() - t0, pool=self.metrics_name)
+            raise
+        CHECKOUT_SECONDS.observe(time.perf_counter() - t0, pool=self.metrics_name)
+        return conn
+
+    def recreate(self):
+        new = super().recreate()
+        new.metrics_name = self.metrics_name
+        _POOLS[self.metrics_name] = new
+        return new
+
+
+class InstrumentedQueuePool(_InstrumentedMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_InstrumentedMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def register_pool(engine, name: str) -> None:
+    """Label an engine's pool for /api/metrics (call once after create_engine)."""
+    pool = engine.pool
+    pool.metrics_name = name
+    _POOLS[name] = pool
+
+
+# ---------------------------
+# Engine kwargs
+# ---------------------------
+
+def engine_kwargs(*, is_async: bool = False) -> Dict[str, Any]:
+    """Keyword args for create_engine / create_async_engine."""
+    kwargs: Dict[str, Any] = {
+        "poolclass": InstrumentedAsyncQueuePool if is_async else InstrumentedQueuePool,
+        "pool_size": POOL_SIZE,
+        "max_overflow": MAX_OVERFLOW,
+        "pool_timeout": POOL_TIMEOUT,
+        "pool_recycle": POOL_RECYCLE,
+        "pool_pre_ping": POOL_PRE_PING,
+    }
+
+    if STATEMENT_TIMEOUT_MS > 0:
+        if is_async:
+            # asyncpg: server settings applied on connect
+            kwargs["connect_args"] = {"server_settings": {"statement_timeout": str(STATEMENT_TIMEOUT_MS)}}
+        else:
+            # psycopg2 / libpq
+            kwargs["connect_args"] = {"options": f"-c statement_timeout={STATEMENT_TIMEOUT_MS}"}
+
+    return kwargs
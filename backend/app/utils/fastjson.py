@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Type
+
+import orjson
+from fastapi import HTTPException
+from fastapi.responses import ORJSONResponse, Response
+from pydantic import BaseModel
+
+
+def schema_columns(model, schema: Type[BaseModel], fields: Optional[Sequence[str]] = None) -> list:
+    """
+    ORM columns matching a read schema's fields (same order as the schema),
+    or only `fields` (see parse_fields).
+
+    Lets list endpoints run `db.query(*schema_columns(...))` and get plain
+    row tuples back instead of hydrating ORM objects + re-validating them.
+    """
+    return [getattr(model, name) for name in (fields or schema.model_fields)]
+
+
+def parse_fields(
+    fields: Optional[str],
+    schema: Type[BaseModel],
+    always: Sequence[str] = ("id",),
+) -> Optional[List[str]]:
+    """
+    `?fields=id,status,report_due_date` -> those schema fields in schema
+    order, plus `always` (ids, keyset columns). None (no projection) when
+    not given.
+    """
+    wanted = {f.strip() for f in (fields or "").split(",") if f.strip()}
+    if not wanted:
+        return None
+    unknown = wanted - schema.model_fields.keys()
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+    wanted.update(always)
+    return [name for name in schema.model_fields if name in wanted]
+
+
+def rows_to_dicts(rows: Iterable[Any]) -> List[Dict[str, Any]]:
+    return [r._asdict() for r in rows]
+
+
+def rows_response(rows: Iterable[Any], status_code: int = 200) -> ORJSONResponse:
+    """
+    Lean list response: Core rows -> dicts -> orjson.
+
+    Returning a Response directly skips FastAPI's response_model validation,
+    so the query MUST select exactly the schema's columns (use schema_columns).
+    orjson renders date/datetime the same way Pydantic does (ISO 8601).
+    """
+    return ORJSONResponse(content=rows_to_dicts(rows), status_code=status_code)
+
+
+def rows_json(rows: Iterable[Any]) -> bytes:
+    """rows_response's body, encoded once so it can be cached (see json_bytes_response)."""
+    return orjson.dumps(rows_to_dicts(rows))
+
+
+def json_bytes_response(body: bytes, status_code: int = 200) -> Response:
+    return Response(content=body, status_code=status_code, media_type="application/json")
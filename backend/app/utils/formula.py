@@ -0,0 +1,476 @@
+"""
+Safe expression evaluator for valuation templates (no app imports, so it
+can also run inside worker processes).
+
+A template is a mapping of output name -> expression, e.g.
+
+    {
+        "land_value": "land_area * land_rate",
+        "replacement_cost": "builtup_area * construction_rate",
+        "depreciation": "replacement_cost * min(building_age / life_years, 0.9)",
+        "building_value": "replacement_cost - depreciation",
+        "market_value": "round(land_value + building_value, -3)",
+    }
+
+Expressions use Python syntax restricted to numbers, names, arithmetic,
+comparisons, and/or/not, `a if cond else b` and a few whitelisted functions.
+Anything else (attributes, subscripts, lambdas, comprehensions, strings) is
+rejected when the template is compiled.
+
+Compiling parses and validates every expression once, orders outputs by
+their dependencies and generates two plain Python functions:
+
+    evaluate(inputs)         -> {output: value}
+    evaluate_many(rows)      -> [{output: value} | FormulaError, ...]
+
+evaluate_many runs the whole template for all rows inside one generated loop
+(inputs unpacked into locals, no per-row parsing or dict lookups per
+expression), which is what makes batch recomputes cheap.
+
+Compiled templates are cached by (template id, version); see get_compiled().
+"""
+from __future__ import annotations
+
+import ast
+import keyword
+import math
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Mapping, Optional, Sequence, Union
+
+MAX_EXPRESSION_LENGTH = 1000
+MAX_OUTPUTS = 100
+MAX_EXPONENT = 64
+# round(x, digits): more than 15 places either way is past float precision,
+# and a huge negative digits makes round() on an int crawl
+MAX_ROUND_DIGITS = 15
+# Largest |value| an input or output may have: well inside orjson's 64-bit
+# ints, and past any real valuation amount. Checked on every value as it is
+# assigned, so one expression only ever multiplies bounded operands
+MAX_RESULT = 10 ** 15
+CACHE_SIZE = 256
+
+
+class FormulaError(ValueError):
+    """Invalid template, or a row that can't be evaluated (missing input, division by zero...)."""
+
+
+def _pow(base, exp):
+    if abs(exp) > MAX_EXPONENT:
+        raise FormulaError(f"exponent {exp} out of range")
+    # Size the result before computing it: nested powers would otherwise
+    # build arbitrarily large ints
+    if exp > 0 and abs(base) > 1 and exp * math.log10(abs(base)) > 18:
+        raise FormulaError("result out of range")
+    result = base ** exp
+    if isinstance(result, complex):
+        raise FormulaError("fractional power of a negative number")
+    return result
+
+
+def _check(name: str, v):
+    """Reject an output that can't be stored or fed to the next one (inf / nan, huge ints)."""
+    if isinstance(v, float) and not math.isfinite(v):
+        raise FormulaError(f"{name}: result is not a finite number")
+    if abs(v) > MAX_RESULT:
+        raise FormulaError(f"{name}: result out of range")
+    return v
+
+
+def _check_input(name: str, v):
+    """Inputs may be None or non-numeric (caught where they're used); huge ints are not."""
+    if isinstance(v, int) and abs(v) > MAX_RESULT:
+        raise FormulaError(f"{name}: input out of range")
+    return v
+
+
+def _round(x, digits=0):
+    # Checked before int(): also rejects nan / inf
+    if not -MAX_ROUND_DIGITS <= digits <= MAX_ROUND_DIGITS:
+        raise FormulaError(f"round: digits out of range (-{MAX_ROUND_DIGITS}..{MAX_ROUND_DIGITS})")
+    return round(x, int(digits))
+
+
+def _clamp(x, lo, hi):
+    return lo if x < lo else hi if x > hi else x
+
+
+FUNCTIONS: Dict[str, Callable[..., Any]] = {
+    "min": min,
+    "max": max,
+    "abs": abs,
+    "round": _round,
+    "floor": math.floor,
+    "ceil": math.ceil,
+    "sqrt": math.sqrt,
+    "clamp": _clamp,
+}
+
+_BIN_OPS = (ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Mod, ast.Pow)
+_UNARY_OPS = (ast.UAdd, ast.USub, ast.Not)
+_CMP_OPS = (ast.Eq, ast.NotEq, ast.Lt, ast.LtE, ast.Gt, ast.GtE)
+_ROW_ERRORS = (ArithmeticError, TypeError, ValueError)
+
+
+# ---------------------------
+# Parsing / validation
+# ---------------------------
+
+def _check_name(name: str, what: str) -> None:
+    # keyword covers None / True / False too
+    if not name.isidentifier() or keyword.iskeyword(name) or name.startswith("_") or name in FUNCTIONS:
+        raise FormulaError(f"invalid {what} name: {name!r}")
+
+
+class _Validator(ast.NodeVisitor):
+    def __init__(self, output: str):
+        self.output = output
+        self.names: set = set()
+
+    def fail(self, node: ast.AST, msg: str):
+        raise FormulaError(f"{self.output}: {msg} (col {getattr(node, 'col_offset', 0) + 1})")
+
+    def visit_Expression(self, node):
+        self.visit(node.body)
+
+    def visit_Constant(self, node):
+        # bool is an int subclass, so True / False pass too
+        if not isinstance(node.value, (int, float)):
+            self.fail(node, f"unsupported literal {node.value!r}")
+
+    def visit_Name(self, node):
+        if node.id.startswith("_"):
+            self.fail(node, f"invalid name {node.id!r}")
+        if node.id in FUNCTIONS:
+            self.fail(node, f"{node.id} is a function")
+        self.names.add(node.id)
+
+    def visit_BinOp(self, node):
+        if not isinstance(node.op, _BIN_OPS):
+            self.fail(node, f"operator {type(node.op).__name__} not allowed")
+        self.visit(node.left)
+        self.visit(node.right)
+
+    def visit_UnaryOp(self, node):
+        if not isinstance(node.op, _UNARY_OPS):
+            self.fail(node, f"operator {type(node.op).__name__} not allowed")
+        self.visit(node.operand)
+
+    def visit_BoolOp(self, node):
+        for v in node.values:
+            self.visit(v)
+
+    def visit_Compare(self, node):
+        for op in node.ops:
+            if not isinstance(op, _CMP_OPS):
+                self.fail(node, f"comparison {type(op).__name__} not allowed")
+        self.visit(node.left)
+        for c in node.comparators:
+            self.visit(c)
+
+    def visit_IfExp(self, node):
+        self.visit(node.test)
+        self.visit(node.body)
+        self.visit(node.orelse)
+
+    def visit_Call(self, node):
+        if not isinstance(node.func, ast.Name) or node.func.id not in FUNCTIONS:
+            self.fail(node, "only " + ", ".join(sorted(FUNCTIONS)) + " can be called")
+        if node.keywords:
+            self.fail(node, "keyword arguments not allowed")
+        for a in node.args:
+            if isinstance(a, ast.Starred):
+                self.fail(node, "*args not allowed")
+            self.visit(a)
+
+    def generic_visit(self, node):
+        self.fail(node, f"{type(node).__name__} not allowed")
+
+
+class _PowToCall(ast.NodeTransformer):
+    """a ** b -> _pow(a, b), so templates can't ask for 10 ** 10 ** 10."""
+
+    def visit_BinOp(self, node):
+        self.generic_visit(node)
+        if isinstance(node.op, ast.Pow):
+            return ast.Call(func=ast.Name(id="_pow", ctx=ast.Load()), args=[node.left, node.right], keywords=[])
+        return node
+
+
+def parse_expression(output: str, source: str) -> ast.expr:
+    """Parse + validate one expression; returns its (rewritten) AST body."""
+    if not isinstance(source, (str, int, float)) or isinstance(source, bool):
+        raise FormulaError(f"{output}: expression must be a string or number")
+    source = str(source).strip()
+    if not source:
+        raise FormulaError(f"{output}: empty expression")
+    if len(source) > MAX_EXPRESSION_LENGTH:
+        raise FormulaError(f"{output}: expression longer than {MAX_EXPRESSION_LENGTH} characters")
+    try:
+        tree = ast.parse(source, mode="eval")
+    except SyntaxError as e:
+        raise FormulaError(f"{output}: syntax error at col {e.offset}: {e.msg}") from None
+    _Validator(output).visit(tree)
+    return _PowToCall().visit(tree).body
+
+
+def _names(expr: ast.expr) -> set:
+    return {n.id for n in ast.walk(expr) if isinstance(n, ast.Name) and n.id not in FUNCTIONS and n.id != "_pow"}
+
+
+def _order(exprs: Mapping[str, ast.expr]) -> List[str]:
+    """Outputs in dependency order; raises on cycles."""
+    deps = {k: _names(e) & exprs.keys() for k, e in exprs.items()}
+    done: Dict[str, bool] = {}
+    order: List[str] = []
+
+    def visit(k: str, path: tuple) -> None:
+        if done.get(k):
+            return
+        if k in path:
+            cycle = " -> ".join(path[path.index(k):] + (k,))
+            raise FormulaError(f"circular reference: {cycle}")
+        for d in sorted(deps[k], key=list(exprs).index):
+            visit(d, path + (k,))
+        done[k] = True
+        order.append(k)
+
+    for k in exprs:
+        visit(k, ())
+    return order
+
+
+# ---------------------------
+# Compilation
+# ---------------------------
+
+class CompiledTemplate:
+    """
+    A validated template turned into two generated functions.
+    `inputs` are the names read from each row; `outputs` is the dependency
+    order outputs are computed in.
+    """
+
+    __slots__ = ("inputs", "outputs", "defaults", "_one", "_many")
+
+    def __init__(self, inputs, outputs, defaults, one, many):
+        self.inputs: tuple = inputs
+        self.outputs: tuple = outputs
+        self.defaults: Dict[str, Any] = defaults
+        self._one = one
+        self._many = many
+
+    def evaluate(self, values: Mapping[str, Any]) -> Dict[str, Any]:
+        """One row; raises FormulaError."""
+        result = self._one(values)
+        if isinstance(result, FormulaError):
+            raise result
+        return result
+
+    def evaluate_many(self, rows: Iterable[Mapping[str, Any]]) -> List[Union[Dict[str, Any], FormulaError]]:
+        """Many rows in one pass; failed rows come back as FormulaError instead of raising."""
+        return self._many(rows)
+
+
+def _row_error(exc: Exception, inputs: Sequence[str], defaults: Mapping[str, Any], values: Mapping[str, Any]) -> FormulaError:
+    if isinstance(exc, FormulaError):
+        return exc
+    missing = [k for k in inputs if values.get(k) is None and defaults.get(k) is None]
+    if missing:
+        return FormulaError("missing input: " + ", ".join(missing))
+    if isinstance(exc, ZeroDivisionError):
+        return FormulaError("division by zero")
+    return FormulaError(f"{type(exc).__name__}: {exc}")
+
+
+def _normalise_fields(fields: Optional[Sequence[Any]]) -> Dict[str, Any]:
+    """required_fields_json entries are "name" or {"name": ..., "default": ...}."""
+    out: Dict[str, Any] = {}
+    for f in fields or []:
+        if isinstance(f, str):
+            name, default = f, None
+        elif isinstance(f, Mapping) and isinstance(f.get("name"), str):
+            name, default = f["name"], f.get("default")
+        else:
+            raise FormulaError(f"invalid field definition: {f!r}")
+        _check_name(name, "field")
+        if default is not None and (isinstance(default, bool) or not isinstance(default, (int, float))):
+            raise FormulaError(f"{name}: default must be a number")
+        out[name] = default
+    return out
+
+
+def compile_template(
+    definitions: Mapping[str, Any],
+    fields: Optional[Sequence[Any]] = None,
+    extra_inputs: Iterable[str] = (),
+) -> CompiledTemplate:
+    """
+    Validate and compile a template.
+
+    `fields` is required_fields_json (inputs the user fills in, with optional
+    defaults); `extra_inputs` are names always supplied by the caller (e.g.
+    assignment columns). Any other name an expression uses is an error.
+    """
+    if not isinstance(definitions, Mapping) or not definitions:
+        raise FormulaError("formula definitions must be a non-empty object")
+    if len(definitions) > MAX_OUTPUTS:
+        raise FormulaError(f"more than {MAX_OUTPUTS} outputs")
+
+    fields = _normalise_fields(fields)
+    exprs: Dict[str, ast.expr] = {}
+    for output, source in definitions.items():
+        _check_name(str(output), "output")
+        exprs[output] = parse_expression(output, source)
+
+    known = set(fields) | set(extra_inputs)
+    clash = known & exprs.keys()
+    if clash:
+        raise FormulaError("outputs shadow inputs: " + ", ".join(sorted(clash)))
+    for output, expr in exprs.items():
+        unknown = _names(expr) - known - exprs.keys()
+        if unknown:
+            raise FormulaError(f"{output}: unknown name(s): " + ", ".join(sorted(unknown)))
+
+    order = tuple(_order(exprs))
+    inputs = tuple(sorted(set().union(*(_names(e) for e in exprs.values())) - exprs.keys()))
+    defaults = {k: v for k, v in fields.items() if v is not None and k in inputs}
+
+    one, many = _generate(inputs, defaults, order, exprs)
+    return CompiledTemplate(inputs, order, defaults, one, many)
+
+
+def _generate(inputs: Sequence[str], defaults: Mapping[str, Any], order: Sequence[str], exprs: Mapping[str, ast.expr]):
+    """
+    Build, as one module:
+
+        def _one(_r):
+            try:
+                _get = _r.get
+                a = _check_input("a", _get("a"))
+                b = _check_input("b", _get("b"))
+                if b is None: b = <default>
+                x = _check("x", <expr x>)
+                y = _check("y", <expr y>)
+                return {"x": x, "y": y}
+            except _ROW_ERRORS as _e:
+                return _err(_e, _r)
+
+        def _many(_rows):
+            _out = []
+            _append = _out.append
+            for _r in _rows:
+                <same body, appending instead of returning>
+            return _out
+    """
+    def name(n, store=False):
+        return ast.Name(id=n, ctx=ast.Store() if store else ast.Load())
+
+    def call(fn, *args):
+        return ast.Call(func=name(fn), args=list(args), keywords=[])
+
+    def body(emit):
+        stmts = [ast.Assign(targets=[name("_get", True)], value=ast.Attribute(value=name("_r"), attr="get", ctx=ast.Load()))]
+        for k in inputs:
+            stmts.append(
+                ast.Assign(targets=[name(k, True)], value=call("_check_input", ast.Constant(k), call("_get", ast.Constant(k))))
+            )
+            if k in defaults:
+                stmts.append(
+                    ast.If(
+                        test=ast.Compare(left=name(k), ops=[ast.Is()], comparators=[ast.Constant(None)]),
+                        body=[ast.Assign(targets=[name(k, True)], value=ast.Constant(defaults[k]))],
+                        orelse=[],
+                    )
+                )
+        for k in order:
+            stmts.append(ast.Assign(targets=[name(k, True)], value=call("_check", ast.Constant(k), exprs[k])))
+        stmts.append(emit(ast.Dict(keys=[ast.Constant(k) for k in order], values=[name(k) for k in order])))
+        return [
+            ast.Try(
+                body=stmts,
+                handlers=[ast.ExceptHandler(type=name("_ROW_ERRORS"), name="_e", body=[emit(call("_err", name("_e"), name("_r")))])],
+                orelse=[],
+                finalbody=[],
+            )
+        ]
+
+    def fn(fname, arg, stmts):
+        return ast.FunctionDef(
+            name=fname,
+            args=ast.arguments(posonlyargs=[], args=[ast.arg(arg=arg)], kwonlyargs=[], kw_defaults=[], defaults=[]),
+            body=stmts,
+            decorator_list=[],
+        )
+
+    one = fn("_one", "_r", body(lambda v: ast.Return(value=v)))
+    many = fn(
+        "_many",
+        "_rows",
+        [
+            ast.Assign(targets=[name("_out", True)], value=ast.List(elts=[], ctx=ast.Load())),
+            ast.Assign(targets=[name("_append", True)], value=ast.Attribute(value=name("_out"), attr="append", ctx=ast.Load())),
+            ast.For(target=name("_r", True), iter=name("_rows"), body=body(lambda v: ast.Expr(value=call("_append", v))), orelse=[]),
+            ast.Return(value=name("_out")),
+        ],
+    )
+
+    module = ast.fix_missing_locations(ast.Module(body=[one, many], type_ignores=[]))
+    namespace: Dict[str, Any] = {
+        "__builtins__": {},
+        "_pow": _pow,
+        "_check": _check,
+        "_check_input": _check_input,
+        "_ROW_ERRORS": _ROW_ERRORS,
+        "_err": lambda e, r: _row_error(e, inputs, defaults, r),
+        **FUNCTIONS,
+    }
+    try:
+        code = compile(module, "<template>", "exec")
+    except (SyntaxError, ValueError) as e:
+        raise FormulaError(f"template does not compile: {e}") from None
+    exec(code, namespace)
+    return namespace["_one"], namespace["_many"]
+
+
+# ---------------------------
+# Cache
+# ---------------------------
+
+_cache: "OrderedDict[Hashable, CompiledTemplate]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def get_compiled(
+    key: Hashable,
+    definitions: Mapping[str, Any],
+    fields: Optional[Sequence[Any]] = None,
+    extra_inputs: Iterable[str] = (),
+) -> CompiledTemplate:
+    """
+    Compiled template for `key` (template id + version), compiling on first use.
+    Templates are immutable per version, so a new version is a new key.
+    """
+    with _cache_lock:
+        hit = _cache.get(key)
+        if hit is not None:
+            _cache.move_to_end(key)
+            return hit
+
+    compiled = compile_template(definitions, fields, extra_inputs)
+    with _cache_lock:
+        _cache[key] = compiled
+        while len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+    return compiled
+
+
+def evaluate_chunk(
+    key: Hashable,
+    definitions: Mapping[str, Any],
+    fields: Optional[Sequence[Any]],
+    extra_inputs: Sequence[str],
+    rows: List[Mapping[str, Any]],
+) -> List[Union[Dict[str, Any], FormulaError]]:
+    """Process-pool entry point: evaluate_many() with the worker's own compiled cache."""
+    return get_compiled(key, definitions, fields, extra_inputs).evaluate_many(rows)
@@ -0,0 +1,216 @@
+"""
+Idempotency-Key support for create / upload endpoints.
+
+Mobile clients on flaky connections retry POSTs whose response they never
+saw. With an `Idempotency-Key: <uuid>` header the first request claims the
+key and its response is stored; retries with the same key get that response
+back (header `Idempotent-Replayed: true`) without the work being redone.
+
+    claim = begin(db, user.id, "assignments.create", idempotency_key, fingerprint(body))
+    if claim and claim.replay:
+        return claim.replay
+    try:
+        ...do the work, without committing...
+        return finish(db, claim, 201, response_body)
+    except BaseException:
+        abandon(db, claim)
+        raise
+
+finish() commits the work and the stored response in ONE transaction: a
+crash before it leaves nothing done and the claim unfinished (a retry takes
+it over after LOCK_SECONDS), a crash after it leaves both.
+
+Concurrent duplicates: claiming is one INSERT ... ON CONFLICT on
+(user, scope, key), so exactly one request wins. The others get 409 (with
+Retry-After) while the winner runs, and the stored response once it has
+finished. Reusing a key for a different request body is a 422. A failed
+request releases its key so the client can retry it.
+
+Keys are kept ZEN_IDEMPOTENCY_TTL_HOURS (24); a claim whose request never
+finished (process killed) can be taken over after ZEN_IDEMPOTENCY_LOCK_SECONDS
+(60). Expired rows are purged by the "idempotency_purge" scheduler job.
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+import orjson
+from fastapi import HTTPException
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.utils.metrics import REGISTRY
+from app.utils.scheduler import register_job
+
+JOB_NAME = "idempotency_purge"
+
+TTL_HOURS = float(os.getenv("ZEN_IDEMPOTENCY_TTL_HOURS", "24"))
+LOCK_SECONDS = float(os.getenv("ZEN_IDEMPOTENCY_LOCK_SECONDS", "60"))
+PURGE_INTERVAL_SECONDS = float(os.getenv("ZEN_IDEMPOTENCY_PURGE_SECONDS", "3600"))
+
+MAX_KEY_LENGTH = 255
+
+REQUESTS = REGISTRY.counter(
+    "zen_idempotent_requests_total",
+    "Requests carrying an Idempotency-Key",
+    ["scope", "outcome"],
+)
+
+# Take the key unless a live claim holds it: a finished response that hasn't
+# expired, or an unfinished request younger than LOCK_SECONDS
+_CLAIM_SQL = """
+INSERT INTO idempotency_keys (user_id, scope, key, fingerprint, created_at, expires_at)
+VALUES (:user_id, :scope, :key, :fingerprint, :now, :expires)
+ON CONFLICT ON CONSTRAINT uq_idempotency_keys_user_scope_key DO UPDATE SET
+    fingerprint = EXCLUDED.fingerprint,
+    created_at = EXCLUDED.created_at,
+    expires_at = EXCLUDED.expires_at,
+    response_status = NULL,
+    response_body = NULL
+WHERE idempotency_keys.expires_at < :now
+   OR (idempotency_keys.response_status IS NULL AND idempotency_keys.created_at < :stale)
+RETURNING id
+"""
+
+
+@dataclass
+class IdempotencyClaim:
+    scope: str
+    # Our idempotency_keys row; None when replaying someone else's response
+    id: Optional[int] = None
+    replay: Optional[ORJSONResponse] = None
+
+
+def fingerprint(*parts: Any) -> str:
+    """sha256 over the request parts (bytes as-is, anything else as sorted JSON)."""
+    h = hashlib.sha256()
+    for part in parts:
+        if not isinstance(part, bytes):
+            part = orjson.dumps(part, option=orjson.OPT_SORT_KEYS, default=str)
+        h.update(len(part).to_bytes(8, "big"))
+        h.update(part)
+    return h.hexdigest()
+
+
+def begin(
+    db: Session,
+    user_id: int,
+    scope: str,
+    key: Optional[str],
+    request_fingerprint: str,
+) -> Optional[IdempotencyClaim]:
+    """
+    Claim `key` for this request (commits). None when no key was sent.
+    Raises 409 while another request holds the key, 422 if the key was used
+    for a different request.
+    """
+    if key is None:
+        return None
+    key = key.strip()
+    if not key or len(key) > MAX_KEY_LENGTH:
+        raise HTTPException(status_code=400, detail=f"Idempotency-Key must be 1-{MAX_KEY_LENGTH} characters")
+
+    now = datetime.utcnow()
+    params = {
+        "user_id": user_id,
+        "scope": scope,
+        "key": key,
+        "fingerprint": request_fingerprint,
+        "now": now,
+        "expires": now + timedelta(hours=TTL_HOURS),
+        "stale": now - timedelta(seconds=LOCK_SECONDS),
+    }
+    # Two tries: the holder may abandon the key between INSERT and SELECT
+    for _ in range(2):
+        claim_id = db.execute(text(_CLAIM_SQL), params).scalar()
+        db.commit()
+        if claim_id is not None:
+            REQUESTS.inc(scope=scope, outcome="new")
+            return IdempotencyClaim(scope=scope, id=claim_id)
+
+        row = db.execute(
+            text(
+                "SELECT fingerprint, response_status, response_body FROM idempotency_keys "
+                "WHERE user_id = :user_id AND scope = :scope AND key = :key"
+            ),
+            params,
+        ).first()
+        db.commit()
+        if row is None:
+            continue
+
+        if row.fingerprint != request_fingerprint:
+            REQUESTS.inc(scope=scope, outcome="mismatch")
+            raise HTTPException(status_code=422, detail="Idempotency-Key was already used for a different request")
+        if row.response_status is None:
+            REQUESTS.inc(scope=scope, outcome="in_progress")
+            raise HTTPException(
+                status_code=409,
+                detail="A request with this Idempotency-Key is still being processed",
+                headers={"Retry-After": "1"},
+            )
+        REQUESTS.inc(scope=scope, outcome="replayed")
+        return IdempotencyClaim(scope=scope, replay=_response(row.response_status, row.response_body, replayed=True))
+
+    raise HTTPException(status_code=409, detail="Idempotency-Key is busy, retry the request", headers={"Retry-After": "1"})
+
+
+def finish(db: Session, claim: Optional[IdempotencyClaim], status_code: int, body: Any) -> ORJSONResponse:
+    """Commit the request's work together with its stored response, and return the response."""
+    if claim is not None and claim.id is not None:
+        db.execute(
+            text(
+                "UPDATE idempotency_keys SET response_status = :status, response_body = CAST(:body AS jsonb) "
+                "WHERE id = :id"
+            ),
+            {"id": claim.id, "status": status_code, "body": orjson.dumps(body, default=str).decode()},
+        )
+    db.commit()
+    return _response(status_code, body)
+
+
+def abandon(db: Session, claim: Optional[IdempotencyClaim]) -> None:
+    """
+    Roll back the failed request's work and release the key so the client
+    can retry. Never raises: if the DB is gone too, the claim goes stale and
+    is taken over after LOCK_SECONDS.
+    """
+    try:
+        db.rollback()
+        if claim is None or claim.id is None:
+            return
+        db.execute(
+            text("DELETE FROM idempotency_keys WHERE id = :id AND response_status IS NULL"),
+            {"id": claim.id},
+        )
+        db.commit()
+    except SQLAlchemyError as e:
+        print(f"[IDEMPOTENCY] could not release key {claim.scope if claim else ''}: {e!r}")
+
+
+def _response(status_code: int, body: Any, replayed: bool = False) -> ORJSONResponse:
+    headers = {"Idempotent-Replayed": "true"} if replayed else None
+    return ORJSONResponse(content=body, status_code=status_code, headers=headers)
+
+
+# ---------------------------
+# Cleanup
+# ---------------------------
+
+def purge_expired(db: Session) -> Dict[str, Any]:
+    n = db.execute(
+        text("DELETE FROM idempotency_keys WHERE expires_at < :now"),
+        {"now": datetime.utcnow()},
+    ).rowcount
+    db.commit()
+    return {"deleted": n}
+
+
+def register() -> None:
+    register_job(JOB_NAME, purge_expired, PURGE_INTERVAL_SECONDS)
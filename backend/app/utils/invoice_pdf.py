@@ -0,0 +1,260 @@
+"""
+Invoice PDF rendering off the request path, with a content-addressed cache.
+
+    snapshot  plain dict of everything printed on the invoice (one query)
+    key       sha256(RENDER_VERSION + snapshot); editing an invoice, its items
+              or the layout changes the key, while re-downloading an unchanged
+              invoice is a file read
+    render    app.utils.pdf.render_invoice in a ProcessPoolExecutor (spawned
+              workers, so CPU work never holds a request thread's GIL)
+    cache     <ZEN_PDF_CACHE_DIR>/<key[:2]>/<key>.pdf, written atomically
+
+Concurrent requests for the same key share one render.
+
+Batch: render every invoice issued in a month on all cores:
+    python -m app.utils.invoice_pdf --month 2026-10
+    python -m app.utils.invoice_pdf --month 2026-10 --workers 8 --force
+
+Env:
+    ZEN_PDF_CACHE_DIR   cache/pdf   (not under uploads/: that is served publicly)
+    ZEN_PDF_WORKERS     cpu count
+    ZEN_PDF_TIMEOUT     60  seconds a request waits for its render
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import date
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import orjson
+from sqlalchemy.orm import Session, selectinload
+
+from app.db import SessionLocal
+from app.models.invoice import Invoice
+from app.models.master_data import Bank, Branch
+from app.utils.metrics import REGISTRY
+from app.utils.pdf import render_invoice
+
+# Bump when app/utils/pdf.py's layout changes so old cache entries are not served
+RENDER_VERSION = "invoice-pdf-1"
+
+CACHE_DIR = os.getenv("ZEN_PDF_CACHE_DIR", "cache/pdf")
+WORKERS = int(os.getenv("ZEN_PDF_WORKERS", "0")) or (os.cpu_count() or 1)
+TIMEOUT = float(os.getenv("ZEN_PDF_TIMEOUT", "60"))
+
+PDF_REQUESTS = REGISTRY.counter("zen_pdf_requests_total", "Invoice PDF lookups", ["result"])
+PDF_RENDER_SECONDS = REGISTRY.histogram("zen_pdf_render_seconds", "Invoice PDF render time (pool round trip)")
+
+_SNAPSHOT_FIELDS = (
+    "id", "invoice_number", "bank_id", "branch_id", "period_from", "period_to", "issue_date",
+    "status", "item_count", "total_amount", "payee_account_name", "payee_account_number",
+    "payee_ifsc", "payee_bank_name", "payee_branch_name", "payee_upi_id", "notes",
+)
+_ITEM_FIELDS = ("assignment_code", "borrower_name", "branch_name", "amount")
+
+
+# ---------------------------
+# Snapshot + key
+# ---------------------------
+
+def _snapshot(inv: Invoice, bank_name: Optional[str], branch_name: Optional[str]) -> Dict[str, Any]:
+    doc = {f: getattr(inv, f) for f in _SNAPSHOT_FIELDS}
+    for f in ("period_from", "period_to", "issue_date"):
+        doc[f] = doc[f].isoformat() if doc[f] else None
+    doc["bank_name"] = bank_name
+    doc["branch_name"] = branch_name
+    doc["items"] = [{f: getattr(it, f) for f in _ITEM_FIELDS} for it in inv.items]
+    return doc
+
+
+def invoice_snapshots(db: Session, invoice_ids: Iterable[int]) -> List[Dict[str, Any]]:
+    """Snapshots for many invoices: invoices+names in one query, items in one more."""
+    ids = list(invoice_ids)
+    if not ids:
+        return []
+    rows = (
+        db.query(Invoice, Bank.name, Branch.name)
+        .join(Bank, Bank.id == Invoice.bank_id)
+        .outerjoin(Branch, Branch.id == Invoice.branch_id)
+        .options(selectinload(Invoice.items))
+        .filter(Invoice.id.in_(ids))
+        .order_by(Invoice.id)
+        .all()
+    )
+    return [_snapshot(inv, bank_name, branch_name) for inv, bank_name, branch_name in rows]
+
+
+def content_key(doc: Dict[str, Any]) -> str:
+    body = orjson.dumps(doc, option=orjson.OPT_SORT_KEYS)
+    return hashlib.sha256(RENDER_VERSION.encode() + b"\0" + body).hexdigest()
+
+
+def cache_path(key: str) -> str:
+    return os.path.join(CACHE_DIR, key[:2], f"{key}.pdf")
+
+
+def _store(key: str, data: bytes) -> str:
+    path = cache_path(key)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+    return path
+
+
+# ---------------------------
+# Pool
+# ---------------------------
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+_inflight: Dict[str, Future] = {}
+
+
+def get_pool(workers: Optional[int] = None) -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn, not fork: the parent has DB pools and threads that must not be cloned
+            _pool = ProcessPoolExecutor(
+                max_workers=workers or WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _pool
+
+
+def shutdown_pool() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+
+def render_cached(doc: Dict[str, Any]) -> str:
+    """
+    Path to the PDF for this snapshot, rendering it in the pool on a cache
+    miss. Blocks the calling thread (not the event loop) until it's ready.
+    """
+    key = content_key(doc)
+    path = cache_path(key)
+    if os.path.exists(path):
+        PDF_REQUESTS.inc(result="hit")
+        return path
+
+    with _pool_lock:
+        fut = _inflight.get(key)
+        owner = fut is None
+        if owner:
+            fut = Future()
+            _inflight[key] = fut
+
+    if not owner:
+        PDF_REQUESTS.inc(result="joined")
+        return fut.result(timeout=TIMEOUT)
+
+    PDF_REQUESTS.inc(result="miss")
+    t0 = time.perf_counter()
+    try:
+        data = get_pool().submit(render_invoice, doc).result(timeout=TIMEOUT)
+        path = _store(key, data)
+        fut.set_result(path)
+        return path
+    except Exception as e:
+        if isinstance(e, BrokenProcessPool):
+            shutdown_pool()  # a worker died; the next render starts a fresh pool
+        fut.set_exception(e)
+        raise
+    finally:
+        PDF_RENDER_SECONDS.observe(time.perf_counter() - t0)
+        with _pool_lock:
+            _inflight.pop(key, None)
+
+
+# ---------------------------
+# Batch
+# ---------------------------
+
+def _month_bounds(month: str) -> Tuple[date, date]:
+    y, m = (int(p) for p in month.split("-"))
+    first = date(y, m, 1)
+    nxt = date(y + (m == 12), m % 12 + 1, 1)
+    return first, nxt
+
+
+def render_month(
+    db: Session,
+    month: str,
+    workers: Optional[int] = None,
+    force: bool = False,
+    batch_size: int = 500,
+) -> Dict[str, Any]:
+    """
+    Render every invoice issued in `month` (YYYY-MM) that isn't cached yet.
+    Snapshots are loaded batch_size invoices at a time, and each batch is
+    spread over the pool with pool.map.
+    """
+    first, nxt = _month_bounds(month)
+    ids = [
+        r[0]
+        for r in db.query(Invoice.id)
+        .filter(Invoice.issue_date >= first, Invoice.issue_date < nxt)
+        .order_by(Invoice.id)
+        .all()
+    ]
+
+    pool = ProcessPoolExecutor(
+        max_workers=workers or WORKERS,
+        mp_context=multiprocessing.get_context("spawn"),
+    )
+    rendered = cached = 0
+    t0 = time.perf_counter()
+    try:
+        for start in range(0, len(ids), batch_size):
+            docs = invoice_snapshots(db, ids[start:start + batch_size])
+            keyed = [(content_key(d), d) for d in docs]
+            todo = [(k, d) for k, d in keyed if force or not os.path.exists(cache_path(k))]
+            cached += len(keyed) - len(todo)
+
+            chunk = max(1, len(todo) // ((workers or WORKERS) * 4))
+            for (key, _), data in zip(todo, pool.map(render_invoice, [d for _, d in todo], chunksize=chunk)):
+                _store(key, data)
+                rendered += 1
+    finally:
+        pool.shutdown()
+
+    seconds = time.perf_counter() - t0
+    return {
+        "month": month,
+        "invoices": len(ids),
+        "rendered": rendered,
+        "cached": cached,
+        "seconds": round(seconds, 3),
+        "docs_per_second": round(rendered / seconds, 1) if rendered and seconds else 0.0,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Render invoice PDFs for a month on all cores")
+    parser.add_argument("--month", default=date.today().strftime("%Y-%m"), help="YYYY-MM (issue date)")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--force", action="store_true", help="re-render even if cached")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        print(f"[PDF] {render_month(db, args.month, args.workers, args.force)}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,246 @@
+"""
+Set-based invoice generation.
+
+generate_invoices() bills every completed, unpaid, not-yet-invoiced
+assignment of a bank (optionally one branch, or one invoice per branch)
+created in [period_from, period_to]. However many assignments there are,
+it runs a fixed number of statements:
+    1. one aggregate query        groups, counts, totals
+    2. one bulk INSERT            invoices (RETURNING ids), placeholder numbers
+    3. one INSERT ... SELECT      invoice_items straight from assignments
+    4. one UPDATE ... FROM        exact totals from the inserted items
+    5. one DELETE + one UPDATE    drop invoices left empty, then number the rest
+
+Runs are serialized by a transaction-scoped advisory lock, and numbers are
+only handed out to invoices that kept items, which keeps invoice numbers
+gap-free. The unique invoice_items.assignment_id stops an
+assignment from being billed twice even if someone bypasses the lock.
+"""
+from __future__ import annotations
+
+import hashlib
+import uuid
+from datetime import date, datetime, time, timedelta
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import Integer, cast, column, delete, exists, func, insert, literal, select, true, update, values
+from sqlalchemy.orm import Session
+
+from app.models.assignment import Assignment
+from app.models.invoice import Invoice, InvoiceItem
+from app.models.master_data import Bank
+
+_LOCK_KEY = int.from_bytes(hashlib.sha1(b"zen:invoices").digest()[:8], "big", signed=True)
+
+PAYEE_FIELDS = {
+    "payee_account_name": "account_name",
+    "payee_account_number": "account_number",
+    "payee_ifsc": "ifsc",
+    "payee_bank_name": "account_bank_name",
+    "payee_branch_name": "account_branch_name",
+    "payee_upi_id": "upi_id",
+    "notes": "invoice_notes",
+}
+
+
+def _billable(bank_id: int, branch_id: Optional[int], period_from: date, period_to: date) -> list:
+    conds = [
+        Assignment.bank_id == bank_id,
+        func.upper(func.coalesce(Assignment.status, "")) == "COMPLETED",
+        Assignment.is_paid.is_(False),
+        Assignment.created_at >= datetime.combine(period_from, time.min),
+        Assignment.created_at < datetime.combine(period_to + timedelta(days=1), time.min),
+        ~exists().where(InvoiceItem.assignment_id == Assignment.id),
+    ]
+    if branch_id is not None:
+        conds.append(Assignment.branch_id == branch_id)
+    return conds
+
+
+def _next_invoice_seq(db: Session, year: int) -> int:
+    prefix = f"INV/{year}/"
+    last = (
+        db.query(func.max(cast(func.split_part(Invoice.invoice_number, "/", 3), Integer)))
+        .filter(
+            Invoice.invoice_number.like(f"{prefix}%"),
+            Invoice.invoice_number.op("~")(r"^INV/\d{4}/\d+$"),
+        )
+        .scalar()
+    )
+    return (last or 0) + 1
+
+
+def generate_invoices(
+    db: Session,
+    *,
+    bank_id: int,
+    period_from: date,
+    period_to: date,
+    branch_id: Optional[int] = None,
+    per_branch: bool = False,
+    preview: bool = False,
+    payee: Optional[Dict[str, Any]] = None,
+    actor_id: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Returns one dict per invoice: {id, invoice_number, branch_id, item_count, total_amount}.
+    With preview=True nothing is written (id / invoice_number are None).
+    The caller commits.
+    """
+    bank = db.get(Bank, bank_id)
+    if bank is None:
+        raise ValueError("Bank not found")
+
+    conds = _billable(bank_id, branch_id, period_from, period_to)
+    split = per_branch and branch_id is None
+    group_col = Assignment.branch_id if split else literal(branch_id, Integer)
+
+    if not preview:
+        db.execute(select(func.pg_advisory_xact_lock(_LOCK_KEY)))
+
+    # 1. Groups
+    agg = select(
+        group_col.label("branch_id"),
+        func.count().label("item_count"),
+        func.coalesce(func.sum(Assignment.fees), 0).label("total_amount"),
+    ).where(*conds)
+    if split:
+        agg = agg.group_by(Assignment.branch_id).order_by(Assignment.branch_id.asc().nulls_last())
+    groups = [dict(r._mapping) for r in db.execute(agg).all() if r.item_count]
+
+    if preview or not groups:
+        return [{"id": None, "invoice_number": None, **g} for g in groups]
+
+    # 2. Invoices, payee defaults from the bank
+    payee = payee or {}
+    defaults = {f: payee.get(f) if payee.get(f) is not None else getattr(bank, src) for f, src in PAYEE_FIELDS.items()}
+    today = date.today()
+    now = datetime.utcnow()
+
+    created = db.execute(
+        insert(Invoice).returning(Invoice.id, Invoice.invoice_number, Invoice.branch_id),
+        [
+            {
+                # Real numbers are given out in step 5, once empty invoices are gone
+                "invoice_number": f"PENDING/{uuid.uuid4().hex[:20]}",
+                "bank_id": bank_id,
+                "branch_id": g["branch_id"],
+                "period_from": period_from,
+                "period_to": period_to,
+                "issue_date": today,
+                "status": "ISSUED",
+                "item_count": 0,
+                "total_amount": 0,
+                "created_by_user_id": actor_id,
+                "created_at": now,
+                "updated_at": now,
+                **defaults,
+            }
+            for g in groups
+        ],
+    ).all()
+
+    # 3. Items, straight from assignments (no rows round-trip through Python)
+    inv_map = values(
+        column("invoice_id", Integer),
+        column("branch_id", Integer),
+        name="inv_map",
+    ).data([(r.id, r.branch_id) for r in created])
+
+    item_rows = (
+        select(
+            inv_map.c.invoice_id,
+            Assignment.id,
+            Assignment.assignment_code,
+            Assignment.borrower_name,
+            Assignment.branch_name,
+            func.coalesce(Assignment.fees, 0),
+        )
+        .select_from(Assignment)
+        .join(
+            inv_map,
+            Assignment.branch_id.is_not_distinct_from(inv_map.c.branch_id) if split else true(),
+        )
+        .where(*conds)
+    )
+    db.execute(
+        insert(InvoiceItem).from_select(
+            ["invoice_id", "assignment_id", "assignment_code", "borrower_name", "branch_name", "amount"],
+            item_rows,
+        )
+    )
+
+    # 4. Totals from what was actually inserted (assignments may have changed since step 1)
+    ids = [r.id for r in created]
+    sums = (
+        select(
+            InvoiceItem.invoice_id,
+            func.count().label("n"),
+            func.coalesce(func.sum(InvoiceItem.amount), 0).label("total"),
+        )
+        .where(InvoiceItem.invoice_id.in_(ids))
+        .group_by(InvoiceItem.invoice_id)
+        .subquery()
+    )
+    totals = db.execute(
+        update(Invoice)
+        .where(Invoice.id == sums.c.invoice_id)
+        .values(item_count=sums.c.n, total_amount=sums.c.total)
+        .returning(Invoice.id, Invoice.branch_id, Invoice.item_count, Invoice.total_amount)
+    ).all()
+
+    # 5. A group whose assignments all changed in between is left empty; drop it
+    # before numbering, so it doesn't leave a hole in the sequence
+    db.execute(delete(Invoice).where(Invoice.id.in_(ids), Invoice.item_count == 0))
+
+    totals = sorted(totals, key=lambda r: r.id)
+    if not totals:
+        return []
+    seq = _next_invoice_seq(db, today.year)
+    numbers = {r.id: f"INV/{today.year}/{seq + i:04d}" for i, r in enumerate(totals)}
+    num_map = values(
+        column("invoice_id", Integer),
+        column("invoice_number", Invoice.invoice_number.type),
+        name="num_map",
+    ).data(list(numbers.items()))
+    db.execute(
+        update(Invoice)
+        .where(Invoice.id == num_map.c.invoice_id)
+        .values(invoice_number=num_map.c.invoice_number)
+    )
+
+    return [
+        {
+            "id": r.id,
+            "invoice_number": numbers[r.id],
+            "branch_id": r.branch_id,
+            "item_count": r.item_count,
+            "total_amount": r.total_amount,
+        }
+        for r in totals
+    ]
+
+
+def mark_invoice_paid(db: Session, invoice_id: int) -> int:
+    """
+    Flip an ISSUED invoice to PAID and its assignments to is_paid, in two
+    set-based UPDATEs. Returns the number of assignments updated; the caller commits.
+    """
+    now = datetime.utcnow()
+    flipped = db.execute(
+        update(Invoice)
+        .where(Invoice.id == invoice_id, Invoice.status == "ISSUED")
+        .values(status="PAID", paid_at=now, updated_at=now)
+    ).rowcount
+    if not flipped:
+        return 0
+
+    return db.execute(
+        update(Assignment)
+        .where(
+            Assignment.id == InvoiceItem.assignment_id,
+            InvoiceItem.invoice_id == invoice_id,
+            Assignment.is_paid.is_(False),
+        )
+        .values(is_paid=True, updated_at=now)
+    ).rowcount or 0
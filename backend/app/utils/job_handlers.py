@@ -0,0 +1,46 @@
+"""
+Handlers for the background job queue (app/utils/jobs.py), imported by
+app/worker.py. Each takes a JobContext and returns a JSON-able result.
+
+    invoice_pdf.month     {"month": "2026-10", "force": false}
+    valuation.recompute   {"template_id": 3}
+"""
+from __future__ import annotations
+
+from typing import Any, Dict
+
+from app.db import SessionLocal
+from app.models.valuation import CalculationTemplate
+from app.utils.invoice_pdf import render_month
+from app.utils.jobs import JobContext, PermanentJobError, handler
+from app.utils.valuation_recompute import locked_session, recompute_template
+
+
+@handler("invoice_pdf.month")
+def invoice_pdf_month(ctx: JobContext) -> Dict[str, Any]:
+    month = ctx.payload.get("month")
+    if not month:
+        raise PermanentJobError("payload.month (YYYY-MM) is required")
+    db = SessionLocal()
+    try:
+        # One render process per job: the worker pool already runs jobs side by side
+        return render_month(db, month, workers=1, force=bool(ctx.payload.get("force")))
+    finally:
+        db.close()
+
+
+@handler("valuation.recompute")
+def valuation_recompute(ctx: JobContext) -> Dict[str, Any]:
+    with locked_session() as db:
+        if db is None:
+            # The scheduler (or another job) is recomputing; retry after backoff
+            raise RuntimeError("another recompute holds the lock")
+        template = db.get(CalculationTemplate, ctx.payload.get("template_id"))
+        if template is None or not template.is_active:
+            raise PermanentJobError(f"template {ctx.payload.get('template_id')} not found or inactive")
+
+        def report(state: Dict[str, Any]) -> None:
+            ctx.report(done=state["done"], total=state["total"], failed=state["failed"])
+
+        # Worker processes already run side by side; evaluate in-process
+        return recompute_template(db, template, workers=1, progress=report)
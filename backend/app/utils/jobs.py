@@ -0,0 +1,312 @@
+"""
+Durable background jobs on the Postgres we already run (no broker).
+
+    enqueue   INSERT into jobs; a job with the same dedup_key still QUEUED or
+              RUNNING is returned instead of adding a second one, with the
+              caller added to its requested_by_user_ids so they can poll it.
+              NOTIFY zen_jobs wakes idle workers straight away.
+    claim     UPDATE ... WHERE id = (SELECT ... FOR UPDATE SKIP LOCKED LIMIT 1):
+              highest priority, then oldest run_at. Workers never block on or
+              double-claim a row, and the claim commits before the handler
+              runs, so no transaction stays open for the length of a job.
+    finish    SUCCEEDED with the handler's result, or back to QUEUED with
+              exponential backoff until max_attempts, then FAILED
+    reap      RUNNING jobs whose heartbeat went stale (worker killed) are
+              retried the same way
+
+Handlers are plain functions registered per kind:
+
+    @handler("invoice_pdf.month")
+    def render(ctx: JobContext) -> dict:
+        ctx.report(done=10, total=40)      # shown by GET /api/jobs/{id}
+        return {...}                       # stored in jobs.result
+
+Raise PermanentJobError for failures a retry won't fix. Workers:
+python -m app.worker (see app/worker.py).
+
+Env:
+    ZEN_JOB_CHANNEL            zen_jobs
+    ZEN_JOB_BACKOFF_SECONDS    10    first retry delay, doubled per attempt (max 1h, ±20% jitter)
+    ZEN_JOB_STALE_SECONDS      120   RUNNING without a heartbeat this long = worker lost
+"""
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, Optional
+
+import orjson
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.db import SessionLocal
+from app.models.job import Job
+from app.utils.metrics import REGISTRY
+
+CHANNEL = os.getenv("ZEN_JOB_CHANNEL", "zen_jobs")
+BACKOFF_SECONDS = float(os.getenv("ZEN_JOB_BACKOFF_SECONDS", "10"))
+MAX_BACKOFF_SECONDS = 3600.0
+STALE_SECONDS = float(os.getenv("ZEN_JOB_STALE_SECONDS", "120"))
+
+_DEDUP_WHERE = text("status IN ('QUEUED', 'RUNNING') AND dedup_key IS NOT NULL")
+
+# Dedup hit: find the active job and record the caller as a requester (once)
+_JOIN_SQL = text(
+    """
+UPDATE jobs SET requested_by_user_ids = CASE
+    WHEN CAST(:uid AS integer) IS NULL
+         OR created_by_user_id = :uid
+         OR :uid = ANY(requested_by_user_ids) THEN requested_by_user_ids
+    ELSE array_append(requested_by_user_ids, CAST(:uid AS integer)) END
+WHERE dedup_key = :k AND status IN ('QUEUED', 'RUNNING')
+RETURNING id
+"""
+)
+
+
+class PermanentJobError(Exception):
+    """Fail the job now, without further retries."""
+
+
+@dataclass
+class JobContext:
+    job_id: int
+    kind: str
+    payload: Dict[str, Any]
+    attempt: int
+    max_attempts: int
+
+    def report(self, **progress: Any) -> None:
+        """Store progress for pollers (own short transaction)."""
+        report_progress(self.job_id, progress)
+
+
+_handlers: Dict[str, Callable[[JobContext], Any]] = {}
+
+
+def register_handler(kind: str, fn: Callable[[JobContext], Any]) -> None:
+    _handlers[kind] = fn
+
+
+def handler(kind: str):
+    def deco(fn):
+        register_handler(kind, fn)
+        return fn
+
+    return deco
+
+
+def get_handler(kind: str) -> Optional[Callable[[JobContext], Any]]:
+    return _handlers.get(kind)
+
+
+# ---------------------------
+# Producer side
+# ---------------------------
+
+def enqueue(
+    db: Session,
+    kind: str,
+    payload: Optional[Dict[str, Any]] = None,
+    *,
+    priority: int = 0,
+    dedup_key: Optional[str] = None,
+    max_attempts: int = 5,
+    run_at: Optional[datetime] = None,
+    user_id: Optional[int] = None,
+    commit: bool = True,
+) -> Job:
+    """
+    Queue a job and return it. With dedup_key, an identical job that is still
+    QUEUED or RUNNING is returned instead of adding another, and user_id is
+    added to its requesters. The key must cover everything that changes the
+    work (e.g. a force flag): the caller gets whatever job holds it.
+    """
+    row = {
+        "kind": kind,
+        "payload": payload or {},
+        "status": "QUEUED",
+        "priority": priority,
+        "dedup_key": dedup_key,
+        "attempts": 0,
+        "max_attempts": max_attempts,
+        "run_at": run_at or datetime.utcnow(),
+        "created_by_user_id": user_id,
+        "created_at": datetime.utcnow(),
+    }
+    job_id = None
+    # Two tries: the job we collided with may finish between INSERT and SELECT
+    for _ in range(2):
+        stmt = pg_insert(Job).values(**row)
+        if dedup_key is not None:
+            stmt = stmt.on_conflict_do_nothing(index_elements=[Job.dedup_key], index_where=_DEDUP_WHERE)
+        job_id = db.execute(stmt.returning(Job.id)).scalar()
+        if job_id is not None:
+            db.execute(text("SELECT pg_notify(:ch, :kind)"), {"ch": CHANNEL, "kind": kind})
+            break
+        job_id = db.execute(_JOIN_SQL, {"k": dedup_key, "uid": user_id}).scalar()
+        if job_id is not None:
+            break
+
+    if commit:
+        db.commit()
+    return db.get(Job, job_id)
+
+
+def cancel(db: Session, job_id: int) -> bool:
+    """Cancel a job that hasn't started; False if it is already running or finished."""
+    n = db.execute(
+        text(
+            "UPDATE jobs SET status = 'CANCELLED', finished_at = :now "
+            "WHERE id = :id AND status = 'QUEUED'"
+        ),
+        {"id": job_id, "now": datetime.utcnow()},
+    ).rowcount
+    db.commit()
+    return bool(n)
+
+
+# ---------------------------
+# Worker side
+# ---------------------------
+
+_CLAIM_SQL = """
+UPDATE jobs j SET
+    status = 'RUNNING',
+    attempts = j.attempts + 1,
+    locked_by = :worker,
+    heartbeat_at = :now,
+    started_at = coalesce(j.started_at, :now)
+WHERE j.id = (
+    SELECT id FROM jobs
+    WHERE status = 'QUEUED' AND run_at <= :now {kinds}
+    ORDER BY priority DESC, run_at, id
+    FOR UPDATE SKIP LOCKED
+    LIMIT 1
+)
+RETURNING j.id, j.kind, j.payload, j.attempts, j.max_attempts
+"""
+
+# Retry with backoff, or give up after max_attempts (attempts was bumped on claim)
+_RETRY_SET = """
+    status = CASE WHEN :permanent OR attempts >= max_attempts THEN 'FAILED' ELSE 'QUEUED' END,
+    run_at = CASE WHEN :permanent OR attempts >= max_attempts THEN run_at
+             ELSE :now + make_interval(secs => least(:base * power(2, greatest(attempts - 1, 0)), :cap)
+                                               * (0.8 + random() * 0.4)) END,
+    finished_at = CASE WHEN :permanent OR attempts >= max_attempts THEN :now END,
+    last_error = :error,
+    locked_by = NULL,
+    heartbeat_at = NULL
+"""
+
+
+def claim(db: Session, worker_id: str, kinds: Optional[Iterable[str]] = None) -> Optional[JobContext]:
+    """Take the next runnable job (commits), or None when the queue is empty."""
+    kinds = list(kinds or [])
+    params: Dict[str, Any] = {"worker": worker_id, "now": datetime.utcnow()}
+    if kinds:
+        params["kinds"] = kinds
+    row = db.execute(
+        text(_CLAIM_SQL.format(kinds="AND kind = ANY(:kinds)" if kinds else "")), params
+    ).mappings().first()
+    db.commit()
+    if row is None:
+        return None
+    return JobContext(
+        job_id=row["id"],
+        kind=row["kind"],
+        payload=row["payload"] or {},
+        attempt=row["attempts"],
+        max_attempts=row["max_attempts"],
+    )
+
+
+def heartbeat(db: Session, job_id: int, worker_id: str) -> bool:
+    """False when the job is no longer ours (reaped or cancelled)."""
+    n = db.execute(
+        text("UPDATE jobs SET heartbeat_at = :now WHERE id = :id AND locked_by = :w AND status = 'RUNNING'"),
+        {"id": job_id, "w": worker_id, "now": datetime.utcnow()},
+    ).rowcount
+    db.commit()
+    return bool(n)
+
+
+def complete(db: Session, job_id: int, worker_id: str, result: Any) -> None:
+    db.execute(
+        text(
+            "UPDATE jobs SET status = 'SUCCEEDED', result = CAST(:result AS jsonb), finished_at = :now, "
+            "last_error = NULL, locked_by = NULL, heartbeat_at = NULL "
+            "WHERE id = :id AND locked_by = :w AND status = 'RUNNING'"
+        ),
+        {"id": job_id, "w": worker_id, "now": datetime.utcnow(), "result": _json(result)},
+    )
+    db.commit()
+
+
+def fail(db: Session, job_id: int, worker_id: str, error: str, *, permanent: bool = False) -> Optional[str]:
+    """Record a failed attempt; returns the job's new status (QUEUED = will retry)."""
+    status = db.execute(
+        text(f"UPDATE jobs SET {_RETRY_SET} WHERE id = :id AND locked_by = :w AND status = 'RUNNING' RETURNING status"),
+        _retry_params(error, permanent) | {"id": job_id, "w": worker_id},
+    ).scalar()
+    db.commit()
+    return status
+
+
+def reap_stale(db: Session) -> int:
+    """Retry (or fail) RUNNING jobs whose worker stopped heartbeating."""
+    n = db.execute(
+        text(f"UPDATE jobs SET {_RETRY_SET} WHERE status = 'RUNNING' AND heartbeat_at < :stale"),
+        _retry_params("worker lost (no heartbeat)", False) | {"stale": datetime.utcnow() - timedelta(seconds=STALE_SECONDS)},
+    ).rowcount
+    db.commit()
+    return n
+
+
+def report_progress(job_id: int, progress: Dict[str, Any]) -> None:
+    db = SessionLocal()
+    try:
+        db.execute(
+            text("UPDATE jobs SET progress = CAST(:p AS jsonb) WHERE id = :id"),
+            {"id": job_id, "p": _json(progress)},
+        )
+        db.commit()
+    finally:
+        db.close()
+
+
+def _retry_params(error: str, permanent: bool) -> Dict[str, Any]:
+    return {
+        "permanent": permanent,
+        "now": datetime.utcnow(),
+        "base": BACKOFF_SECONDS,
+        "cap": MAX_BACKOFF_SECONDS,
+        "error": (error or "")[-4000:],
+    }
+
+
+def _json(value: Any) -> str:
+    return orjson.dumps(value, default=str).decode()
+
+
+def _queue_depth():
+    # Runs on every /api/metrics scrape: with the DB down or slow, skip the
+    # sample instead of failing the scrape (pool / health gauges matter most then)
+    db = SessionLocal()
+    try:
+        db.execute(text("SET LOCAL statement_timeout = '2s'"))
+        rows = db.execute(
+            text("SELECT kind, status, count(*) FROM jobs WHERE status IN ('QUEUED', 'RUNNING') GROUP BY 1, 2")
+        ).all()
+        return [((kind, status), n) for kind, status, n in rows]
+    except SQLAlchemyError as e:
+        print(f"[JOBS] queue depth unavailable: {e.__class__.__name__}")
+        return []
+    finally:
+        db.close()
+
+
+REGISTRY.gauge("zen_jobs", "Queued / running background jobs", ["kind", "status"], _queue_depth)
@@ -0,0 +1,168 @@
+"""
+Tiny in-process Prometheus-style metrics (no external dependency).
+
+Per-process: with several Uvicorn/Gunicorn workers each worker keeps its own
+numbers, and a scrape reports whichever worker answered it (the pid is in
+the first comment line).
+
+    REQUESTS = REGISTRY.counter("zen_requests_total", "Requests", ["route"])
+    REQUESTS.inc(route="/api/assignments")
+
+    LATENCY = REGISTRY.histogram("zen_latency_seconds", "Latency", ["route"])
+    LATENCY.observe(0.012, route="/api/assignments")
+
+    REGISTRY.render()  # text exposition format 0.0.4
+"""
+from __future__ import annotations
+
+import bisect
+import os
+import threading
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+LabelValues = Tuple[str, ...]
+
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+
+def _escape(v: str) -> str:
+    return str(v).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _fmt_labels(names: Sequence[str], values: Sequence[str], extra: Optional[Dict[str, str]] = None) -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.extend(f'{k}="{_escape(v)}"' for k, v in extra.items())
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _fmt_value(v: float) -> str:
+    if v == float("inf"):
+        return "+Inf"
+    return repr(float(v)) if not float(v).is_integer() else str(int(v))
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help_text
+        self.label_names = tuple(labels)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        return tuple(str(labels.get(n, "")) for n in self.label_names)
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, *a, **kw):
+        super().__init__(*a, **kw)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return self.header() + [f"{self.name}{_fmt_labels(self.label_names, k)} {_fmt_value(v)}" for k, v in items]
+
+
+class Gauge(_Metric):
+    """Gauge whose samples are read from a callback at scrape time."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str], collect: Callable[[], Iterable[Tuple[LabelValues, float]]]):
+        super().__init__(name, help_text, labels)
+        self._collect = collect
+
+    def render(self) -> List[str]:
+        return self.header() + [
+            f"{self.name}{_fmt_labels(self.label_names, k)} {_fmt_value(v)}" for k, v in self._collect()
+        ]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labels)
+        self.buckets = tuple(sorted(buckets))
+        # key -> [bucket counts..., sum, count]
+        self._values: Dict[LabelValues, List[float]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        idx = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            row = self._values.get(key)
+            if row is None:
+                row = [0.0] * (len(self.buckets) + 2)
+                self._values[key] = row
+            if idx < len(self.buckets):
+                row[idx] += 1
+            row[-2] += value
+            row[-1] += 1
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = [(k, list(v)) for k, v in self._values.items()]
+
+        out = self.header()
+        for key, row in items:
+            cumulative = 0.0
+            for i, le in enumerate(self.buckets):
+                cumulative += row[i]
+                out.append(f"{self.name}_bucket{_fmt_labels(self.label_names, key, {'le': _fmt_value(le)})} {_fmt_value(cumulative)}")
+            out.append(f"{self.name}_bucket{_fmt_labels(self.label_names, key, {'le': '+Inf'})} {_fmt_value(row[-1])}")
+            out.append(f"{self.name}_sum{_fmt_labels(self.label_names, key)} {_fmt_value(row[-2])}")
+            out.append(f"{self.name}_count{_fmt_labels(self.label_names, key)} {_fmt_value(row[-1])}")
+        return out
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, help_text: str, labels: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, help_text, labels))  # type: ignore[return-value]
+
+    def histogram(self, name: str, help_text: str, labels: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, help_text, labels, buckets))  # type: ignore[return-value]
+
+    def gauge(self, name: str, help_text: str, labels: Sequence[str], collect) -> Gauge:
+        return self._register(Gauge(name, help_text, labels, collect))  # type: ignore[return-value]
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines: List[str] = [f"# zen_ops worker pid={os.getpid()}"]
+        for m in metrics:
+            lines.extend(m.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
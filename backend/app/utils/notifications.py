@@ -0,0 +1,310 @@
+"""
+Notifications and per-user unread counters.
+
+Every write goes through this module, so notification_counters.unread always
+equals the user's count of rows WHERE read_at IS NULL. Inserts and mark-read
+UPDATEs adjust the counter inside the same transaction. The bell endpoint
+then reads one row instead of counting.
+
+If the counters ever drift (manual SQL, a restored backup), rebuild them
+set-based:
+    python -m app.utils.notifications --recount
+
+Assignment events are fanned out after the response has been sent (FastAPI
+BackgroundTasks, see on_assignment_created / on_assignment_updated). They
+use their own session, so recipient lookups and inserts add nothing to the
+request's latency.
+
+Mentions are "@<email>" tokens in an assignment's notes, e.g.
+"@rohan.patil@example.com please check".
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import re
+from collections import Counter
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from sqlalchemy import func, select, text, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.db import SessionLocal
+from app.models.assignment import Assignment
+from app.models.notification import Notification, NotificationCounter
+from app.models.user import User
+from app.utils.broadcast import publish_user_events
+
+logger = logging.getLogger("app.notifications")
+
+# Who hears about every new assignment / status change
+MANAGER_ROLES = ("ADMIN", "OPS_MANAGER")
+
+MENTION_RE = re.compile(r"(?<![\w.])@([\w.+-]+@[\w-]+(?:\.[\w-]+)+)")
+
+
+def extract_mentions(value: Optional[str]) -> Set[str]:
+    """Lower-cased emails mentioned as "@<email>" in free text."""
+    return {m.lower() for m in MENTION_RE.findall(value or "")}
+
+
+# ---------------------------
+# Counter maintenance
+# ---------------------------
+
+def _add_unread(db: Session, per_user: Dict[int, int]) -> None:
+    # Sorted so concurrent fan-outs lock counter rows in the same order
+    now = datetime.utcnow()
+    stmt = pg_insert(NotificationCounter).values(
+        [{"user_id": uid, "unread": n, "updated_at": now} for uid, n in sorted(per_user.items())]
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[NotificationCounter.user_id],
+        set_={
+            "unread": NotificationCounter.unread + stmt.excluded.unread,
+            "updated_at": stmt.excluded.updated_at,
+        },
+    )
+    db.execute(stmt)
+
+
+def _sub_unread(db: Session, user_id: int, n: int) -> None:
+    db.execute(
+        update(NotificationCounter)
+        .where(NotificationCounter.user_id == user_id)
+        .values(unread=func.greatest(NotificationCounter.unread - n, 0), updated_at=datetime.utcnow())
+    )
+
+
+# ---------------------------
+# Writes
+# ---------------------------
+
+def notify_many(db: Session, rows: List[Dict[str, Any]], commit: bool = True) -> int:
+    """
+    Insert notifications (dicts with user_id, type and optionally
+    assignment_id / actor_user_id / payload) and bump each recipient's counter.
+    """
+    rows = [r for r in rows if r.get("user_id")]
+    if not rows:
+        return 0
+
+    now = datetime.utcnow()
+    db.execute(
+        pg_insert(Notification),
+        [
+            {
+                "user_id": r["user_id"],
+                "type": r["type"],
+                "assignment_id": r.get("assignment_id"),
+                "actor_user_id": r.get("actor_user_id"),
+                "payload": r.get("payload") or {},
+                "created_at": now,
+            }
+            for r in rows
+        ],
+    )
+    per_user = Counter(r["user_id"] for r in rows)
+    _add_unread(db, per_user)
+
+    # Live bell update; sent when this transaction commits
+    publish_user_events(db, "notification.created", {uid: {"count": n} for uid, n in per_user.items()})
+
+    if commit:
+        db.commit()
+    return len(rows)
+
+
+def notify(
+    db: Session,
+    user_ids: Iterable[Optional[int]],
+    *,
+    type: str,
+    assignment_id: Optional[int] = None,
+    actor_user_id: Optional[int] = None,
+    payload: Optional[Dict[str, Any]] = None,
+    commit: bool = True,
+) -> int:
+    """Same notification for several users. The actor never notifies themselves."""
+    ids = sorted({u for u in user_ids if u and u != actor_user_id})
+    return notify_many(
+        db,
+        [
+            {
+                "user_id": uid,
+                "type": type,
+                "assignment_id": assignment_id,
+                "actor_user_id": actor_user_id,
+                "payload": payload,
+            }
+            for uid in ids
+        ],
+        commit=commit,
+    )
+
+
+def mark_read(db: Session, user_id: int, notification_id: int) -> bool:
+    n = db.execute(
+        update(Notification)
+        .where(
+            Notification.id == notification_id,
+            Notification.user_id == user_id,
+            Notification.read_at.is_(None),
+        )
+        .values(read_at=datetime.utcnow())
+    ).rowcount
+    if n:
+        _sub_unread(db, user_id, n)
+        publish_user_events(db, "notification.read", {user_id: {"ids": [notification_id]}})
+    db.commit()
+    return bool(n)
+
+
+def mark_all_read(db: Session, user_id: int, up_to_id: Optional[int] = None) -> int:
+    """
+    One set-based UPDATE over the user's unread rows (partial index), then one
+    counter adjustment. up_to_id lets the client skip anything newer than what
+    it has shown.
+    """
+    stmt = (
+        update(Notification)
+        .where(Notification.user_id == user_id, Notification.read_at.is_(None))
+        .values(read_at=datetime.utcnow())
+    )
+    if up_to_id is not None:
+        stmt = stmt.where(Notification.id <= up_to_id)
+
+    n = db.execute(stmt).rowcount or 0
+    if n:
+        _sub_unread(db, user_id, n)
+        publish_user_events(db, "notification.read", {user_id: {"all": True, "up_to_id": up_to_id}})
+    db.commit()
+    return n
+
+
+# ---------------------------
+# Reads
+# ---------------------------
+
+def unread_count(db: Session, user_id: int) -> int:
+    value = db.execute(
+        select(NotificationCounter.unread).where(NotificationCounter.user_id == user_id)
+    ).scalar()
+    return int(value or 0)
+
+
+def recount_unread(db: Session) -> int:
+    """Rebuild every counter from notifications. Returns the number of counters corrected."""
+    n = db.execute(
+        text(
+            "INSERT INTO notification_counters (user_id, unread, updated_at) "
+            "SELECT u.id, coalesce(c.cnt, 0), now() AT TIME ZONE 'utc' "
+            "FROM users u "
+            "LEFT JOIN (SELECT user_id, count(*) AS cnt FROM notifications "
+            "           WHERE read_at IS NULL GROUP BY user_id) c ON c.user_id = u.id "
+            "ON CONFLICT (user_id) DO UPDATE SET unread = EXCLUDED.unread, updated_at = EXCLUDED.updated_at "
+            "WHERE notification_counters.unread <> EXCLUDED.unread"
+        )
+    ).rowcount
+    db.commit()
+    return int(n or 0)
+
+
+# ---------------------------
+# Assignment events (run as background tasks)
+# ---------------------------
+
+def _manager_ids(db: Session) -> List[int]:
+    rows = db.execute(
+        select(User.id).where(func.upper(User.role).in_(MANAGER_ROLES), User.is_active.is_(True))
+    ).all()
+    return [r[0] for r in rows]
+
+
+def _user_ids_by_email(db: Session, emails: Set[str]) -> List[int]:
+    if not emails:
+        return []
+    rows = db.execute(
+        select(User.id).where(func.lower(User.email).in_(sorted(emails)), User.is_active.is_(True))
+    ).all()
+    return [r[0] for r in rows]
+
+
+def _run_event(name: str, fn, *args) -> None:
+    db = SessionLocal()
+    try:
+        fn(db, *args)
+        db.commit()
+    except Exception:
+        db.rollback()
+        logger.exception("Notification fan-out failed for %s", name)
+    finally:
+        db.close()
+
+
+def _assignment_created(db: Session, assignment_id: int, actor_id: Optional[int]) -> None:
+    a = db.get(Assignment, assignment_id)
+    if a is None:
+        return
+    base = {"assignment_id": a.id, "actor_user_id": actor_id, "commit": False}
+    payload = {"assignment_code": a.assignment_code, "borrower_name": a.borrower_name}
+
+    assignee = a.assigned_to_user_id
+    notify(db, [assignee], type="ASSIGNED", payload=payload, **base)
+    notify(db, [u for u in _manager_ids(db) if u != assignee], type="ASSIGNMENT_CREATED", payload=payload, **base)
+    notify(db, _user_ids_by_email(db, extract_mentions(a.notes)), type="MENTIONED", payload=payload, **base)
+
+
+def _assignment_updated(db: Session, assignment_id: int, actor_id: Optional[int], before: Dict[str, Any]) -> None:
+    a = db.get(Assignment, assignment_id)
+    if a is None:
+        return
+    base = {"assignment_id": a.id, "actor_user_id": actor_id, "commit": False}
+    payload = {"assignment_code": a.assignment_code, "borrower_name": a.borrower_name}
+
+    if "assigned_to_user_id" in before and a.assigned_to_user_id:
+        notify(db, [a.assigned_to_user_id], type="ASSIGNED", payload=payload, **base)
+
+    if "status" in before and before["status"] != a.status:
+        notify(
+            db,
+            {a.assigned_to_user_id, *_manager_ids(db)},
+            type="STATUS_CHANGED",
+            payload={**payload, "from": before["status"], "to": a.status},
+            **base,
+        )
+
+    if "notes" in before:
+        new_mentions = extract_mentions(a.notes) - extract_mentions(before["notes"])
+        notify(db, _user_ids_by_email(db, new_mentions), type="MENTIONED", payload=payload, **base)
+
+
+def on_assignment_created(assignment_id: int, actor_id: Optional[int]) -> None:
+    _run_event("assignment created", _assignment_created, assignment_id, actor_id)
+
+
+def on_assignment_updated(assignment_id: int, actor_id: Optional[int], before: Dict[str, Any]) -> None:
+    """before: old values of the fields that changed (status / notes / assigned_to_user_id)."""
+    _run_event("assignment updated", _assignment_updated, assignment_id, actor_id, before)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Notification maintenance")
+    parser.add_argument("--recount", action="store_true", help="rebuild notification_counters from notifications")
+    args = parser.parse_args()
+
+    if not args.recount:
+        parser.print_help()
+        return
+
+    db = SessionLocal()
+    try:
+        print(f"[NOTIFICATIONS] corrected {recount_unread(db)} counters")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import base64
+from datetime import date, datetime
+from typing import Optional, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import and_, or_, tuple_
+
+
+def _b64(raw: str) -> str:
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def _unb64(cursor: str) -> str:
+    padded = cursor + "=" * (-len(cursor) % 4)
+    return base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8")
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    """
+    Opaque keyset cursor for (created_at DESC, id DESC) feeds.
+
+    Format (before base64): "<iso timestamp>|<id>"
+    """
+    return _b64(f"{created_at.isoformat()}|{int(row_id)}")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[Tuple[datetime, int]]:
+    if not cursor:
+        return None
+    try:
+        ts, row_id = _unb64(cursor).rsplit("|", 1)
+        return datetime.fromisoformat(ts), int(row_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def apply_keyset(query, created_col, id_col, cursor: Optional[str]):
+    """
+    Keyset ("seek") pagination, newest first.
+
+    Rows strictly older than the cursor are returned, so pages never
+    shift when new rows are inserted at the head.
+    """
+    decoded = decode_cursor(cursor)
+    if decoded is not None:
+        ts, row_id = decoded
+        # Row-value comparison lets Postgres seek straight into a
+        # (..., created_at DESC) index instead of scanning.
+        query = query.filter(tuple_(created_col, id_col) < tuple_(ts, row_id))
+    return query.order_by(created_col.desc(), id_col.desc())
+
+
+def encode_due_cursor(due: Optional[date], row_id: int) -> str:
+    """Cursor for (due ASC NULLS LAST, id ASC) lists. Format: "<iso date or empty>|<id>"."""
+    return _b64(f"{due.isoformat() if due else ''}|{int(row_id)}")
+
+
+def decode_due_cursor(cursor: Optional[str]) -> Optional[Tuple[Optional[date], int]]:
+    if not cursor:
+        return None
+    try:
+        due, row_id = _unb64(cursor).rsplit("|", 1)
+        return (date.fromisoformat(due) if due else None), int(row_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def apply_due_keyset(query, due_col, id_col, cursor: Optional[str]):
+    """
+    Keyset pagination, most urgent first: due date ascending, undated rows last.
+    """
+    decoded = decode_due_cursor(cursor)
+    if decoded is not None:
+        due, row_id = decoded
+        if due is None:
+            query = query.filter(and_(due_col.is_(None), id_col > row_id))
+        else:
+            query = query.filter(or_(tuple_(due_col, id_col) > tuple_(due, row_id), due_col.is_(None)))
+    return query.order_by(due_col.asc().nulls_last(), id_col.asc())
+
+
+SyncPosition = Tuple[int, Optional[int], int, Optional[Tuple[int, int]]]
+
+
+def encode_sync_token(since: int, upto: Optional[int] = None, stage: int = 0, after: Optional[Tuple[int, int]] = None) -> str:
+    """
+    Delta-sync token (app/utils/sync.py). Format: "<since>|<upto>|<stage>|<xid>|<id>";
+    upto / xid / id are empty when the client is caught up.
+    """
+    xid, row_id = after if after else ("", "")
+    return _b64(f"{int(since)}|{'' if upto is None else int(upto)}|{int(stage)}|{xid}|{row_id}")
+
+
+def decode_sync_token(token: Optional[str]) -> SyncPosition:
+    """(since, upto, stage, after); no token = sync everything from the start."""
+    if not token:
+        return 0, None, 0, None
+    try:
+        since, upto, stage, xid, row_id = _unb64(token).split("|")
+        after = (int(xid), int(row_id)) if xid else None
+        return int(since), (int(upto) if upto else None), int(stage), after
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid sync token")
@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import re
+from datetime import date
+from typing import Any, Dict, List, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.utils.scheduler import register_job
+
+# activities is RANGE-partitioned by month on created_at:
+#   activities_p202601  ->  [2026-01-01, 2026-02-01)
+#   activities_default  ->  anything outside the monthly partitions
+PARENT_TABLE = "activities"
+DEFAULT_PARTITION = "activities_default"
+
+JOB_NAME = "activity_partitions"
+INTERVAL_SECONDS = 6 * 3600.0
+MONTHS_AHEAD = 3
+PARTITION_RE = re.compile(r"^activities_p(\d{4})(\d{2})$")
+
+
+def month_start(d: date) -> date:
+    return date(d.year, d.month, 1)
+
+
+def add_months(d: date, months: int) -> date:
+    idx = d.year * 12 + (d.month - 1) + months
+    return date(idx // 12, idx % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"{PARENT_TABLE}_p{month.year:04d}{month.month:02d}"
+
+
+def is_partitioned(db: Session) -> bool:
+    row = db.execute(
+        text(
+            """
+            SELECT 1
+            FROM pg_partitioned_table pt
+            JOIN pg_class c ON c.oid = pt.partrelid
+            WHERE c.relname = :name
+            """
+        ),
+        {"name": PARENT_TABLE},
+    ).first()
+    return row is not None
+
+
+def list_partitions(db: Session) -> List[Tuple[str, date]]:
+    """Attached monthly partitions as (name, month_start), oldest first."""
+    rows = db.execute(
+        text(
+            """
+            SELECT c.relname
+            FROM pg_inherits i
+            JOIN pg_class c ON c.oid = i.inhrelid
+            JOIN pg_class p ON p.oid = i.inhparent
+            WHERE p.relname = :name
+            """
+        ),
+        {"name": PARENT_TABLE},
+    ).all()
+
+    out: List[Tuple[str, date]] = []
+    for (relname,) in rows:
+        m = PARTITION_RE.match(relname)
+        if m:
+            out.append((relname, date(int(m.group(1)), int(m.group(2)), 1)))
+    return sorted(out, key=lambda x: x[1])
+
+
+def ensure_partitions_between(db: Session, first_month: date, last_month: date) -> List[str]:
+    """
+    Create monthly partitions covering [first_month, last_month] (inclusive).
+    No-op if the table has not been migrated to the partitioned layout yet.
+    Returns names of partitions that did not exist before.
+    """
+    if not is_partitioned(db):
+        return []
+
+    existing = {name for name, _ in list_partitions(db)}
+    created: List[str] = []
+
+    lo = month_start(first_month)
+    end = month_start(last_month)
+    while lo <= end:
+        hi = add_months(lo, 1)
+        name = partition_name(lo)
+        if name not in existing:
+            _create_partition(db, name, lo, hi)
+            created.append(name)
+        lo = hi
+
+    db.commit()
+    return created
+
+
+def _create_partition(db: Session, name: str, lo: date, hi: date) -> None:
+    """
+    CREATE ... PARTITION OF fails while activities_default holds rows of the
+    new range, so those rows are moved out first and re-inserted (routed to
+    the new partition) in the same transaction.
+    """
+    params = {"lo": lo, "hi": hi}
+    moved = db.execute(
+        text(
+            f'CREATE TEMP TABLE "_moved_{name}" ON COMMIT DROP AS '
+            f'WITH d AS (DELETE FROM "{DEFAULT_PARTITION}" WHERE created_at >= :lo AND created_at < :hi RETURNING *) '
+            "SELECT * FROM d"
+        ),
+        params,
+    ).rowcount
+    db.execute(
+        text(
+            f'CREATE TABLE IF NOT EXISTS "{name}" PARTITION OF "{PARENT_TABLE}" '
+            f"FOR VALUES FROM ('{lo.isoformat()}') TO ('{hi.isoformat()}')"
+        )
+    )
+    if moved:
+        db.execute(text(f'INSERT INTO "{PARENT_TABLE}" SELECT * FROM "_moved_{name}"'))
+        # The rows didn't go away: drop the tombstones the DELETE just wrote
+        # (the re-insert restamps change_xid, so sync clients re-fetch them)
+        db.execute(
+            text(
+                "DELETE FROM sync_tombstones WHERE table_name = :t "
+                "AND change_xid = pg_current_xact_id()::text::bigint"
+            ),
+            {"t": PARENT_TABLE},
+        )
+        print(f"[PARTITIONS] moved {moved} rows from {DEFAULT_PARTITION} into {name}")
+
+
+def ensure_activity_partitions(db: Session, months_ahead: int = MONTHS_AHEAD) -> List[str]:
+    """
+    Create monthly partitions from the current month up to `months_ahead`.
+    Idempotent; runs at startup and as the "activity_partitions" scheduler job.
+    """
+    start = month_start(date.today())
+    return ensure_partitions_between(db, start, add_months(start, months_ahead))
+
+
+def maintain_partitions(db: Session) -> Dict[str, Any]:
+    return {"created": ensure_activity_partitions(db)}
+
+
+def register() -> None:
+    register_job(JOB_NAME, maintain_partitions, INTERVAL_SECONDS)
@@ -0,0 +1,204 @@
+"""
+Tiny PDF writer (no external dependency) and the invoice layout.
+
+Only what invoices need: A4 pages, the standard Helvetica fonts (no
+embedding), text and rules, Flate-compressed content streams. Text is
+encoded as WinAnsi (cp1252); characters outside it become "?".
+
+This module must stay free of app / DB imports: render_invoice() runs in
+ProcessPool workers (see app/utils/invoice_pdf.py), and each worker imports
+only this file.
+"""
+from __future__ import annotations
+
+import zlib
+from typing import Any, Dict, List, Tuple
+
+PAGE_W, PAGE_H = 595.0, 842.0  # A4 in points
+MARGIN = 48.0
+
+# Helvetica widths (1/1000 em) for the characters invoices mostly use; others use 556
+_HELV_WIDTHS = {
+    " ": 278, ".": 278, ",": 278, ":": 278, "/": 278, "-": 333, "(": 333, ")": 333,
+    "I": 278, "i": 222, "l": 222, "j": 222, "f": 278, "t": 278, "r": 333,
+    "m": 833, "w": 722, "M": 833, "W": 944,
+}
+
+
+def text_width(s: str, size: float) -> float:
+    return sum(_HELV_WIDTHS.get(ch, 556) for ch in s) * size / 1000.0
+
+
+def _escape(s: str) -> bytes:
+    raw = s.encode("cp1252", errors="replace")
+    return raw.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)")
+
+
+class PdfDocument:
+    def __init__(self) -> None:
+        self.pages: List[List[bytes]] = []
+        self.new_page()
+
+    def new_page(self) -> None:
+        self.pages.append([])
+
+    @property
+    def _ops(self) -> List[bytes]:
+        return self.pages[-1]
+
+    def text(self, x: float, y: float, s: str, size: float = 10, bold: bool = False) -> None:
+        font = b"/F2" if bold else b"/F1"
+        self._ops.append(b"BT %s %.1f Tf %.2f %.2f Td (%s) Tj ET" % (font, size, x, y, _escape(s)))
+
+    def text_right(self, x_right: float, y: float, s: str, size: float = 10, bold: bool = False) -> None:
+        self.text(x_right - text_width(s, size), y, s, size, bold)
+
+    def line(self, x1: float, y1: float, x2: float, y2: float, width: float = 0.5) -> None:
+        self._ops.append(b"%.2f w %.2f %.2f m %.2f %.2f l S" % (width, x1, y1, x2, y2))
+
+    def render(self) -> bytes:
+        objects: List[bytes] = []
+
+        def add(body: bytes) -> int:
+            objects.append(body)
+            return len(objects)
+
+        catalog = add(b"")  # filled in once the page tree id is known
+        pages_id = add(b"")
+        f1 = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>")
+        f2 = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold /Encoding /WinAnsiEncoding >>")
+
+        page_ids = []
+        for ops in self.pages:
+            stream = zlib.compress(b"\n".join(ops), 6)
+            content = add(b"<< /Length %d /Filter /FlateDecode >>\nstream\n%s\nendstream" % (len(stream), stream))
+            page_ids.append(
+                add(
+                    b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 %.0f %.0f] "
+                    b"/Resources << /Font << /F1 %d 0 R /F2 %d 0 R >> >> /Contents %d 0 R >>"
+                    % (pages_id, PAGE_W, PAGE_H, f1, f2, content)
+                )
+            )
+
+        objects[catalog - 1] = b"<< /Type /Catalog /Pages %d 0 R >>" % pages_id
+        kids = b" ".join(b"%d 0 R" % p for p in page_ids)
+        objects[pages_id - 1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(page_ids))
+
+        out = bytearray(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+        offsets = []
+        for i, body in enumerate(objects, start=1):
+            offsets.append(len(out))
+            out += b"%d 0 obj\n%s\nendobj\n" % (i, body)
+
+        xref = len(out)
+        out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+        for off in offsets:
+            out += b"%010d 00000 n \n" % off
+        out += b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, catalog, xref)
+        return bytes(out)
+
+
+# ---------------------------
+# Invoice layout
+# ---------------------------
+
+def _money(v: Any) -> str:
+    # Indian digit grouping: 12,34,567
+    n = int(v or 0)
+    sign, s = ("-" if n < 0 else ""), str(abs(n))
+    if len(s) > 3:
+        head, tail = s[:-3], s[-3:]
+        groups = []
+        while len(head) > 2:
+            groups.insert(0, head[-2:])
+            head = head[:-2]
+        if head:
+            groups.insert(0, head)
+        s = ",".join(groups) + "," + tail
+    return f"Rs. {sign}{s}"
+
+
+def _clip(s: Any, width: float, size: float) -> str:
+    s = str(s or "")
+    while s and text_width(s, size) > width:
+        s = s[:-1]
+    return s
+
+
+# Item table columns: (header, x, width, right-aligned)
+_COLUMNS: Tuple[Tuple[str, float, float, bool], ...] = (
+    ("#", MARGIN, 24, False),
+    ("Assignment", MARGIN + 28, 110, False),
+    ("Borrower", MARGIN + 142, 170, False),
+    ("Branch", MARGIN + 316, 120, False),
+    ("Amount", PAGE_W - MARGIN, 60, True),
+)
+
+
+def render_invoice(doc: Dict[str, Any]) -> bytes:
+    """
+    doc: plain data from app.utils.invoice_pdf.invoice_snapshot
+    (invoice fields, "bank_name", "branch_name", "items": [...]).
+    """
+    pdf = PdfDocument()
+    right = PAGE_W - MARGIN
+    y = PAGE_H - MARGIN
+
+    pdf.text(MARGIN, y - 10, "INVOICE", 20, bold=True)
+    pdf.text_right(right, y - 4, doc["invoice_number"], 12, bold=True)
+    pdf.text_right(right, y - 20, f"Issued {doc['issue_date']}", 9)
+    if (doc.get("status") or "").upper() == "PAID":
+        pdf.text_right(right, y - 36, "PAID", 12, bold=True)
+    y -= 48
+
+    pdf.text(MARGIN, y, "Bill to", 9, bold=True)
+    pdf.text(MARGIN, y - 14, doc.get("bank_name") or "", 11)
+    if doc.get("branch_name"):
+        pdf.text(MARGIN, y - 28, doc["branch_name"], 10)
+    pdf.text_right(right, y, "Period", 9, bold=True)
+    pdf.text_right(right, y - 14, f"{doc['period_from']} to {doc['period_to']}", 10)
+    y -= 52
+
+    def header(y: float) -> float:
+        for title, x, _, align_right in _COLUMNS:
+            (pdf.text_right if align_right else pdf.text)(x, y, title, 9, bold=True)
+        pdf.line(MARGIN, y - 5, right, y - 5)
+        return y - 18
+
+    y = header(y)
+    for n, item in enumerate(doc.get("items") or [], start=1):
+        if y < MARGIN + 140:
+            pdf.new_page()
+            y = header(PAGE_H - MARGIN)
+        cells = (str(n), item.get("assignment_code"), item.get("borrower_name"), item.get("branch_name"))
+        for (title, x, width, _), value in zip(_COLUMNS, cells):
+            pdf.text(x, y, _clip(value, width, 9), 9)
+        pdf.text_right(right, y, _money(item.get("amount")), 9)
+        y -= 14
+
+    pdf.line(MARGIN, y + 4, right, y + 4)
+    pdf.text(MARGIN + 316, y - 12, f"Total ({doc['item_count']} items)", 10, bold=True)
+    pdf.text_right(right, y - 12, _money(doc["total_amount"]), 10, bold=True)
+    y -= 44
+
+    payee = [
+        ("Account name", doc.get("payee_account_name")),
+        ("Account number", doc.get("payee_account_number")),
+        ("IFSC", doc.get("payee_ifsc")),
+        ("Bank", doc.get("payee_bank_name")),
+        ("Branch", doc.get("payee_branch_name")),
+        ("UPI", doc.get("payee_upi_id")),
+    ]
+    payee = [(k, v) for k, v in payee if v]
+    if payee:
+        pdf.text(MARGIN, y, "Payment details", 9, bold=True)
+        y -= 14
+        for label, value in payee:
+            pdf.text(MARGIN, y, label, 9)
+            pdf.text(MARGIN + 100, y, str(value), 9)
+            y -= 12
+    if doc.get("notes"):
+        y -= 6
+        pdf.text(MARGIN, y, _clip(doc["notes"], right - MARGIN, 9), 9)
+
+    return pdf.render()
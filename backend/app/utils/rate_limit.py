@@ -0,0 +1,321 @@
+"""
+Token-bucket rate limiting per caller and route class.
+
+Every request takes a token from the bucket for (route class, caller):
+    caller   the verified JWT subject, else "ip:<client address>"; login
+             is always keyed by IP. X-User-Email is ignored: anyone could
+             rotate it to dodge limits or send a victim's to drain theirs
+    classes  login    POST /api/auth/login (bcrypt on every attempt)
+             upload   POST /api/files/upload/...
+             export   invoice PDFs, file downloads, /uploads, /api/sync
+             search   GET with a q= filter
+             default  everything else
+An empty bucket answers 429 with Retry-After (seconds until the next token)
+before the request reaches a handler or the DB.
+
+Buckets live in the worker's memory: a dict lookup and some arithmetic on
+the event loop, about a microsecond plus the JWT check (cached per token).
+Each worker has its own buckets, so N workers allow up to N x the budget.
+With ZEN_RATE_LIMIT_SHARED=1 the classes in ZEN_RATE_LIMIT_SHARED_CLASSES
+use one bucket per key in Postgres (rate_limit_buckets, one UPSERT per
+request) instead; if that fails the local bucket is used.
+
+Env:
+    ZEN_RATE_LIMIT                  1
+    ZEN_RATE_LIMITS                 login=10/60,upload=60/60,export=30/60,search=120/60,default=600/60
+                                    <class>=<burst>/<seconds to refill>, or <class>=off
+    ZEN_RATE_LIMIT_SHARED           0
+    ZEN_RATE_LIMIT_SHARED_CLASSES   login,upload,export
+    ZEN_RATE_LIMIT_TRUST_PROXY      0     1 = client address from X-Forwarded-For
+"""
+from __future__ import annotations
+
+import logging
+import math
+import os
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from fastapi import HTTPException
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.utils.jwt import decode_token
+from app.utils.metrics import REGISTRY
+from app.utils.scheduler import register_job
+
+logger = logging.getLogger("app.rate_limit")
+
+JOB_NAME = "rate_limit_purge"
+
+ENABLED = os.getenv("ZEN_RATE_LIMIT", "1").strip().lower() in ("1", "true", "yes", "on")
+SHARED = os.getenv("ZEN_RATE_LIMIT_SHARED", "0").strip().lower() in ("1", "true", "yes", "on")
+SHARED_CLASSES = {
+    c.strip() for c in os.getenv("ZEN_RATE_LIMIT_SHARED_CLASSES", "login,upload,export").split(",") if c.strip()
+}
+TRUST_PROXY = os.getenv("ZEN_RATE_LIMIT_TRUST_PROXY", "0").strip().lower() in ("1", "true", "yes", "on")
+
+DEFAULT_LIMITS = "login=10/60,upload=60/60,export=30/60,search=120/60,default=600/60"
+
+EXEMPT_PATHS = {"/api/health", "/api/metrics"}
+
+# Local buckets / cached JWT subjects kept per worker before idle ones are dropped
+MAX_BUCKETS = 50_000
+MAX_SUBJECTS = 10_000
+
+RATE_LIMITED = REGISTRY.counter("zen_rate_limited_total", "Requests rejected with 429", ["route_class"])
+
+
+@dataclass(frozen=True)
+class Limit:
+    burst: int
+    period: float
+
+    @property
+    def rate(self) -> float:
+        """Tokens per second."""
+        return self.burst / self.period
+
+
+def parse_limits(spec: str) -> Dict[str, Optional[Limit]]:
+    """"login=10/60,search=off" -> {"login": Limit(10, 60), "search": None}."""
+    limits: Dict[str, Optional[Limit]] = {}
+    for part in spec.split(","):
+        name, _, value = part.strip().partition("=")
+        if not name:
+            continue
+        value = value.strip().lower()
+        if value == "off":
+            limits[name.strip()] = None
+            continue
+        burst, _, period = value.partition("/")
+        try:
+            limit = Limit(int(burst), float(period or 60))
+        except ValueError:
+            raise ValueError(f"ZEN_RATE_LIMITS: bad entry {part.strip()!r} (want <class>=<burst>/<seconds>)")
+        if limit.burst < 1 or limit.period <= 0:
+            raise ValueError(f"ZEN_RATE_LIMITS: bad entry {part.strip()!r} (want <class>=<burst>/<seconds>)")
+        limits[name.strip()] = limit
+    return limits
+
+
+LIMITS = {**parse_limits(DEFAULT_LIMITS), **parse_limits(os.getenv("ZEN_RATE_LIMITS", ""))}
+
+
+def route_class(method: str, path: str, query: bytes) -> str:
+    if path.startswith("/api/auth/login"):
+        return "login"
+    if path.startswith("/api/files/upload/") and method == "POST":
+        return "upload"
+    if path.startswith(("/api/files/download/", "/uploads/", "/api/sync/")) or (
+        path.startswith("/api/invoices/") and path.endswith(("/pdf", "/pdf-batch"))
+    ):
+        return "export"
+    if method == "GET" and (query.startswith(b"q=") or b"&q=" in query):
+        return "search"
+    return "default"
+
+
+# ---------------------------
+# Callers
+# ---------------------------
+
+# bearer token -> (subject, exp); saves a JWT verification on every request
+_subjects: Dict[str, Tuple[str, float]] = {}
+
+
+def _header(scope: Scope, name: bytes) -> Optional[str]:
+    for k, v in scope["headers"]:
+        if k == name:
+            return v.decode("latin-1")
+    return None
+
+
+def _client_ip(scope: Scope) -> str:
+    if TRUST_PROXY:
+        forwarded = _header(scope, b"x-forwarded-for")
+        if forwarded:
+            # The last hop is the address our proxy saw; earlier ones are client-supplied
+            return forwarded.rsplit(",", 1)[-1].strip()
+    client = scope.get("client")
+    return client[0] if client else "unknown"
+
+
+def _subject(scope: Scope) -> Optional[str]:
+    """Subject of a valid bearer token; None for anything unverified."""
+    auth = _header(scope, b"authorization") or ""
+    if auth[:7].lower() != "bearer ":
+        return None
+    token = auth[7:].strip()
+    cached = _subjects.get(token)
+    if cached is not None and cached[1] > time.time():
+        return cached[0]
+    try:
+        payload = decode_token(token)
+    except HTTPException:
+        return None
+    sub = str(payload.get("sub") or "").strip().lower()
+    if not sub:
+        return None
+    if len(_subjects) >= MAX_SUBJECTS:
+        _subjects.clear()
+    _subjects[token] = (sub, float(payload.get("exp") or math.inf))
+    return sub
+
+
+def caller_key(scope: Scope, route: str) -> str:
+    subject = None if route == "login" else _subject(scope)
+    return f"{route}:{subject}" if subject else f"{route}:ip:{_client_ip(scope)}"
+
+
+# ---------------------------
+# Buckets
+# ---------------------------
+
+class TokenBuckets:
+    """
+    In-process buckets: key -> [tokens, last refill (monotonic)].
+    Only touched from the event loop, so no lock.
+    """
+
+    def __init__(self, max_buckets: int = MAX_BUCKETS) -> None:
+        self._buckets: Dict[str, List[float]] = {}
+        self.max_buckets = max_buckets
+
+    def take(self, key: str, limit: Limit, now: float) -> float:
+        """Take one token: 0 if allowed, else seconds until one is available."""
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            if len(self._buckets) >= self.max_buckets:
+                self._sweep(now)
+            self._buckets[key] = [limit.burst - 1.0, now]
+            return 0.0
+
+        tokens = min(float(limit.burst), bucket[0] + (now - bucket[1]) * limit.rate)
+        bucket[1] = now
+        if tokens >= 1.0:
+            bucket[0] = tokens - 1.0
+            return 0.0
+        bucket[0] = tokens
+        return (1.0 - tokens) / limit.rate
+
+    def _sweep(self, now: float) -> None:
+        # Buckets idle for the longest period are full again: same as absent
+        idle = max((lim.period for lim in LIMITS.values() if lim is not None), default=60.0)
+        for key in [k for k, b in self._buckets.items() if now - b[1] >= idle]:
+            del self._buckets[key]
+        if len(self._buckets) >= self.max_buckets:
+            self._buckets.clear()
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+
+buckets = TokenBuckets()
+
+REGISTRY.gauge("zen_rate_limit_buckets", "In-process rate limit buckets", [], lambda: [((), len(buckets))])
+
+
+# Refill and take in one statement; no row comes back when the bucket is empty
+_TAKE_SQL = text(
+    """
+INSERT INTO rate_limit_buckets AS b (key, tokens, updated_at)
+VALUES (:key, :burst - 1, timezone('UTC', clock_timestamp()))
+ON CONFLICT (key) DO UPDATE SET
+    tokens = LEAST(:burst, b.tokens + EXTRACT(EPOCH FROM timezone('UTC', clock_timestamp()) - b.updated_at) * :rate) - 1,
+    updated_at = timezone('UTC', clock_timestamp())
+WHERE LEAST(:burst, b.tokens + EXTRACT(EPOCH FROM timezone('UTC', clock_timestamp()) - b.updated_at) * :rate) >= 1
+RETURNING tokens
+"""
+)
+
+_PEEK_SQL = text(
+    "SELECT LEAST(:burst, tokens + EXTRACT(EPOCH FROM timezone('UTC', clock_timestamp()) - updated_at) * :rate) "
+    "FROM rate_limit_buckets WHERE key = :key"
+)
+
+
+def take_shared(key: str, limit: Limit) -> float:
+    """take() against rate_limit_buckets (blocking; call from a thread)."""
+    from app.db import engine
+
+    params = {"key": key, "burst": limit.burst, "rate": limit.rate}
+    with engine.begin() as conn:
+        if conn.execute(_TAKE_SQL, params).first() is not None:
+            return 0.0
+        tokens = conn.execute(_PEEK_SQL, params).scalar()
+    # Row purged, or refilled since the UPSERT: still denied, retry shortly
+    if tokens is None or tokens >= 1:
+        return 1.0 / limit.rate
+    return (1.0 - float(tokens)) / limit.rate
+
+
+# ---------------------------
+# Middleware
+# ---------------------------
+
+class RateLimitMiddleware:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] == "OPTIONS" or scope["path"] in EXEMPT_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        route = route_class(scope["method"], scope["path"], scope["query_string"])
+        limit = LIMITS.get(route, LIMITS.get("default"))
+        if limit is None:
+            await self.app(scope, receive, send)
+            return
+
+        key = caller_key(scope, route)
+        wait = 0.0
+        if SHARED and route in SHARED_CLASSES:
+            try:
+                wait = await run_in_threadpool(take_shared, key, limit)
+            except SQLAlchemyError as e:
+                logger.warning("Shared rate limit unavailable, using local bucket: %r", e)
+                wait = buckets.take(key, limit, time.monotonic())
+        else:
+            wait = buckets.take(key, limit, time.monotonic())
+
+        if wait:
+            RATE_LIMITED.inc(route_class=route)
+            response = ORJSONResponse(
+                {"detail": "Too many requests, retry later"},
+                status_code=429,
+                headers={"Retry-After": str(max(1, math.ceil(wait)))},
+            )
+            await response(scope, receive, send)
+            return
+
+        await self.app(scope, receive, send)
+
+
+# ---------------------------
+# Cleanup (shared buckets)
+# ---------------------------
+
+def purge_idle(db: Session) -> Dict[str, int]:
+    """Drop shared buckets idle long enough to have refilled (same as no row)."""
+    idle = max((lim.period for lim in LIMITS.values() if lim is not None), default=60.0)
+    n = db.execute(
+        text(
+            "DELETE FROM rate_limit_buckets "
+            "WHERE updated_at < timezone('UTC', clock_timestamp()) - make_interval(secs => :idle)"
+        ),
+        {"idle": idle},
+    ).rowcount
+    db.commit()
+    return {"deleted": n}
+
+
+def register() -> None:
+    if ENABLED and SHARED:
+        register_job(JOB_NAME, purge_idle, 3600.0)
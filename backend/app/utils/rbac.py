@@ -2,13 +2,20 @@ from sqlalchemy.orm import Session
 from sqlalchemy import func
 
 from app.models.rbac import Role, Permission, RolePermission
+from app.utils.cache import invalidate, register_namespace
+
+# Looked up on every require_permission() check; invalidated by RBAC writers
+PERMISSIONS_CACHE = register_namespace("rbac.permissions", ttl=300, max_entries=64)
 
 
 def get_permissions_for_role(db: Session, role_name: str) -> list[str]:
     role_name = (role_name or "").strip().upper()
     if not role_name:
         return []
+    return list(PERMISSIONS_CACHE.get_or_load(role_name, lambda: tuple(_load_permissions(db, role_name))))
+
 
+def _load_permissions(db: Session, role_name: str) -> list[str]:
     # ADMIN gets everything (strong default)
     if role_name == "ADMIN":
         rows = db.query(Permission.code).all()
@@ -82,4 +89,5 @@ def seed_rbac_if_empty(db: Session) -> None:
     grant("OPS_MANAGER", ["assignments.read", "assignments.create", "assignments.update", "masterdata.edit"])
     grant("EMPLOYEE", ["assignments.read"])
 
-    db.commit()
\ No newline at end of file
+    invalidate(db, "rbac.permissions")
+    db.commit()
@@ -0,0 +1,104 @@
+"""
+Read-your-writes guard for replica routing.
+
+After a user's successful write (POST/PUT/PATCH/DELETE) they are pinned to the
+primary for ZEN_REPLICA_PIN_SECONDS, so the next list/summary they load cannot
+come from a replica that has not replayed their change yet.
+
+The user's next request may land on any worker (or host), so the writing
+worker also publishes the pin with pg_notify(ZEN_PINS_CHANNEL, subject)
+before its response goes out; every worker's LISTEN connection
+(app/utils/broadcast.py) records it. While a worker's listener is down it
+can't see other workers' pins, so it sends every read to the primary.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+from fastapi import HTTPException
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+from starlette.requests import Request
+
+from app.utils.broadcast import add_channel
+from app.utils.jwt import decode_token
+
+logger = logging.getLogger("app.read_routing")
+
+PIN_SECONDS = float(os.getenv("ZEN_REPLICA_PIN_SECONDS", "5"))
+CHANNEL = os.getenv("ZEN_PINS_CHANNEL", "zen_pins").strip() or "zen_pins"
+WRITE_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+
+_pins: Dict[str, float] = {}
+_lock = threading.Lock()
+
+
+def request_subject(request: Request) -> Optional[str]:
+    """Identify the caller the same way get_current_user does (JWT sub, else X-User-Email)."""
+    auth = request.headers.get("authorization") or ""
+    if auth.lower().startswith("bearer "):
+        try:
+            sub = (decode_token(auth[7:].strip()).get("sub") or "").strip().lower()
+            return sub or None
+        except HTTPException:
+            return None
+
+    email = (request.headers.get("x-user-email") or "").strip().lower()
+    return email or None
+
+
+def pin_to_primary(subject: str) -> None:
+    with _lock:
+        _pins[subject] = time.monotonic() + PIN_SECONDS
+        # Opportunistic cleanup so the map never grows without bound
+        if len(_pins) > 10_000:
+            now = time.monotonic()
+            for k in [k for k, v in _pins.items() if v <= now]:
+                _pins.pop(k, None)
+
+
+def is_pinned(subject: Optional[str]) -> bool:
+    if not subject:
+        return False
+    until = _pins.get(subject)
+    return until is not None and until > time.monotonic()
+
+
+def publish_pin(subject: str) -> None:
+    """Pin `subject` on every worker (blocking; call from a thread)."""
+    from app.db import engine
+
+    try:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT pg_notify(:channel, :subject)"), {"channel": CHANNEL, "subject": subject})
+            conn.commit()
+    except SQLAlchemyError as e:
+        # The write itself succeeded; other workers just won't know to skip the replica
+        logger.warning("Could not publish replica pin: %r", e)
+
+
+class _Bus:
+    live = False
+
+
+_bus = _Bus()
+
+
+def _on_connect(reconnect: bool) -> None:
+    _bus.live = True
+
+
+def _on_disconnect() -> None:
+    _bus.live = False
+
+
+add_channel(CHANNEL, pin_to_primary, on_connect=_on_connect, on_disconnect=_on_disconnect)
+
+
+def should_use_primary(request: Request) -> bool:
+    # Without the listener, pins set by other workers are invisible
+    return not _bus.live or is_pinned(request_subject(request))
@@ -0,0 +1,189 @@
+"""
+Due-date reminders for open assignments.
+
+Rules (all restricted to open statuses):
+    REPORT_DUE_SOON       report_due_date in [today, today + ZEN_REMINDER_LEAD_DAYS]
+    REPORT_OVERDUE        report_due_date in [today - ZEN_OVERDUE_LOOKBACK_DAYS, today - 1]
+    SITE_VISIT_UPCOMING   site_visit_date in [today, today + 1]
+
+Each rule stores a watermark in scheduler_state:
+    through        last date already scanned; the next run only scans
+                   (through, window end], so it touches new days only
+    changed_since  rows edited after this instant are re-checked against the
+                   whole window (a due date moved into the window, a status
+                   reopened, ...)
+
+Both passes walk the date index in keyset batches, and every batch is one
+INSERT ... ON CONFLICT DO NOTHING, so overlap between passes (or a crashed
+run being repeated) never produces duplicates. Newly created reminders also
+become bell notifications for the assignee in the same transaction.
+
+Runs from the in-process scheduler (app/utils/scheduler.py), or once by hand:
+    python -m app.utils.reminders
+
+Env:
+    ZEN_REMINDER_INTERVAL_SECONDS  300
+    ZEN_REMINDER_LEAD_DAYS         2
+    ZEN_OVERDUE_LOOKBACK_DAYS      30
+    ZEN_REMINDER_BATCH_SIZE        1000
+"""
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from sqlalchemy import and_, select, text, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.models.assignment import OPEN_STATUS_SQL, Assignment
+from app.models.reminder import Reminder
+from app.utils.metrics import REGISTRY
+from app.utils.notifications import notify_many
+from app.utils.scheduler import load_state, register_job, run_job, save_state
+
+JOB_NAME = "due_reminders"
+
+INTERVAL_SECONDS = float(os.getenv("ZEN_REMINDER_INTERVAL_SECONDS", "300"))
+LEAD_DAYS = int(os.getenv("ZEN_REMINDER_LEAD_DAYS", "2"))
+OVERDUE_LOOKBACK_DAYS = int(os.getenv("ZEN_OVERDUE_LOOKBACK_DAYS", "30"))
+BATCH_SIZE = int(os.getenv("ZEN_REMINDER_BATCH_SIZE", "1000"))
+
+# Transactions that started before a run but committed after it can carry an
+# older updated_at; re-check that much history on the next run.
+CHANGE_OVERLAP = timedelta(minutes=2)
+
+REMINDERS_CREATED = REGISTRY.counter("zen_reminders_created_total", "Reminders generated", ["kind"])
+
+
+@dataclass(frozen=True)
+class Rule:
+    kind: str
+    column: Any
+    window: Callable[[date], Tuple[date, date]]
+
+
+RULES = (
+    Rule("REPORT_DUE_SOON", Assignment.report_due_date, lambda d: (d, d + timedelta(days=LEAD_DAYS))),
+    Rule(
+        "REPORT_OVERDUE",
+        Assignment.report_due_date,
+        lambda d: (d - timedelta(days=OVERDUE_LOOKBACK_DAYS), d - timedelta(days=1)),
+    ),
+    Rule("SITE_VISIT_UPCOMING", Assignment.site_visit_date, lambda d: (d, d + timedelta(days=1))),
+)
+
+
+def _emit(db: Session, rule: Rule, condition) -> int:
+    """Insert reminders for open assignments matching condition, BATCH_SIZE rows at a time."""
+    col = rule.column
+    created = 0
+    last: Optional[tuple] = None
+
+    while True:
+        q = (
+            select(Assignment.id, Assignment.assigned_to_user_id, col)
+            .where(text(OPEN_STATUS_SQL), condition)
+            .order_by(col, Assignment.id)
+            .limit(BATCH_SIZE)
+        )
+        if last is not None:
+            q = q.where(tuple_(col, Assignment.id) > tuple_(*last))
+        rows = db.execute(q).all()
+        if not rows:
+            break
+
+        stmt = (
+            pg_insert(Reminder)
+            .values(
+                [
+                    {"assignment_id": aid, "user_id": uid, "kind": rule.kind, "target_date": target}
+                    for aid, uid, target in rows
+                ]
+            )
+            .on_conflict_do_nothing(constraint="uq_reminder_assignment_kind_date")
+            .returning(Reminder.assignment_id, Reminder.user_id, Reminder.target_date)
+        )
+        inserted = db.execute(stmt).all()
+
+        # Bell entries for the assignees, in the same transaction as the reminders
+        notify_many(
+            db,
+            [
+                {
+                    "user_id": uid,
+                    "type": rule.kind,
+                    "assignment_id": aid,
+                    "payload": {"target_date": target.isoformat()},
+                }
+                for aid, uid, target in inserted
+            ],
+            commit=False,
+        )
+        db.commit()
+        created += len(inserted)
+
+        last = (rows[-1][2], rows[-1][0])
+        if len(rows) < BATCH_SIZE:
+            break
+
+    return created
+
+
+def scan_due_dates(db: Session, today: Optional[date] = None) -> Dict[str, int]:
+    """One incremental pass over every rule. Returns reminders created per kind."""
+    today = today or date.today()
+    run_started = datetime.utcnow()
+    state = load_state(db, JOB_NAME)
+    counts: Dict[str, int] = {}
+
+    for rule in RULES:
+        lo, hi = rule.window(today)
+        mark = state.get(rule.kind) or {}
+        through = date.fromisoformat(mark["through"]) if mark.get("through") else None
+        changed_since = datetime.fromisoformat(mark["changed_since"]) if mark.get("changed_since") else None
+
+        created = 0
+        start = max(lo, through + timedelta(days=1)) if through else lo
+        if start <= hi:
+            created += _emit(db, rule, rule.column.between(start, hi))
+        if changed_since is not None:
+            created += _emit(
+                db,
+                rule,
+                and_(
+                    Assignment.updated_at > changed_since,
+                    rule.column.between(lo, hi),
+                ),
+            )
+
+        state[rule.kind] = {
+            "through": max(hi, through).isoformat() if through else hi.isoformat(),
+            "changed_since": (run_started - CHANGE_OVERLAP).isoformat(),
+        }
+        save_state(db, JOB_NAME, state)
+
+        counts[rule.kind] = created
+        if created:
+            REMINDERS_CREATED.inc(created, kind=rule.kind)
+
+    return counts
+
+
+def register() -> None:
+    register_job(JOB_NAME, scan_due_dates, INTERVAL_SECONDS)
+
+
+def main() -> None:
+    register()
+    result = run_job(JOB_NAME)
+    if result is None:
+        print("[REMINDERS] another worker holds the lock; nothing done")
+    else:
+        print(f"[REMINDERS] created {result}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""
+In-process periodic jobs with Postgres advisory-lock leader election.
+
+Every worker process runs the same loop (started from app startup). On each
+tick a job first tries pg_try_advisory_lock(<job key>) on a dedicated
+connection: only the worker that gets the lock runs the job, the others skip
+that tick. The lock is released when the run ends, or by Postgres if the
+worker dies mid-run, so there is no stale leader to clean up.
+
+Jobs keep their progress (watermarks) in scheduler_state, so whichever worker
+wins the next tick continues where the previous run stopped.
+
+Env:
+    ZEN_SCHEDULER_ENABLED   1 (set 0 to run jobs only via their CLI / cron)
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import os
+import random
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.db import engine
+from app.models.reminder import SchedulerState
+from app.utils.metrics import REGISTRY
+
+logger = logging.getLogger("app.scheduler")
+
+ENABLED = os.getenv("ZEN_SCHEDULER_ENABLED", "1").strip().lower() in ("1", "true", "yes", "on")
+
+JOB_RUNS = REGISTRY.counter(
+    "zen_scheduler_runs_total", "Scheduler ticks per job and outcome (ran/skipped/failed)", ["job", "outcome"]
+)
+JOB_SECONDS = REGISTRY.histogram("zen_scheduler_run_seconds", "Scheduler job run time", ["job"])
+
+
+@dataclass
+class Job:
+    name: str
+    fn: Callable[[Session], Dict[str, Any]]
+    interval: float
+
+
+_jobs: Dict[str, Job] = {}
+_task: Optional[asyncio.Task] = None
+
+
+def register_job(name: str, fn: Callable[[Session], Dict[str, Any]], interval: float) -> None:
+    _jobs[name] = Job(name=name, fn=fn, interval=interval)
+
+
+def advisory_key(name: str) -> int:
+    """Stable signed 64-bit lock key for a job name."""
+    return int.from_bytes(hashlib.sha1(f"zen:{name}".encode()).digest()[:8], "big", signed=True)
+
+
+# ---------------------------
+# Watermarks
+# ---------------------------
+
+def load_state(db: Session, name: str) -> Dict[str, Any]:
+    row = db.get(SchedulerState, name)
+    return dict(row.state or {}) if row else {}
+
+
+def save_state(db: Session, name: str, state: Dict[str, Any]) -> None:
+    stmt = pg_insert(SchedulerState).values(name=name, state=state, updated_at=datetime.utcnow())
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[SchedulerState.name],
+        set_={"state": stmt.excluded.state, "updated_at": stmt.excluded.updated_at},
+    )
+    db.execute(stmt)
+    db.commit()
+
+
+# ---------------------------
+# Running
+# ---------------------------
+
+def run_job(name: str) -> Optional[Dict[str, Any]]:
+    """
+    Run one job if this process wins its advisory lock.
+    Returns the job's result, or None if another worker holds the lock.
+    """
+    job = _jobs[name]
+    key = advisory_key(name)
+
+    with engine.connect() as conn:
+        got = conn.execute(text("SELECT pg_try_advisory_lock(:k)"), {"k": key}).scalar()
+        conn.commit()
+        if not got:
+            JOB_RUNS.inc(job=name, outcome="skipped")
+            return None
+
+        t0 = time.perf_counter()
+        try:
+            with Session(bind=conn) as db:
+                result = job.fn(db)
+            JOB_RUNS.inc(job=name, outcome="ran")
+            return result
+        except Exception:
+            JOB_RUNS.inc(job=name, outcome="failed")
+            raise
+        finally:
+            JOB_SECONDS.observe(time.perf_counter() - t0, job=name)
+            conn.rollback()
+            conn.execute(text("SELECT pg_advisory_unlock(:k)"), {"k": key})
+            conn.commit()
+
+
+async def _loop() -> None:
+    # Stagger workers so they don't all hit the lock at the same instant
+    await asyncio.sleep(random.uniform(1.0, 10.0))
+    next_run = {name: 0.0 for name in _jobs}
+
+    while True:
+        now = time.monotonic()
+        for name, job in list(_jobs.items()):
+            if now < next_run.get(name, 0.0):
+                continue
+            next_run[name] = now + job.interval
+            try:
+                result = await asyncio.to_thread(run_job, name)
+                if result:
+                    print(f"[SCHEDULER] {name}: {result}")
+            except Exception:
+                logger.exception("Scheduler job %s failed", name)
+
+        wait = min(next_run.values(), default=now + 60.0) - time.monotonic()
+        await asyncio.sleep(max(1.0, wait))
+
+
+def start_scheduler() -> None:
+    """Start the loop on the running event loop (call from an async startup hook)."""
+    global _task
+    if not ENABLED or not _jobs or _task is not None:
+        return
+    _task = asyncio.get_running_loop().create_task(_loop())
+
+
+async def stop_scheduler() -> None:
+    global _task
+    if _task is None:
+        return
+    _task.cancel()
+    try:
+        await _task
+    except asyncio.CancelledError:
+        pass
+    _task = None
@@ -0,0 +1,163 @@
+"""
+Per-request SQL instrumentation + N+1 detector.
+
+SQLAlchemy cursor events (on every Engine, sync and async) add each statement
+to the current request's RequestSQLStats, found through a ContextVar set by
+`sql_stats_middleware`. Starlette copies the context into its thread pool,
+so sync handlers record into the same object.
+
+Per route (template path, e.g. /api/assignments/{assignment_id}) on /api/metrics:
+    zen_http_request_seconds        request latency
+    zen_http_request_db_queries     statements per request
+    zen_http_request_db_seconds     time spent in the DB per request
+    zen_sql_n_plus_one_total        requests where one statement shape repeated > threshold
+
+With ZEN_DEBUG=1 every response also carries:
+    X-DB-Query-Count, X-DB-Time-Ms, X-DB-Max-Repeat
+"""
+from __future__ import annotations
+
+import logging
+import os
+import re
+import time
+from collections import Counter as _Counter
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.requests import Request
+
+from app.utils.metrics import REGISTRY
+
+logger = logging.getLogger("app.sql")
+
+DEBUG_HEADERS = os.getenv("ZEN_DEBUG", "0").strip().lower() in ("1", "true", "yes", "on")
+N_PLUS_ONE_THRESHOLD = int(os.getenv("ZEN_N_PLUS_ONE_THRESHOLD", "10"))
+
+REQUEST_SECONDS = REGISTRY.histogram(
+    "zen_http_request_seconds", "HTTP request latency", ["method", "route"]
+)
+REQUEST_DB_QUERIES = REGISTRY.histogram(
+    "zen_http_request_db_queries",
+    "SQL statements executed per request",
+    ["method", "route"],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 50, 100, 250),
+)
+REQUEST_DB_SECONDS = REGISTRY.histogram(
+    "zen_http_request_db_seconds", "Time spent in SQL per request", ["method", "route"]
+)
+N_PLUS_ONE = REGISTRY.counter(
+    "zen_sql_n_plus_one_total",
+    "Requests where one statement shape repeated beyond the threshold",
+    ["method", "route"],
+)
+
+# "IN (%(id_1)s, %(id_2)s, ...)" / "IN ($1, $2, ...)" -> "IN (?)"
+_PARAM_LIST = re.compile(r"\(\s*(?:%\(\w+\)s|\$\d+|\?)(?:\s*,\s*(?:%\(\w+\)s|\$\d+|\?))*\s*\)")
+_WS = re.compile(r"\s+")
+
+
+def statement_shape(sql: str) -> str:
+    """Parameterised SQL with whitespace and IN-lists collapsed, so repeats compare equal."""
+    return _PARAM_LIST.sub("(?)", _WS.sub(" ", sql).strip())
+
+
+class RequestSQLStats:
+    __slots__ = ("count", "seconds", "shapes")
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.shapes: _Counter = _Counter()
+
+    def record(self, sql: str, elapsed: float) -> None:
+        self.count += 1
+        self.seconds += elapsed
+        self.shapes[statement_shape(sql)] += 1
+
+    def worst_repeat(self) -> tuple[Optional[str], int]:
+        if not self.shapes:
+            return None, 0
+        return self.shapes.most_common(1)[0]
+
+
+_current: ContextVar[Optional[RequestSQLStats]] = ContextVar("zen_request_sql_stats", default=None)
+
+
+def current_sql_stats() -> Optional[RequestSQLStats]:
+    return _current.get()
+
+
+# ---------------------------
+# SQLAlchemy hooks
+# ---------------------------
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("zen_query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get("zen_query_start")
+    if not starts:
+        return
+    elapsed = time.perf_counter() - starts.pop()
+    stats = _current.get()
+    if stats is not None:
+        stats.record(statement, elapsed)
+
+
+_installed = False
+
+
+def install_sql_instrumentation() -> None:
+    """Attach cursor hooks to every Engine (idempotent)."""
+    global _installed
+    if _installed:
+        return
+    event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+    _installed = True
+
+
+# ---------------------------
+# Middleware
+# ---------------------------
+
+def _route_label(request: Request) -> str:
+    route = request.scope.get("route")
+    return getattr(route, "path", None) or "<unmatched>"
+
+
+async def sql_stats_middleware(request: Request, call_next):
+    stats = RequestSQLStats()
+    token = _current.set(stats)
+    t0 = time.perf_counter()
+    try:
+        response = await call_next(request)
+    finally:
+        _current.reset(token)
+
+    elapsed = time.perf_counter() - t0
+    method = request.method
+    route = _route_label(request)
+
+    REQUEST_SECONDS.observe(elapsed, method=method, route=route)
+    REQUEST_DB_QUERIES.observe(stats.count, method=method, route=route)
+    REQUEST_DB_SECONDS.observe(stats.seconds, method=method, route=route)
+
+    shape, repeats = stats.worst_repeat()
+    if repeats > N_PLUS_ONE_THRESHOLD:
+        N_PLUS_ONE.inc(method=method, route=route)
+        logger.warning(
+            "Possible N+1: %s %s ran one statement %d times (%d queries total): %s",
+            method, route, repeats, stats.count, (shape or "")[:300],
+        )
+
+    if DEBUG_HEADERS:
+        response.headers["X-DB-Query-Count"] = str(stats.count)
+        response.headers["X-DB-Time-Ms"] = f"{stats.seconds * 1000:.2f}"
+        response.headers["X-DB-Max-Repeat"] = str(repeats)
+
+    return response
@@ -0,0 +1,163 @@
+"""
+Delta sync for offline (PWA) clients: GET /api/sync/changes?since=<token>.
+
+Every synced table carries change_xid, which the zen_sync_stamp() trigger sets
+to the id of the transaction that last inserted or updated the row. Deletes
+leave a row in sync_tombstones (zen_sync_tombstone() trigger). A token is a
+position in transaction-id order:
+
+    window     [since, upto), where upto = xmin of the current snapshot when
+               the window opens. Every transaction below xmin has finished,
+               so nothing can commit into a window after it was served. With
+               updated_at or a plain sequence, a slow transaction could commit
+               a value below what a client already synced past.
+    pages      tables in a fixed order (master data, assignments, files,
+               activities, then tombstones), each walked by (change_xid, id)
+               on ix_<table>_change_xid; the token carries the position
+    caught up  has_more = false; the next token starts the next window at upto
+
+A row changed again mid-sync moves past upto and arrives in the next window,
+so a client can see a row twice but never misses one. Rows that existed
+before the migration have change_xid 0: they come with a full sync (no
+token) and never again until they change.
+
+Archiving an activities partition (app/utils/activity_archive.py) writes
+tombstones for its rows, so clients drop archived activities too.
+
+Tombstones are kept ZEN_SYNC_TOMBSTONE_DAYS (30). A token older than the
+purged range gets 410 Gone and the client starts over without a token.
+"""
+from __future__ import annotations
+
+import os
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import select, text, tuple_
+from sqlalchemy.orm import Session
+
+from app.models.activity import Activity
+from app.models.assignment import Assignment
+from app.models.file import File
+from app.models.master_data import Bank, Branch, Client, PropertyType
+from app.models.sync import SyncTombstone
+from app.utils.pagination import decode_sync_token, encode_sync_token
+from app.utils.scheduler import load_state, register_job, save_state
+
+JOB_NAME = "sync_tombstone_purge"
+
+TOMBSTONE_DAYS = float(os.getenv("ZEN_SYNC_TOMBSTONE_DAYS", "30"))
+PURGE_INTERVAL_SECONDS = 3600.0
+
+# Parents before children, so a client can apply each page in order
+TABLES = [
+    ("banks", Bank),
+    ("branches", Branch),
+    ("clients", Client),
+    ("property_types", PropertyType),
+    ("assignments", Assignment),
+    ("files", File),
+    ("activities", Activity),
+]
+TOMBSTONE_STAGE = len(TABLES)
+
+
+def _columns(model) -> list:
+    return [c for c in model.__table__.columns if c.key != "change_xid"]
+
+
+def snapshot_xmin(db: Session) -> int:
+    """Oldest transaction id still running; everything below it has finished."""
+    return db.execute(text("SELECT pg_snapshot_xmin(pg_current_snapshot())::text::bigint")).scalar()
+
+
+def _page(
+    db: Session,
+    stage: int,
+    since: int,
+    upto: int,
+    after: Optional[Tuple[int, int]],
+    limit: int,
+) -> Tuple[List[Dict[str, Any]], Optional[Tuple[int, int]]]:
+    """Up to `limit` changes of one table, plus the keyset position of the last one."""
+    if stage == TOMBSTONE_STAGE:
+        model = SyncTombstone
+        stmt = select(SyncTombstone.table_name, SyncTombstone.row_id)
+    else:
+        name, model = TABLES[stage]
+        stmt = select(*_columns(model))
+
+    stmt = stmt.add_columns(model.change_xid.label("_xid"), model.id.label("_id")).where(
+        model.change_xid >= since, model.change_xid < upto
+    )
+    if after is not None:
+        stmt = stmt.where(tuple_(model.change_xid, model.id) > tuple_(*after))
+    rows = db.execute(stmt.order_by(model.change_xid, model.id).limit(limit)).all()
+    if not rows:
+        return [], None
+
+    out = []
+    for r in rows:
+        d = r._asdict()
+        del d["_xid"], d["_id"]
+        if stage == TOMBSTONE_STAGE:
+            out.append({"table": d["table_name"], "op": "delete", "id": d["row_id"]})
+        else:
+            out.append({"table": name, "op": "upsert", "row": d})
+    return out, (rows[-1]._xid, rows[-1]._id)
+
+
+def changes(db: Session, token: Optional[str], limit: int) -> Dict[str, Any]:
+    """One page of changes since `token` (none = everything) and the token for the next call."""
+    since, upto, stage, after = decode_sync_token(token)
+
+    purged_below = load_state(db, JOB_NAME).get("purged_below_xid", 0)
+    if since and since < purged_below:
+        raise HTTPException(status_code=410, detail="Sync token expired; sync again without a token")
+
+    if upto is None:
+        upto = max(snapshot_xmin(db), since)
+
+    out: List[Dict[str, Any]] = []
+    while stage <= TOMBSTONE_STAGE:
+        # A full sync starts from nothing, so it has nothing to delete
+        if stage == TOMBSTONE_STAGE and not since:
+            stage += 1
+            continue
+        want = limit - len(out)
+        page, last = _page(db, stage, since, upto, after, want)
+        out.extend(page)
+        if len(page) == want:
+            after = last
+            break
+        stage, after = stage + 1, None
+
+    if stage > TOMBSTONE_STAGE:
+        return {"changes": out, "next_token": encode_sync_token(upto), "has_more": False}
+    return {"changes": out, "next_token": encode_sync_token(since, upto, stage, after), "has_more": True}
+
+
+# ---------------------------
+# Tombstone cleanup
+# ---------------------------
+
+def purge_tombstones(db: Session) -> Dict[str, Any]:
+    """Drop old tombstones and remember the purged xid range (tokens before it get 410)."""
+    cutoff = datetime.utcnow() - timedelta(days=TOMBSTONE_DAYS)
+    xid = db.execute(
+        text("SELECT max(change_xid) FROM sync_tombstones WHERE deleted_at < :cutoff"),
+        {"cutoff": cutoff},
+    ).scalar()
+    if xid is None:
+        return {"deleted": 0}
+
+    n = db.execute(text("DELETE FROM sync_tombstones WHERE change_xid <= :xid"), {"xid": xid}).rowcount
+    state = load_state(db, JOB_NAME)
+    state["purged_below_xid"] = max(state.get("purged_below_xid", 0), xid + 1)
+    save_state(db, JOB_NAME, state)  # commits the delete too
+    return {"deleted": n}
+
+
+def register() -> None:
+    register_job(JOB_NAME, purge_tombstones, PURGE_INTERVAL_SECONDS)
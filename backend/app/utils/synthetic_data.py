@@ -0,0 +1,542 @@
+"""
+Synthetic data generator for scale testing.
+
+Bulk-loads realistic-looking data with COPY:
+  - a few large banks and a long tail of small ones (Zipf), branches per bank
+    in proportion, and a few busy branches per bank
+  - assignments spread over several years with year-on-year growth, coded
+    VAL/<year>/NNNN per year in creation order
+  - status histories (PENDING -> SITE_VISIT -> UNDER_PROCESS -> SUBMITTED ->
+    COMPLETED, a few CANCELLED) recorded as STATUS_CHANGED activities
+  - file rows with matching FILE_UPLOADED activities, plus ASSIGNMENT_UPDATED
+    noise up to the requested activity volume
+
+The output is deterministic for a given --random-seed and --end-date. Ids are assigned
+client-side (continuing each table's sequence) so FKs resolve without
+round-trips. Run it against a quiet database.
+
+Usage (from backend/, DB migrated):
+    python -m app.utils.synthetic_data --assignments 1000000 --activities 10000000
+    python -m app.utils.synthetic_data --truncate --random-seed 7 --years 5
+    python -m app.utils.synthetic_data --banks 5 --branches 50 --assignments 2000 --activities 10000 --files 1000
+
+Banks, branches and assignments must be empty (or pass --truncate, which
+wipes the data tables; users are kept). File rows point at uploads/synthetic/,
+which is not written to disk.
+"""
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import random
+import time
+from bisect import bisect
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from itertools import accumulate
+from typing import Dict, List, Optional, Sequence
+
+from app.db import engine
+from app.utils.partitions import add_months, ensure_partitions_between, month_start
+from app.utils.security import hash_password
+from app.utils.seed_admin import ADMIN_EMAIL, ADMIN_PASSWORD
+
+DATA_TABLES = [
+    "invoice_items", "invoices", "notifications", "notification_counters", "reminders", "scheduler_state",
+    "calculation_templates", "jobs", "idempotency_keys", "sync_tombstones", "rate_limit_buckets",
+    "activities", "files", "assignments", "branches", "banks", "clients", "property_types",
+]
+
+STATUS_FLOW = ["PENDING", "SITE_VISIT", "UNDER_PROCESS", "SUBMITTED", "COMPLETED"]
+CANCELLED = "CANCELLED"
+
+BANK_NAMES = [
+    "State Bank of India", "HDFC Bank", "ICICI Bank", "Bank of Baroda", "Punjab National Bank",
+    "Canara Bank", "Axis Bank", "Union Bank of India", "Bank of Maharashtra", "Kotak Mahindra Bank",
+    "IDBI Bank", "Indian Bank", "Central Bank of India", "Bank of India", "Saraswat Co-op Bank",
+    "Cosmos Co-op Bank", "Federal Bank", "IndusInd Bank", "Yes Bank", "UCO Bank",
+]
+CITIES = [
+    "Pune", "Mumbai", "Nashik", "Nagpur", "Aurangabad", "Kolhapur", "Satara", "Solapur",
+    "Thane", "Sangli", "Ahmednagar", "Latur", "Jalgaon", "Akola", "Amravati", "Ratnagiri",
+]
+AREAS = [
+    "Main", "Camp", "Station Road", "MIDC", "Market Yard", "Shivaji Nagar", "Kothrud",
+    "Hadapsar", "Baner", "Aundh", "Wakad", "Deccan", "Swargate", "Viman Nagar", "Civil Lines",
+]
+FIRST_NAMES = [
+    "Aarav", "Vivaan", "Aditya", "Ishaan", "Rohan", "Sai", "Arjun", "Kabir", "Omkar", "Pranav",
+    "Ananya", "Diya", "Isha", "Kavya", "Meera", "Neha", "Pooja", "Riya", "Sneha", "Tanvi",
+]
+LAST_NAMES = [
+    "Patil", "Joshi", "Kulkarni", "Deshmukh", "Shinde", "Pawar", "Jadhav", "Gaikwad", "Kale",
+    "More", "Chavan", "Bhosale", "Deshpande", "Apte", "Gokhale", "Sawant", "Naik", "Mane",
+]
+PROPERTY_TYPES = [
+    "Flat", "Row House", "Bungalow", "Open Plot", "Shop", "Office", "Industrial Shed",
+    "Agricultural Land", "Commercial Building", "Warehouse", "Hotel", "Godown",
+]
+FILE_KINDS = [
+    ("site_photo_{n}.jpg", "image/jpeg", 350_000),
+    ("sale_deed.pdf", "application/pdf", 1_800_000),
+    ("7_12_extract.pdf", "application/pdf", 400_000),
+    ("approved_plan.pdf", "application/pdf", 2_500_000),
+    ("valuation_report.pdf", "application/pdf", 900_000),
+    ("index_ii.pdf", "application/pdf", 300_000),
+]
+FILE_WEIGHTS = list(accumulate([8, 2, 2, 1, 2, 1]))
+
+
+@dataclass
+class SyntheticConfig:
+    users: int = 60
+    banks: int = 40
+    branches: int = 50_000
+    clients: int = 2_000
+    assignments: int = 1_000_000
+    activities: int = 10_000_000
+    files: int = 500_000
+    years: int = 3
+    # Assignments per year grow by this factor, so recent months are denser
+    growth: float = 1.3
+    seed: int = 42
+    end_date: Optional[date] = None
+    chunk: int = 20_000
+
+
+# ---------------------------
+# COPY helpers
+# ---------------------------
+
+def _esc(v: str) -> str:
+    return v.replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n").replace("\r", "\\r")
+
+
+def _val(v) -> str:
+    if v is None:
+        return "\\N"
+    if v is True:
+        return "t"
+    if v is False:
+        return "f"
+    if isinstance(v, datetime):
+        return v.isoformat(" ")
+    if isinstance(v, (int, float, date)):
+        return str(v)
+    return _esc(str(v))
+
+
+class CopyBuffer:
+    """Accumulates COPY text-format rows for one table."""
+
+    def __init__(self, table: str, columns: Sequence[str]):
+        self.table = table
+        self.columns = columns
+        self.buf = io.StringIO()
+        self.rows = 0
+        self.total = 0
+
+    def add(self, *values) -> None:
+        self.buf.write("\t".join(_val(v) for v in values))
+        self.buf.write("\n")
+        self.rows += 1
+
+    def flush(self, cur) -> None:
+        if not self.rows:
+            return
+        self.buf.seek(0)
+        cur.copy_expert(f"COPY {self.table} ({', '.join(self.columns)}) FROM STDIN", self.buf)
+        self.total += self.rows
+        self.buf = io.StringIO()
+        self.rows = 0
+
+
+def _zipf_cum(n: int, s: float) -> List[float]:
+    """Cumulative Zipf weights for ranks 1..n (rank 1 most likely)."""
+    return list(accumulate(1.0 / (k ** s) for k in range(1, n + 1)))
+
+
+def _pick(rng: random.Random, cum: List[float]) -> int:
+    return bisect(cum, rng.random() * cum[-1])
+
+
+# ---------------------------
+# DB helpers
+# ---------------------------
+
+def truncate(cur) -> None:
+    cur.execute(f"TRUNCATE {', '.join(DATA_TABLES)} RESTART IDENTITY CASCADE")
+
+
+def _next_id(cur, table: str) -> int:
+    cur.execute(f"SELECT coalesce(max(id), 0) + 1 FROM {table}")
+    return int(cur.fetchone()[0])
+
+
+def _sync_sequence(cur, table: str) -> None:
+    cur.execute(
+        f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+        f"coalesce((SELECT max(id) FROM {table}), 0) + 1, false)"
+    )
+
+
+def _skip_fk_triggers(cur) -> bool:
+    """
+    Ids are generated consistently, so per-row FK trigger checks are pure overhead
+    for COPY. Disabling them needs superuser; otherwise they simply stay on.
+    """
+    cur.execute("SELECT rolsuper FROM pg_roles WHERE rolname = current_user")
+    row = cur.fetchone()
+    if row and row[0]:
+        cur.execute("SET session_replication_role = replica")
+        return True
+    return False
+
+
+def _require_empty(cur) -> None:
+    for table in ("banks", "branches", "assignments"):
+        cur.execute(f"SELECT 1 FROM {table} LIMIT 1")
+        if cur.fetchone():
+            raise SystemExit(f"{table} is not empty; pass --truncate to wipe the data tables first")
+
+
+# ---------------------------
+# Generator
+# ---------------------------
+
+def generate(cfg: SyntheticConfig, *, wipe: bool = False) -> Dict[str, int]:
+    rng = random.Random(cfg.seed)
+    end = datetime.combine(cfg.end_date or date.today(), datetime.min.time()) + timedelta(hours=18)
+    start = datetime(end.year - cfg.years, end.month, 1)
+    t0 = time.perf_counter()
+
+    raw = engine.raw_connection()
+    try:
+        cur = raw.cursor()
+        cur.execute("SET synchronous_commit = off")
+        _skip_fk_triggers(cur)
+        if wipe:
+            truncate(cur)
+        _require_empty(cur)
+        raw.commit()
+
+        # Activities must land in monthly partitions, not activities_default
+        from app.db import SessionLocal
+
+        db = SessionLocal()
+        try:
+            ensure_partitions_between(db, month_start(start.date()), add_months(month_start(end.date()), 3))
+        finally:
+            db.close()
+
+        # --- users (existing emails are reused, not duplicated)
+        cur.execute("SELECT id, email, full_name, role FROM users")
+        existing = {row[1]: row for row in cur.fetchall()}
+        password_hash = hash_password(ADMIN_PASSWORD)
+
+        users = CopyBuffer(
+            "users", ["id", "email", "full_name", "hashed_password", "role", "is_active", "created_at", "updated_at"]
+        )
+        next_user = _next_id(cur, "users")
+        staff: List[tuple] = []  # (id, full_name, role)
+        if ADMIN_EMAIL not in existing:
+            users.add(next_user, ADMIN_EMAIL, "Admin", password_hash, "ADMIN", True, start, start)
+            existing[ADMIN_EMAIL] = (next_user, ADMIN_EMAIL, "Admin", "ADMIN")
+            next_user += 1
+
+        names = [f"{f} {l}" for f in FIRST_NAMES for l in LAST_NAMES]
+        rng.shuffle(names)
+        for i in range(cfg.users):
+            full_name = names[i % len(names)] + ("" if i < len(names) else f" {i // len(names) + 1}")
+            email = f"user{i + 1:04d}@synthetic.zenops.in"
+            role = "OPS_MANAGER" if i % 15 == 0 else ("HR" if i % 29 == 1 else "EMPLOYEE")
+            if email in existing:
+                uid, _, full_name, role = existing[email]
+            else:
+                uid = next_user
+                next_user += 1
+                users.add(uid, email, full_name, password_hash, role, True, start, start)
+            staff.append((uid, full_name, role))
+        users.flush(cur)
+        admin_id = existing[ADMIN_EMAIL][0]
+        if not staff:
+            staff.append((admin_id, "Admin", "ADMIN"))
+        creators = [s[0] for s in staff if s[2] in ("OPS_MANAGER", "ADMIN")] or [admin_id]
+        staff_cum = _zipf_cum(len(staff), 0.8)
+
+        # --- banks (Zipf sizes) and branches
+        n_banks = max(1, cfg.banks)
+        bank_cum = _zipf_cum(n_banks, 1.1)
+        bank_weights = [bank_cum[0]] + [bank_cum[i] - bank_cum[i - 1] for i in range(1, n_banks)]
+        banks = CopyBuffer(
+            "banks",
+            ["id", "name", "account_name", "account_number", "ifsc", "account_bank_name",
+             "account_branch_name", "created_at", "updated_at"],
+        )
+        bank_ids: List[int] = []
+        bank_names: List[str] = []
+        next_bank = _next_id(cur, "banks")
+        for i in range(n_banks):
+            name = BANK_NAMES[i] if i < len(BANK_NAMES) else f"Sahakari Bank {i + 1:03d}"
+            bid = next_bank + i
+            banks.add(
+                bid, name, "Zen Valuers", f"{rng.randrange(10**11, 10**12)}",
+                f"ZEN{rng.randrange(10**7, 10**8)}", name, "Pune Main", start, start,
+            )
+            bank_ids.append(bid)
+            bank_names.append(name)
+        banks.flush(cur)
+
+        total_w = sum(bank_weights)
+        per_bank = [max(1, round(cfg.branches * w / total_w)) for w in bank_weights]
+        branches = CopyBuffer(
+            "branches", ["id", "bank_id", "name", "city", "is_active", "created_at", "updated_at"]
+        )
+        next_branch = _next_id(cur, "branches")
+        city_cum = _zipf_cum(len(CITIES), 1.0)
+        # per bank: (branch ids, branch names, cumulative popularity)
+        bank_branches: List[tuple] = []
+        for b, count in enumerate(per_bank):
+            ids, bnames = [], []
+            for j in range(count):
+                city = CITIES[_pick(rng, city_cum)]
+                area = AREAS[j % len(AREAS)]
+                name = f"{city} {area} {j + 1}"
+                branches.add(next_branch, bank_ids[b], name, city, True, start, start)
+                ids.append(next_branch)
+                bnames.append(name)
+                next_branch += 1
+            bank_branches.append((ids, bnames, _zipf_cum(count, 1.0)))
+            if branches.rows >= cfg.chunk:
+                branches.flush(cur)
+        branches.flush(cur)
+
+        # --- clients + property types
+        clients = CopyBuffer("clients", ["id", "name", "phone", "created_at", "updated_at"])
+        next_client = _next_id(cur, "clients")
+        client_ids = []
+        for i in range(cfg.clients):
+            last = LAST_NAMES[i % len(LAST_NAMES)]
+            clients.add(next_client + i, f"{last} Associates {i + 1:05d}", f"9{rng.randrange(10**9):09d}", start, start)
+            client_ids.append((next_client + i, f"{last} Associates {i + 1:05d}"))
+        clients.flush(cur)
+        client_cum = _zipf_cum(len(client_ids), 1.0) if client_ids else []
+
+        ptypes = CopyBuffer("property_types", ["id", "name", "created_at", "updated_at"])
+        next_pt = _next_id(cur, "property_types")
+        cur.execute("SELECT name FROM property_types")
+        taken = {r[0] for r in cur.fetchall()}
+        pt_rows = []
+        for name in PROPERTY_TYPES:
+            if name in taken:
+                continue
+            ptypes.add(next_pt, name, start, start)
+            pt_rows.append((next_pt, name))
+            next_pt += 1
+        ptypes.flush(cur)
+        pt_cum = _zipf_cum(len(pt_rows), 1.2) if pt_rows else []
+        raw.commit()
+
+        # --- assignment timeline: months weighted by growth, then sorted so ids follow created_at
+        months = (end.year - start.year) * 12 + end.month - start.month + 1
+        month_cum = list(accumulate(cfg.growth ** (m / 12.0) for m in range(months)))
+        span = (end - start).total_seconds()
+        stamps = []
+        for _ in range(cfg.assignments):
+            m = _pick(rng, month_cum)
+            lo = add_months(start.date(), m)
+            base = (datetime.combine(lo, datetime.min.time()) - start).total_seconds()
+            offset = base + rng.random() * 30 * 86400
+            stamps.append(min(offset, span))
+        stamps.sort()
+
+        assignments = CopyBuffer(
+            "assignments",
+            ["id", "assignment_code", "case_type", "bank_id", "branch_id", "client_id", "property_type_id",
+             "bank_name", "branch_name", "valuer_client_name", "property_type", "borrower_name", "phone",
+             "address", "land_area", "builtup_area", "status", "assigned_to", "assigned_to_user_id", "site_visit_date",
+             "report_due_date", "fees", "is_paid", "notes", "created_at", "updated_at"],
+        )
+        files = CopyBuffer(
+            "files",
+            ["id", "assignment_id", "filename", "filepath", "stored_name", "content_type", "size_bytes", "uploaded_at"],
+        )
+        activities = CopyBuffer(
+            "activities", ["id", "assignment_id", "actor_user_id", "type", "payload", "created_at"]
+        )
+
+        next_assignment = _next_id(cur, "assignments")
+        next_file = _next_id(cur, "files")
+        next_activity = _next_id(cur, "activities")
+        year_seq: Dict[int, int] = {}
+
+        n = cfg.assignments
+        for i, offset in enumerate(stamps):
+            aid = next_assignment + i
+            created = start + timedelta(seconds=offset)
+            year_seq[created.year] = year_seq.get(created.year, 0) + 1
+            code = f"VAL/{created.year}/{year_seq[created.year]:04d}"
+
+            r = rng.random()
+            bank_id = branch_id = client_id = None
+            bank_name = branch_name = client_name = None
+            if r < 0.85 or not client_ids:
+                case_type = "BANK"
+                b = _pick(rng, bank_cum)
+                ids, bnames, cum = bank_branches[b]
+                k = _pick(rng, cum)
+                bank_id, branch_id = bank_ids[b], ids[k]
+                bank_name, branch_name = bank_names[b], bnames[k]
+            else:
+                case_type = "EXTERNAL_VALUER" if r < 0.95 else "DIRECT_CLIENT"
+                client_id, client_name = client_ids[_pick(rng, client_cum)]
+
+            pt_id, pt_name = pt_rows[_pick(rng, pt_cum)] if pt_rows else (None, None)
+            assignee_id, assignee_name, _ = staff[_pick(rng, staff_cum)]
+            creator = creators[i % len(creators)]
+
+            # Older work has progressed further; ~3% gets cancelled
+            age_days = (end - created).days
+            steps = min(len(STATUS_FLOW) - 1, int(age_days / rng.uniform(4, 12)))
+            cancelled = rng.random() < 0.03
+            status = CANCELLED if cancelled else STATUS_FLOW[steps]
+            done = status == "COMPLETED"
+
+            site_visit = (created + timedelta(days=rng.randint(0, 5))).date()
+            due = (created + timedelta(days=rng.randint(7, 21))).date()
+            fees = int(round(rng.lognormvariate(8.3, 0.5) / 500.0)) * 500 + 1500
+            is_paid = done and rng.random() < (0.9 if age_days > 60 else 0.4)
+            land = round(rng.lognormvariate(6.5, 0.8), 1)
+
+            # status history
+            events = [(created, creator, "ASSIGNMENT_CREATED",
+                       {"assignment_code": code, "case_type": case_type,
+                        "bank_name": bank_name, "branch_name": branch_name,
+                        "valuer_client_name": client_name})]
+            t = created
+            path = STATUS_FLOW[: steps + 1]
+            for prev, nxt in zip(path, path[1:]):
+                t = min(end, t + timedelta(hours=rng.uniform(6, 24 * 6)))
+                events.append((t, assignee_id, "STATUS_CHANGED", {"from": prev, "to": nxt}))
+            if cancelled:
+                t = min(end, t + timedelta(hours=rng.uniform(1, 72)))
+                events.append((t, creator, "STATUS_CHANGED", {"from": path[-1], "to": CANCELLED}))
+            last_change = t
+
+            # files, steered towards the requested total
+            files_want = (cfg.files - files.total - files.rows) / (n - i)
+            n_files = int(rng.expovariate(1.0 / files_want) + 0.5) if files_want > 0 else 0
+            for f in range(n_files):
+                kind = FILE_KINDS[bisect(FILE_WEIGHTS, rng.random() * FILE_WEIGHTS[-1])]
+                fname = kind[0].format(n=f + 1)
+                stored = f"{aid}_{next_file:x}{fname[fname.rfind('.'):]}"
+                up = min(end, created + timedelta(hours=rng.uniform(1, 24 * 10)))
+                size = int(rng.uniform(0.3, 1.7) * kind[2])
+                files.add(next_file, aid, fname, f"uploads/synthetic/{stored}", stored, kind[1], size, up)
+                events.append((up, assignee_id, "FILE_UPLOADED",
+                               {"file_id": next_file, "filename": fname, "stored_name": stored,
+                                "content_type": kind[1], "size_bytes": size}))
+                next_file += 1
+
+            # edit noise, steered towards the requested activity total
+            act_want = (cfg.activities - activities.total - activities.rows) / (n - i) - len(events)
+            n_updates = int(rng.expovariate(1.0 / act_want)) if act_want > 0 else 0
+            for _ in range(n_updates):
+                up = min(end, created + timedelta(hours=rng.uniform(1, 24 * 30)))
+                field = ("notes", "phone", "address", "report_due_date", "fees")[rng.randrange(5)]
+                events.append((up, assignee_id, "ASSIGNMENT_UPDATED", {"changed_fields": [field]}))
+
+            for ts, actor, typ, payload in events:
+                activities.add(next_activity, aid, actor, typ, json.dumps(payload, separators=(",", ":")), ts)
+                next_activity += 1
+
+            assignments.add(
+                aid, code, case_type, bank_id, branch_id, client_id, pt_id,
+                bank_name, branch_name, client_name, pt_name,
+                f"{FIRST_NAMES[rng.randrange(len(FIRST_NAMES))]} {LAST_NAMES[rng.randrange(len(LAST_NAMES))]}",
+                f"9{rng.randrange(10**9):09d}", f"Survey No. {rng.randint(1, 999)}, {CITIES[i % len(CITIES)]}",
+                land, round(land * rng.uniform(0.4, 1.2), 1), status, assignee_name, assignee_id, site_visit, due,
+                fees, is_paid, None, created, max(created, last_change),
+            )
+
+            if assignments.rows >= cfg.chunk:
+                # Parents first so the FKs resolve inside the transaction
+                assignments.flush(cur)
+                files.flush(cur)
+                activities.flush(cur)
+                raw.commit()
+                print(
+                    f"[SYNTH] {assignments.total}/{n} assignments, {activities.total} activities, "
+                    f"{files.total} files ({time.perf_counter() - t0:.1f}s)"
+                )
+
+        assignments.flush(cur)
+        files.flush(cur)
+        activities.flush(cur)
+
+        for table in ("users", "banks", "branches", "clients", "property_types", "assignments", "files", "activities"):
+            _sync_sequence(cur, table)
+        raw.commit()
+
+        cur.execute(f"ANALYZE users, {', '.join(DATA_TABLES)}")
+        raw.commit()
+    finally:
+        raw.close()
+
+    counts = {
+        "users": users.total,
+        "banks": banks.total,
+        "branches": branches.total,
+        "clients": clients.total,
+        "property_types": ptypes.total,
+        "assignments": assignments.total,
+        "files": files.total,
+        "activities": activities.total,
+    }
+    print(f"[SYNTH] done in {time.perf_counter() - t0:.1f}s: {counts}")
+    return counts
+
+
+# ---------------------------
+# CLI
+# ---------------------------
+
+def add_volume_args(parser: argparse.ArgumentParser) -> None:
+    d = SyntheticConfig()
+    for name in ("users", "banks", "branches", "clients", "assignments", "activities", "files", "years"):
+        parser.add_argument(f"--{name}", type=int, default=getattr(d, name))
+    parser.add_argument("--growth", type=float, default=d.growth, help="Year-on-year volume growth factor")
+    parser.add_argument("--random-seed", dest="random_seed", type=int, default=d.seed)
+    parser.add_argument("--end-date", type=date.fromisoformat, default=None, help="YYYY-MM-DD (default: today)")
+    parser.add_argument("--chunk", type=int, default=d.chunk, help="Assignments per COPY batch")
+
+
+def config_from_args(args: argparse.Namespace) -> SyntheticConfig:
+    return SyntheticConfig(
+        users=args.users,
+        banks=args.banks,
+        branches=args.branches,
+        clients=args.clients,
+        assignments=args.assignments,
+        activities=args.activities,
+        files=args.files,
+        years=args.years,
+        growth=args.growth,
+        seed=args.random_seed,
+        end_date=args.end_date,
+        chunk=args.chunk,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Bulk-load deterministic synthetic data via COPY")
+    add_volume_args(parser)
+    parser.add_argument("--truncate", action="store_true", help="TRUNCATE data tables first (destructive; users kept)")
+    args = parser.parse_args()
+
+    generate(config_from_args(args), wipe=args.truncate)
+
+
+if __name__ == "__main__":
+    main()
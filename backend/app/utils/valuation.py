@@ -0,0 +1,163 @@
+"""
+Valuation: pick an assignment's calculation template, evaluate it, store
+the result in assignments.valuation_output_json.
+
+Inputs a template can use are the assignment columns in ASSIGNMENT_INPUTS
+plus whatever the valuer entered in valuation_input_json (numbers, or
+numeric strings from form fields).
+
+Template choice is the most specific active template: bank + property
+type, then bank only, then property type only, then the global one.
+
+evaluate_assignments() runs one template over many assignments with a
+fixed number of statements: one SELECT of the inputs, one compiled
+evaluate_many() pass, one UPDATE ... FROM jsonb_to_recordset().
+"""
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+
+import orjson
+from sqlalchemy import or_, select, text
+from sqlalchemy.orm import Session
+
+from app.models.assignment import Assignment
+from app.models.valuation import CalculationTemplate
+from app.utils.formula import CompiledTemplate, FormulaError, compile_template, get_compiled
+
+ASSIGNMENT_INPUTS = ("land_area", "builtup_area", "fees")
+
+INPUT_COLUMNS = [Assignment.id] + [getattr(Assignment, c) for c in ASSIGNMENT_INPUTS] + [Assignment.valuation_input_json]
+
+_STORE_SQL = text(
+    "UPDATE assignments a SET valuation_output_json = x.doc, updated_at = :now "
+    "FROM jsonb_to_recordset(CAST(:rows AS jsonb)) AS x(id int, doc jsonb) "
+    "WHERE a.id = x.id"
+)
+
+
+def compiled(template: CalculationTemplate) -> CompiledTemplate:
+    """Compiled evaluator for a template, cached by (id, version). Raises FormulaError."""
+    return get_compiled(
+        (template.id, template.version),
+        template.formula_definitions_json,
+        template.required_fields_json,
+        ASSIGNMENT_INPUTS,
+    )
+
+
+def find_template(db: Session, bank_id: Optional[int], property_type_id: Optional[int]) -> Optional[CalculationTemplate]:
+    return (
+        db.query(CalculationTemplate)
+        .filter(
+            CalculationTemplate.is_active.is_(True),
+            or_(CalculationTemplate.bank_id.is_(None), CalculationTemplate.bank_id == bank_id),
+            or_(CalculationTemplate.property_type_id.is_(None), CalculationTemplate.property_type_id == property_type_id),
+        )
+        .order_by(CalculationTemplate.bank_id.asc().nulls_last(), CalculationTemplate.property_type_id.asc().nulls_last())
+        .first()
+    )
+
+
+def template_scope(template: CalculationTemplate) -> list:
+    """WHERE conditions for assignments a template can apply to."""
+    conds = []
+    if template.bank_id is not None:
+        conds.append(Assignment.bank_id == template.bank_id)
+    if template.property_type_id is not None:
+        conds.append(Assignment.property_type_id == template.property_type_id)
+    return conds
+
+
+def _number(value: Any) -> Any:
+    if isinstance(value, str):
+        try:
+            return float(value.replace(",", ""))
+        except ValueError:
+            return None
+    return value if isinstance(value, (int, float)) else None
+
+
+def input_values(row: Mapping[str, Any]) -> Dict[str, Any]:
+    """Formula inputs for one assignment row (columns + valuation_input_json)."""
+    values = {k: row.get(k) for k in ASSIGNMENT_INPUTS}
+    for k, v in (row.get("valuation_input_json") or {}).items():
+        # an entered value only fills in for an empty column
+        if values.get(k) is None:
+            values[k] = _number(v)
+    return values
+
+
+def output_doc(template: CalculationTemplate, result: Any, now: datetime) -> Dict[str, Any]:
+    doc: Dict[str, Any] = {
+        "template_id": template.id,
+        "template_version": template.version,
+        "values": None,
+        "error": None,
+        "computed_at": now.isoformat(),
+    }
+    if isinstance(result, FormulaError):
+        doc["error"] = str(result)
+    else:
+        doc["values"] = {k: round(v, 2) if isinstance(v, float) else v for k, v in result.items()}
+    return doc
+
+
+def evaluate_inputs(template: CalculationTemplate, values: Mapping[str, Any]) -> Dict[str, Any]:
+    """Evaluate a template over ad-hoc inputs (form preview); raises FormulaError."""
+    return compiled(template).evaluate({k: _number(v) for k, v in values.items()})
+
+
+def evaluate_assignments(
+    db: Session,
+    template: CalculationTemplate,
+    assignment_ids: Sequence[int],
+    *,
+    persist: bool = True,
+) -> Dict[int, Dict[str, Any]]:
+    """
+    Evaluate `template` for every assignment in `assignment_ids` (those outside
+    the template's bank / property type are skipped) in one pass. Returns {assignment_id: output doc}; rows that fail carry "error" instead
+    of "values". With persist, the docs are written (caller commits).
+    """
+    evaluator = compiled(template)
+    rows = db.execute(select(*INPUT_COLUMNS).where(Assignment.id.in_(list(assignment_ids)), *template_scope(template))).mappings().all()
+    if not rows:
+        return {}
+
+    now = datetime.utcnow()
+    results = evaluator.evaluate_many([input_values(r) for r in rows])
+    docs = {r["id"]: output_doc(template, res, now) for r, res in zip(rows, results)}
+
+    if persist:
+        store_outputs(db, docs, now)
+    return docs
+
+
+def store_outputs(db: Session, docs: Mapping[int, Dict[str, Any]], now: datetime) -> None:
+    """Write {assignment_id: output doc} in one statement (caller commits)."""
+    if docs:
+        payload = orjson.dumps([{"id": k, "doc": v} for k, v in docs.items()]).decode()
+        db.execute(_STORE_SQL, {"rows": payload, "now": now})
+
+
+def evaluate_assignment(db: Session, assignment: Assignment) -> Optional[Dict[str, Any]]:
+    """
+    Evaluate and store one assignment with its matching template.
+    Returns the output doc, or None when no template applies (caller commits).
+    """
+    template = find_template(db, assignment.bank_id, assignment.property_type_id)
+    if template is None:
+        return None
+    now = datetime.utcnow()
+    row = {k: getattr(assignment, k) for k in ASSIGNMENT_INPUTS}
+    row["valuation_input_json"] = assignment.valuation_input_json
+    doc = output_doc(template, compiled(template).evaluate_many([input_values(row)])[0], now)
+    assignment.valuation_output_json = doc
+    return doc
+
+
+def validate_template(definitions: Mapping[str, Any], fields: Optional[List[Any]]) -> CompiledTemplate:
+    """Compile without caching, to reject bad templates on save. Raises FormulaError."""
+    return compile_template(definitions, fields, ASSIGNMENT_INPUTS)
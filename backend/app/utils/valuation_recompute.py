@@ -0,0 +1,363 @@
+"""
+Bulk valuation recompute after a calculation template changes.
+
+Editing a template's formulas (version bump), creating one or switching one
+on/off requests a recompute of every open assignment the template now
+applies to:
+
+    select      keyset pages over assignments.id in the template's scope:
+                its bank / property type, open status, not claimed by a more
+                specific active template, and with valuation inputs or a
+                previous output
+    evaluate    chunks go to a spawned ProcessPoolExecutor running
+                formula.evaluate_chunk (each worker compiles the template
+                once); the next chunks are read while earlier ones evaluate
+    write       one UPDATE ... FROM jsonb_to_recordset() per chunk, committed
+                together with the checkpoint
+
+Progress lives in scheduler_state "valuation_recompute:<template id>":
+    {"version", "requested_at", "status": pending|running|done,
+     "total", "done", "failed", "after_id", "rate" (rows/s), "started_at",
+     "finished_at", "seconds"}
+
+A run gives up the scheduler after ZEN_RECOMPUTE_TICK_SECONDS; the next tick
+resumes from after_id. A newer request (another edit mid-run) restarts from
+the beginning, and the superseded run stops at its next checkpoint.
+
+Runs as a scheduler job (one worker at a time via the advisory lock), as a
+"valuation.recompute" queue job (app/utils/job_handlers.py), or by hand:
+    python -m app.utils.valuation_recompute --template-id 3
+    python -m app.utils.valuation_recompute --template-id 3 --restart --workers 4
+
+Env:
+    ZEN_RECOMPUTE_INTERVAL_SECONDS  30
+    ZEN_RECOMPUTE_TICK_SECONDS      300
+    ZEN_RECOMPUTE_CHUNK_SIZE        2000
+    ZEN_RECOMPUTE_WORKERS           cpu count (1 = evaluate in-process)
+"""
+from __future__ import annotations
+
+import argparse
+import multiprocessing
+import os
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from sqlalchemy import case, exists, func, or_, select, text
+from sqlalchemy.orm import Session, aliased
+
+from app.db import engine
+from app.models.assignment import OPEN_STATUS_SQL, Assignment
+from app.models.reminder import SchedulerState
+from app.models.valuation import CalculationTemplate
+from app.utils.formula import evaluate_chunk
+from app.utils.metrics import REGISTRY
+from app.utils.scheduler import advisory_key, load_state, register_job, save_state
+from app.utils.valuation import (
+    ASSIGNMENT_INPUTS,
+    INPUT_COLUMNS,
+    compiled,
+    input_values,
+    output_doc,
+    store_outputs,
+)
+
+JOB_NAME = "valuation_recompute"
+STATE_PREFIX = "valuation_recompute:"
+
+INTERVAL_SECONDS = float(os.getenv("ZEN_RECOMPUTE_INTERVAL_SECONDS", "30"))
+TICK_SECONDS = float(os.getenv("ZEN_RECOMPUTE_TICK_SECONDS", "300"))
+CHUNK_SIZE = int(os.getenv("ZEN_RECOMPUTE_CHUNK_SIZE", "2000"))
+WORKERS = int(os.getenv("ZEN_RECOMPUTE_WORKERS", "0")) or (os.cpu_count() or 1)
+
+RECOMPUTED = REGISTRY.counter(
+    "zen_valuation_recompute_rows_total", "Assignments re-evaluated after a template change", ["outcome"]
+)
+
+
+def state_name(template_id: int) -> str:
+    return f"{STATE_PREFIX}{template_id}"
+
+
+def _rank(t) -> Any:
+    # find_template's preference: bank beats property type beats global
+    return case((t.bank_id.is_not(None), 2), else_=0) + case((t.property_type_id.is_not(None), 1), else_=0)
+
+
+def affected_conditions(template: CalculationTemplate) -> list:
+    """Open assignments that resolve to `template` and have something to compute."""
+    other = aliased(CalculationTemplate)
+    rank = (2 if template.bank_id is not None else 0) + (1 if template.property_type_id is not None else 0)
+    conds = [
+        text(OPEN_STATUS_SQL),
+        or_(Assignment.valuation_input_json.is_not(None), Assignment.valuation_output_json.is_not(None)),
+        ~exists().where(
+            other.is_active.is_(True),
+            other.id != template.id,
+            or_(other.bank_id.is_(None), other.bank_id == Assignment.bank_id),
+            or_(other.property_type_id.is_(None), other.property_type_id == Assignment.property_type_id),
+            _rank(other) > rank,
+        ),
+    ]
+    if template.bank_id is not None:
+        conds.append(Assignment.bank_id == template.bank_id)
+    if template.property_type_id is not None:
+        conds.append(Assignment.property_type_id == template.property_type_id)
+    return conds
+
+
+# ---------------------------
+# Requests / progress
+# ---------------------------
+
+def request_recompute(db: Session, template: CalculationTemplate) -> Dict[str, Any]:
+    """Queue a recompute from scratch (commits). Picked up by the next scheduler tick."""
+    state = {
+        "version": template.version,
+        "requested_at": datetime.utcnow().isoformat(),
+        "status": "pending",
+        "total": None,
+        "done": 0,
+        "failed": 0,
+        "after_id": 0,
+    }
+    save_state(db, state_name(template.id), state)
+    return state
+
+
+def request_for_change(db: Session, template: CalculationTemplate) -> List[int]:
+    """
+    Recompute whatever a template change moved: the template itself while it
+    is active, or, once deactivated, the less specific templates its
+    assignments fall back to.
+    """
+    if template.is_active:
+        targets = [template]
+    else:
+        q = db.query(CalculationTemplate).filter(CalculationTemplate.is_active.is_(True))
+        if template.bank_id is not None:
+            q = q.filter(or_(CalculationTemplate.bank_id.is_(None), CalculationTemplate.bank_id == template.bank_id))
+        else:
+            q = q.filter(CalculationTemplate.bank_id.is_(None))
+        if template.property_type_id is not None:
+            q = q.filter(
+                or_(
+                    CalculationTemplate.property_type_id.is_(None),
+                    CalculationTemplate.property_type_id == template.property_type_id,
+                )
+            )
+        else:
+            q = q.filter(CalculationTemplate.property_type_id.is_(None))
+        targets = q.all()
+    for t in targets:
+        request_recompute(db, t)
+    return [t.id for t in targets]
+
+
+def _requested_at(db: Session, name: str) -> Optional[str]:
+    # Column select, not db.get(): must see a request committed by another session
+    state = db.execute(select(SchedulerState.state).where(SchedulerState.name == name)).scalar()
+    return (state or {}).get("requested_at")
+
+
+def pending_templates(db: Session) -> List[CalculationTemplate]:
+    rows = db.execute(
+        select(CalculationTemplate, SchedulerState.state)
+        .join(SchedulerState, SchedulerState.name == func.concat(STATE_PREFIX, CalculationTemplate.id))
+        .where(CalculationTemplate.is_active.is_(True))
+        .order_by(SchedulerState.updated_at)
+    ).all()
+    return [t for t, state in rows if (state or {}).get("status") != "done"]
+
+
+# ---------------------------
+# Running
+# ---------------------------
+
+def _completed(value: Any) -> Future:
+    f: Future = Future()
+    f.set_result(value)
+    return f
+
+
+def recompute_template(
+    db: Session,
+    template: CalculationTemplate,
+    *,
+    workers: int = WORKERS,
+    chunk_size: int = CHUNK_SIZE,
+    deadline: Optional[float] = None,
+    progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+) -> Dict[str, Any]:
+    """
+    Run (or resume) the recompute for one template until done or `deadline`
+    (time.monotonic()). Returns the state as last checkpointed.
+    """
+    name = state_name(template.id)
+    state = load_state(db, name)
+    if state.get("version") != template.version or not state.get("requested_at"):
+        state = request_recompute(db, template)
+    if state.get("status") == "done":
+        return state
+
+    requested_at = state["requested_at"]
+    conds = affected_conditions(template)
+    if state.get("status") == "pending":
+        state["total"] = db.execute(select(func.count()).select_from(Assignment).where(*conds)).scalar()
+        state["status"] = "running"
+        state["started_at"] = datetime.utcnow().isoformat()
+        save_state(db, name, state)
+
+    compiled(template)  # fail fast on a broken template, before any worker starts
+    key = (template.id, template.version)
+    args = (key, template.formula_definitions_json, template.required_fields_json, ASSIGNMENT_INPUTS)
+
+    pool = None
+    if workers > 1:
+        # spawn, not fork: the parent has DB pools and threads that must not be cloned
+        pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+
+    inflight: deque = deque()
+    after_id = state["after_id"]
+    exhausted = False
+    run_done = 0
+    t0 = time.perf_counter()
+    try:
+        while True:
+            # Keep the pool busy: read ahead while earlier chunks evaluate
+            while not exhausted and len(inflight) < max(2 * workers, 1):
+                rows = db.execute(
+                    select(*INPUT_COLUMNS)
+                    .where(Assignment.id > after_id, *conds)
+                    .order_by(Assignment.id)
+                    .limit(chunk_size)
+                ).mappings().all()
+                db.commit()  # don't sit idle-in-transaction while the pool works
+                if not rows:
+                    exhausted = True
+                    break
+                after_id = rows[-1]["id"]
+                values = [input_values(r) for r in rows]
+                fut = pool.submit(evaluate_chunk, *args, values) if pool else _completed(evaluate_chunk(*args, values))
+                inflight.append(([r["id"] for r in rows], after_id, fut))
+
+            if not inflight:
+                break
+
+            ids, last_id, fut = inflight.popleft()
+            now = datetime.utcnow()
+            docs = {i: output_doc(template, res, now) for i, res in zip(ids, fut.result())}
+            failed = sum(1 for d in docs.values() if d["error"])
+
+            if _requested_at(db, name) != requested_at:
+                db.rollback()
+                print(f"[RECOMPUTE] template {template.id}: superseded by a newer request, stopping")
+                return load_state(db, name)
+
+            store_outputs(db, docs, now)
+            state["done"] += len(docs)
+            state["failed"] += failed
+            state["after_id"] = last_id
+            run_done += len(docs)
+            state["rate"] = round(run_done / max(time.perf_counter() - t0, 1e-6))
+            save_state(db, name, state)  # commits the outputs and the checkpoint together
+            RECOMPUTED.inc(len(docs) - failed, outcome="ok")
+            RECOMPUTED.inc(failed, outcome="failed")
+            if progress:
+                progress(state)
+
+            if deadline is not None and time.monotonic() >= deadline:
+                break
+    finally:
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    if exhausted and not inflight:
+        state["status"] = "done"
+        state["finished_at"] = datetime.utcnow().isoformat()
+    state["seconds"] = round(state.get("seconds", 0) + time.perf_counter() - t0, 1)
+    save_state(db, name, state)
+    return state
+
+
+def _print_progress(template_id: int) -> Callable[[Dict[str, Any]], None]:
+    def report(state: Dict[str, Any]) -> None:
+        print(
+            f"[RECOMPUTE] template {template_id} v{state['version']}: "
+            f"{state['done']}/{state['total']} ({state['failed']} failed, {state['rate']}/s)"
+        )
+
+    return report
+
+
+def run_pending(db: Session) -> Dict[str, Any]:
+    """Scheduler job: work through requested recomputes until the tick budget runs out."""
+    deadline = time.monotonic() + TICK_SECONDS
+    result: Dict[str, Any] = {}
+    for template in pending_templates(db):
+        if time.monotonic() >= deadline:
+            break
+        state = recompute_template(db, template, deadline=deadline, progress=_print_progress(template.id))
+        result[template.id] = f"{state['status']} {state['done']}/{state['total']}"
+    return result
+
+
+def register() -> None:
+    register_job(JOB_NAME, run_pending, INTERVAL_SECONDS)
+
+
+@contextmanager
+def locked_session() -> Iterator[Optional[Session]]:
+    """
+    Session holding the scheduler job's advisory lock for the whole block,
+    or None when a recompute is already running elsewhere. For runs outside
+    the scheduler (CLI, job queue).
+    """
+    key = advisory_key(JOB_NAME)
+    with engine.connect() as conn:
+        got = conn.execute(text("SELECT pg_try_advisory_lock(:k)"), {"k": key}).scalar()
+        conn.commit()
+        if not got:
+            yield None
+            return
+        try:
+            with Session(bind=conn) as db:
+                yield db
+        finally:
+            conn.rollback()
+            conn.execute(text("SELECT pg_advisory_unlock(:k)"), {"k": key})
+            conn.commit()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Re-evaluate assignments after a calculation template change")
+    parser.add_argument("--template-id", type=int, required=True)
+    parser.add_argument("--restart", action="store_true", help="start over instead of resuming")
+    parser.add_argument("--workers", type=int, default=WORKERS)
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    args = parser.parse_args()
+
+    with locked_session() as db:
+        if db is None:
+            raise SystemExit("[RECOMPUTE] another worker is running recomputes; try again later")
+        template = db.get(CalculationTemplate, args.template_id)
+        if template is None:
+            raise SystemExit(f"template {args.template_id} not found")
+        if args.restart:
+            request_recompute(db, template)
+        state = recompute_template(
+            db,
+            template,
+            workers=args.workers,
+            chunk_size=args.chunk_size,
+            progress=_print_progress(template.id),
+        )
+        print(f"[RECOMPUTE] {state}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+"""
+Background job worker (queue: app/utils/jobs.py).
+
+    python -m app.worker                      # one process per CPU
+    python -m app.worker --processes 4
+    python -m app.worker --kinds invoice_pdf.month,valuation.recompute
+
+Each process loops: claim the next job with FOR UPDATE SKIP LOCKED, run its
+handler (a heartbeat thread keeps the claim alive), record the outcome. An
+idle process waits on LISTEN zen_jobs, so new jobs start immediately; it
+also polls every ZEN_JOB_POLL_SECONDS for retries coming due, and reaps jobs
+left RUNNING by a killed worker.
+
+SIGTERM / Ctrl-C: processes finish the job in hand, then exit. The parent
+restarts a process that dies unexpectedly.
+
+Env:
+    ZEN_WORKER_PROCESSES        cpu count
+    ZEN_JOB_POLL_SECONDS        5
+    ZEN_JOB_HEARTBEAT_SECONDS   15
+"""
+from __future__ import annotations
+
+import argparse
+import multiprocessing
+import os
+import select
+import signal
+import socket
+import threading
+import time
+import traceback
+from typing import List, Optional
+
+from app.db import SessionLocal, engine
+from app.utils import job_handlers  # noqa: F401  (registers the handlers)
+from app.utils.jobs import (
+    CHANNEL,
+    STALE_SECONDS,
+    PermanentJobError,
+    claim,
+    complete,
+    fail,
+    get_handler,
+    heartbeat,
+    reap_stale,
+)
+
+PROCESSES = int(os.getenv("ZEN_WORKER_PROCESSES", "0")) or (os.cpu_count() or 1)
+POLL_SECONDS = float(os.getenv("ZEN_JOB_POLL_SECONDS", "5"))
+HEARTBEAT_SECONDS = float(os.getenv("ZEN_JOB_HEARTBEAT_SECONDS", "15"))
+
+
+class _Heartbeat(threading.Thread):
+    def __init__(self, job_id: int, worker_id: str):
+        super().__init__(daemon=True)
+        self.job_id = job_id
+        self.worker_id = worker_id
+        self.done = threading.Event()
+
+    def run(self) -> None:
+        while not self.done.wait(HEARTBEAT_SECONDS):
+            db = SessionLocal()
+            try:
+                if not heartbeat(db, self.job_id, self.worker_id):
+                    print(f"[WORKER] {self.worker_id}: lost job {self.job_id} (reaped or cancelled)")
+                    return
+            except Exception:
+                traceback.print_exc()
+            finally:
+                db.close()
+
+
+def _run_one(ctx, worker_id: str) -> None:
+    beat = _Heartbeat(ctx.job_id, worker_id)
+    beat.start()
+    t0 = time.perf_counter()
+    db = SessionLocal()
+    try:
+        fn = get_handler(ctx.kind)
+        if fn is None:
+            raise PermanentJobError(f"no handler for job kind {ctx.kind!r}")
+        result = fn(ctx)
+        beat.done.set()
+        complete(db, ctx.job_id, worker_id, result)
+        print(f"[WORKER] job {ctx.job_id} {ctx.kind} done in {time.perf_counter() - t0:.1f}s")
+    except Exception as e:
+        beat.done.set()
+        db.rollback()
+        permanent = isinstance(e, PermanentJobError)
+        detail = str(e) if permanent else traceback.format_exc()
+        status = fail(db, ctx.job_id, worker_id, detail, permanent=permanent)
+        print(
+            f"[WORKER] job {ctx.job_id} {ctx.kind} attempt {ctx.attempt}/{ctx.max_attempts} failed "
+            f"({type(e).__name__}: {e}); now {status}"
+        )
+    finally:
+        beat.done.set()
+        db.close()
+
+
+def _listen_connection():
+    """Dedicated autocommit connection LISTENing on the jobs channel (taken out of the pool)."""
+    raw = engine.raw_connection()
+    conn = raw.driver_connection
+    raw.detach()
+    conn.autocommit = True
+    with conn.cursor() as cur:
+        cur.execute(f'LISTEN "{CHANNEL}"')
+    return conn
+
+
+def run_worker(index: int = 0, kinds: Optional[List[str]] = None) -> None:
+    """One worker process: claim / run / wait until SIGTERM."""
+    worker_id = f"{socket.gethostname()}:{os.getpid()}:{index}"
+    stopping = threading.Event()
+
+    def _stop(signum, frame):
+        stopping.set()
+
+    signal.signal(signal.SIGTERM, _stop)
+    signal.signal(signal.SIGINT, _stop)
+
+    listen = None
+    next_reap = 0.0
+    print(f"[WORKER] {worker_id} started (kinds: {', '.join(kinds) if kinds else 'all'})")
+
+    while not stopping.is_set():
+        db = SessionLocal()
+        try:
+            if time.monotonic() >= next_reap:
+                next_reap = time.monotonic() + STALE_SECONDS / 2
+                reaped = reap_stale(db)
+                if reaped:
+                    print(f"[WORKER] requeued {reaped} job(s) from lost workers")
+            ctx = claim(db, worker_id, kinds)
+        except Exception:
+            traceback.print_exc()
+            ctx = None
+            stopping.wait(POLL_SECONDS)
+            continue
+        finally:
+            db.close()
+
+        if ctx is not None:
+            _run_one(ctx, worker_id)
+            continue
+
+        # Idle: sleep until a NOTIFY arrives or the poll interval passes
+        try:
+            if listen is None or listen.closed:
+                listen = _listen_connection()
+            if select.select([listen], [], [], POLL_SECONDS) != ([], [], []):
+                listen.poll()
+                listen.notifies.clear()
+        except (OSError, ValueError, InterruptedError):
+            pass
+        except Exception:
+            traceback.print_exc()
+            listen = None
+            stopping.wait(POLL_SECONDS)
+
+    if listen is not None and not listen.closed:
+        listen.close()
+    print(f"[WORKER] {worker_id} stopped")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run background job workers")
+    parser.add_argument("--processes", type=int, default=PROCESSES)
+    parser.add_argument("--kinds", default="", help="comma-separated job kinds (default: all)")
+    args = parser.parse_args()
+    kinds = [k.strip() for k in args.kinds.split(",") if k.strip()] or None
+
+    if args.processes <= 1:
+        run_worker(0, kinds)
+        return
+
+    # spawn, not fork: every child builds its own engine / connections
+    mp = multiprocessing.get_context("spawn")
+    procs = {}
+    stopping = threading.Event()
+
+    def _stop(signum, frame):
+        stopping.set()
+
+    signal.signal(signal.SIGTERM, _stop)
+    signal.signal(signal.SIGINT, _stop)
+
+    def start(i: int) -> None:
+        p = mp.Process(target=run_worker, args=(i, kinds), name=f"zen-worker-{i}")
+        p.start()
+        procs[i] = p
+
+    for i in range(args.processes):
+        start(i)
+
+    while not stopping.wait(1.0):
+        for i, p in list(procs.items()):
+            if not p.is_alive():
+                print(f"[WORKER] process {i} exited with {p.exitcode}; restarting")
+                start(i)
+
+    for p in procs.values():
+        if p.is_alive():
+            p.terminate()  # SIGTERM: finish the current job, then exit
+    for p in procs.values():
+        p.join()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,341 @@
+"""
+Reproducible API benchmark suite.
+
+Measures p50/p90/p99 latency and req/s per scenario against a real uvicorn
+process and writes machine-readable JSON, so two commits can be diffed.
+
+Scenarios: login, /me, list (every filter x sort_by x sort_dir), summary,
+detail, create, PATCH, upload, download and master-data typeahead.
+
+Usage (from backend/, DB migrated, `pip install -r requirements-bench.txt`):
+    # seed once (volumes/options: python -m app.utils.synthetic_data --help), then run
+    python -m benchmarks.api_bench --seed --truncate --assignments 1000000 --activities 10000000
+    python -m benchmarks.api_bench --out bench-$(git rev-parse --short HEAD).json
+
+    # only some scenarios / an already running server
+    python -m benchmarks.api_bench --only 'assignments.list*,*detail*' --base-url http://127.0.0.1:8000
+
+    # diff two runs; exits 1 if any scenario regressed beyond --threshold
+    python -m benchmarks.api_bench --compare old.json new.json --threshold 10
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import fnmatch
+import json
+import os
+import platform
+import subprocess
+import sys
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional
+
+import httpx
+
+from benchmarks.common import login, run_load, start_server, stop_server
+
+FILTERS: Dict[str, Callable[["Context"], Dict[str, object]]] = {
+    "none": lambda ctx: {},
+    "bank": lambda ctx: {"bank_id": ctx.bank_id},
+    "branch": lambda ctx: {"branch_id": ctx.branch_id},
+    "created_range": lambda ctx: {
+        "created_from": (date.today() - timedelta(days=90)).isoformat(),
+        "created_to": date.today().isoformat(),
+    },
+    "pending": lambda ctx: {"completion": "PENDING"},
+    "completed": lambda ctx: {"completion": "COMPLETED"},
+    "unpaid": lambda ctx: {"is_paid": "false"},
+}
+SORT_KEYS = ["created_at", "status", "fees", "is_paid", "assignment_code", "id"]
+SORT_DIRS = ["asc", "desc"]
+
+TYPEAHEAD_TERMS = ["ba", "01", "ch", "7", "nt"]
+UPLOAD_BYTES = 64 * 1024
+
+
+@dataclass
+class Context:
+    token: str
+    bank_id: int
+    branch_id: int
+    assignment_ids: List[int]
+    file_id: Optional[int] = None
+
+
+@dataclass
+class Scenario:
+    name: str
+    send: Callable
+    ok_status: tuple = (200,)
+    # Writes and bcrypt logins get a smaller budget than reads
+    weight: float = 1.0
+    # Overrides --concurrency for this scenario
+    concurrency: Optional[int] = None
+
+
+# ---------------------------
+# Setup
+# ---------------------------
+
+def _discover(base: str, headers: Dict[str, str]) -> Context:
+    with httpx.Client(base_url=base, headers=headers, timeout=60) as c:
+        rows = c.get("/api/assignments", params={"limit": 200, "sort_by": "id", "sort_dir": "desc"}).json()
+        if not rows:
+            raise SystemExit("No assignments found; seed first (--seed)")
+        with_branch = next((r for r in rows if r.get("branch_id")), rows[0])
+        return Context(
+            token=headers["Authorization"][7:],
+            bank_id=with_branch.get("bank_id") or 0,
+            branch_id=with_branch.get("branch_id") or 0,
+            assignment_ids=[r["id"] for r in rows],
+        )
+
+
+def _upload_one(base: str, headers: Dict[str, str], assignment_id: int) -> int:
+    files = {"uploaded": ("bench.bin", os.urandom(UPLOAD_BYTES), "application/octet-stream")}
+    r = httpx.post(f"{base}/api/files/upload/{assignment_id}", headers=headers, files=files, timeout=60)
+    r.raise_for_status()
+    return r.json()["file_id"]
+
+
+def build_scenarios(ctx: Context, email: str, password: str) -> List[Scenario]:
+    ids = ctx.assignment_ids
+    pick = lambda i: ids[i % len(ids)]  # noqa: E731
+
+    out: List[Scenario] = [
+        Scenario(
+            "auth.login",
+            lambda c, i: c.post("/api/auth/login", json={"email": email, "password": password}),
+            weight=0.1,
+        ),
+        Scenario("auth.me", lambda c, i: c.get("/api/auth/me")),
+    ]
+
+    for fname, fparams in FILTERS.items():
+        for key in SORT_KEYS:
+            for direction in SORT_DIRS:
+                params = {**fparams(ctx), "sort_by": key, "sort_dir": direction, "limit": 50}
+                out.append(
+                    Scenario(
+                        f"assignments.list[{fname},{key},{direction}]",
+                        lambda c, i, params=params: c.get("/api/assignments", params=params),
+                        weight=0.2,
+                    )
+                )
+
+    out += [
+        Scenario("assignments.summary", lambda c, i: c.get("/api/assignments/summary")),
+        Scenario(
+            "assignments.summary[bank]",
+            lambda c, i: c.get("/api/assignments/summary", params={"bank_id": ctx.bank_id}),
+        ),
+        Scenario("assignments.workload", lambda c, i: c.get("/api/assignments/workload")),
+        Scenario("assignments.mine", lambda c, i: c.get("/api/assignments/mine")),
+        Scenario("assignments.get", lambda c, i: c.get(f"/api/assignments/{pick(i)}")),
+        Scenario("assignments.detail", lambda c, i: c.get(f"/api/assignments/{pick(i)}/detail")),
+        Scenario(
+            "assignments.detail[all]",
+            lambda c, i: c.get(
+                f"/api/assignments/{pick(i)}/detail", params={"include": "files,activity,master"}
+            ),
+        ),
+        Scenario(
+            "assignments.create",
+            lambda c, i: c.post(
+                "/api/assignments",
+                json={
+                    "case_type": "BANK",
+                    "bank_id": ctx.bank_id,
+                    "branch_id": ctx.branch_id,
+                    "borrower_name": f"Bench Borrower {i}",
+                    "fees": 2500,
+                },
+            ),
+            ok_status=(201,),
+            weight=0.25,
+            # generate_assignment_code() is max+1, so parallel creates collide on the unique code
+            concurrency=1,
+        ),
+        Scenario(
+            "assignments.patch",
+            lambda c, i: c.patch(f"/api/assignments/{pick(i)}", json={"notes": f"bench note {i}"}),
+            weight=0.25,
+        ),
+        Scenario(
+            "files.upload",
+            lambda c, i: c.post(
+                f"/api/files/upload/{pick(i)}",
+                files={"uploaded": ("bench.bin", b"\0" * UPLOAD_BYTES, "application/octet-stream")},
+            ),
+            weight=0.25,
+        ),
+        Scenario("files.list", lambda c, i: c.get(f"/api/files/{pick(i)}")),
+        Scenario("files.download", lambda c, i: c.get(f"/api/files/download/{ctx.file_id}")),
+        Scenario("notifications.unread_count", lambda c, i: c.get("/api/notifications/unread-count")),
+        Scenario("notifications.list", lambda c, i: c.get("/api/notifications?limit=20")),
+        Scenario("master.banks", lambda c, i: c.get("/api/master/banks")),
+    ]
+
+    for path in ("branches", "clients", "property-types"):
+        out.append(
+            Scenario(
+                f"master.{path}?q",
+                lambda c, i, path=path: c.get(
+                    f"/api/master/{path}", params={"q": TYPEAHEAD_TERMS[i % len(TYPEAHEAD_TERMS)]}
+                ),
+            )
+        )
+    return out
+
+
+# ---------------------------
+# Run / report
+# ---------------------------
+
+def _git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def _table_counts(base: str, headers: Dict[str, str]) -> Dict[str, int]:
+    with httpx.Client(base_url=base, headers=headers, timeout=120) as c:
+        s = c.get("/api/assignments/summary").json()
+    return {"assignments": s.get("total", 0)}
+
+
+def run(args: argparse.Namespace) -> dict:
+    proc = None
+    base = args.base_url
+    if not base:
+        proc = start_server(args.port, args.workers)
+        base = f"http://127.0.0.1:{args.port}"
+
+    try:
+        headers = {"Authorization": f"Bearer {login(base, args.email, args.password)}"}
+        ctx = _discover(base, headers)
+        ctx.file_id = _upload_one(base, headers, ctx.assignment_ids[0])
+
+        only = [s.strip() for s in (args.only or "").split(",") if s.strip()]
+        scenarios = [
+            s for s in build_scenarios(ctx, args.email, args.password)
+            if not only or any(fnmatch.fnmatchcase(s.name, o) for o in only)
+        ]
+
+        results = []
+        for sc in scenarios:
+            concurrency = sc.concurrency or args.concurrency
+            res = asyncio.run(
+                run_load(
+                    base,
+                    headers,
+                    sc.send,
+                    concurrency=concurrency,
+                    total=max(concurrency, int(args.requests * sc.weight)),
+                    ok_status=sc.ok_status,
+                )
+            )
+            res["name"] = sc.name
+            res["concurrency"] = concurrency
+            results.append(res)
+            # Progress on stderr: stdout carries only the JSON report
+            print(
+                f"{sc.name:<48} {res['rps']:>9.1f} req/s  p50={res['p50_ms']:>8.1f}ms  "
+                f"p99={res['p99_ms']:>8.1f}ms  errors={res['errors']}",
+                file=sys.stderr,
+            )
+
+        return {
+            "meta": {
+                "commit": _git_commit(),
+                "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                "python": platform.python_version(),
+                "base_url": base,
+                "workers": args.workers if proc else None,
+                "concurrency": args.concurrency,
+                "requests": args.requests,
+                "async_db": os.getenv("ZEN_ASYNC_DB", "0"),
+                "data": _table_counts(base, headers),
+            },
+            "results": results,
+        }
+    finally:
+        if proc is not None:
+            stop_server(proc)
+
+
+def compare(old_path: str, new_path: str, threshold_pct: float) -> int:
+    """Print per-scenario deltas. Returns the number of regressions."""
+    with open(old_path) as f:
+        old = {r["name"]: r for r in json.load(f)["results"]}
+    with open(new_path) as f:
+        new = {r["name"]: r for r in json.load(f)["results"]}
+
+    def pct(a: float, b: float) -> float:
+        return (b - a) / a * 100.0 if a else 0.0
+
+    regressions = 0
+    print(f"{'scenario':<48} {'p50 Δ%':>8} {'p99 Δ%':>8} {'rps Δ%':>8}")
+    for name in sorted(set(old) & set(new)):
+        o, n = old[name], new[name]
+        d50, d99, drps = pct(o["p50_ms"], n["p50_ms"]), pct(o["p99_ms"], n["p99_ms"]), pct(o["rps"], n["rps"])
+        bad = d50 > threshold_pct or d99 > threshold_pct or drps < -threshold_pct or n["errors"] > o["errors"]
+        regressions += bad
+        print(f"{name:<48} {d50:>+8.1f} {d99:>+8.1f} {drps:>+8.1f}{'  REGRESSION' if bad else ''}")
+
+    for name in sorted(set(old) ^ set(new)):
+        print(f"{name:<48} only in {'old' if name in old else 'new'}")
+
+    print(f"\n{regressions} regression(s) beyond {threshold_pct:.0f}%")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="API latency/throughput benchmark")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"))
+    parser.add_argument("--threshold", type=float, default=10.0, help="Regression threshold in percent")
+
+    parser.add_argument("--seed", action="store_true", help="Seed synthetic data before running")
+    parser.add_argument("--truncate", action="store_true", help="With --seed: TRUNCATE data tables first")
+    parser.add_argument("--seed-only", action="store_true")
+
+    parser.add_argument("--base-url", default=None, help="Use a running server instead of spawning uvicorn")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per read scenario")
+    parser.add_argument("--only", default=None, help="Comma-separated scenario name globs, e.g. 'auth.*,assignments.list[none*'")
+    parser.add_argument("--out", default=None, help="Write JSON results here (default: stdout)")
+    parser.add_argument("--email", default="admin@zenops.in")
+    parser.add_argument("--password", default="admin123")
+
+    from app.utils import synthetic_data
+
+    synthetic_data.add_volume_args(parser)
+    args = parser.parse_args()
+
+    if args.compare:
+        sys.exit(1 if compare(args.compare[0], args.compare[1], args.threshold) else 0)
+
+    if args.seed or args.seed_only:
+        with contextlib.redirect_stdout(sys.stderr):
+            synthetic_data.generate(synthetic_data.config_from_args(args), wipe=args.truncate)
+        if args.seed_only:
+            return
+
+    report = run(args)
+    payload = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(payload + "\n")
+        print(f"[BENCH] wrote {args.out}", file=sys.stderr)
+    else:
+        print(payload)
+
+
+if __name__ == "__main__":
+    main()
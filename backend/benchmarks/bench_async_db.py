@@ -0,0 +1,64 @@
+"""
+Throughput comparison: sync (psycopg2 + thread pool) vs async (asyncpg) read path.
+
+Starts `uvicorn app.main:app` twice — ZEN_ASYNC_DB=0 then ZEN_ASYNC_DB=1 — and
+hammers the hot read endpoints with N concurrent clients.
+
+Usage (from backend/, DB migrated + seeded, admin login working):
+    python -m benchmarks.bench_async_db
+    python -m benchmarks.bench_async_db --concurrency 128 --seconds 15 --workers 1
+
+Prints req/sec and p50/p99 latency per mode + endpoint.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+
+from benchmarks.common import login, run_load, start_server, stop_server
+
+ENDPOINTS = [
+    "/api/assignments?limit=50",
+    "/api/assignments/summary",
+    "/api/master/banks",
+    "/api/master/branches",
+]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Sync vs async DB throughput")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--email", default="admin@zenops.in")
+    parser.add_argument("--password", default="admin123")
+    args = parser.parse_args()
+
+    for mode in (False, True):
+        proc = start_server(args.port, args.workers, env={"ZEN_ASYNC_DB": "1" if mode else "0"})
+        try:
+            base = f"http://127.0.0.1:{args.port}"
+            headers = {"Authorization": f"Bearer {login(base, args.email, args.password)}"}
+
+            label = "async" if mode else "sync"
+            for path in ENDPOINTS:
+                res = asyncio.run(
+                    run_load(
+                        base,
+                        headers,
+                        lambda client, i, path=path: client.get(path),
+                        concurrency=args.concurrency,
+                        seconds=args.seconds,
+                    )
+                )
+                print(
+                    f"{label:<5} {path:<32} {res['rps']:>9.1f} req/s  "
+                    f"p50={res['p50_ms']:.1f}ms  p99={res['p99_ms']:.1f}ms  errors={res['errors']}"
+                )
+        finally:
+            stop_server(proc)
+
+
+if __name__ == "__main__":
+    main()
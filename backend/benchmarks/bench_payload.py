@@ -0,0 +1,81 @@
+"""
+Bytes on the wire and latency for one 500-row assignments page: every column
+vs a ?fields= projection, each with no compression, gzip and brotli.
+
+Starts its own uvicorn (like api_bench) against DATABASE_URL, which must
+already hold data (see app/utils/synthetic_data.py).
+
+Usage (from backend/):
+    python -m benchmarks.bench_payload
+    python -m benchmarks.bench_payload --rows 500 --repeat 50 --fields id,assignment_code,status,report_due_date
+"""
+from __future__ import annotations
+
+import argparse
+import statistics
+import time
+
+import httpx
+
+from benchmarks.common import login, percentile, start_server, stop_server
+
+# What the assignments table view shows
+DEFAULT_FIELDS = "id,assignment_code,bank_name,branch_name,borrower_name,status,report_due_date,fees"
+
+ENCODINGS = ["identity", "gzip", "br"]
+
+
+def measure(client: httpx.Client, params: dict, encoding: str, repeat: int) -> dict:
+    latencies = []
+    wire = body = 0
+    for _ in range(repeat + 1):
+        t0 = time.perf_counter()
+        r = client.get("/api/assignments", params=params, headers={"Accept-Encoding": encoding})
+        r.raise_for_status()
+        elapsed = (time.perf_counter() - t0) * 1000
+        wire, body = r.num_bytes_downloaded, len(r.content)
+        latencies.append(elapsed)
+    latencies = latencies[1:]  # first request warms caches
+    return {
+        "wire_bytes": wire,
+        "json_bytes": body,
+        "encoding": r.headers.get("content-encoding", "identity"),
+        "p50_ms": round(percentile(latencies, 50), 2),
+        "p90_ms": round(percentile(latencies, 90), 2),
+        "mean_ms": round(statistics.fmean(latencies), 2),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="List payload size / latency benchmark")
+    parser.add_argument("--rows", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=30)
+    parser.add_argument("--fields", default=DEFAULT_FIELDS)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--email", default="admin@zenops.in")
+    parser.add_argument("--password", default="admin123")
+    args = parser.parse_args()
+
+    proc = start_server(args.port, env={"ZEN_SCHEDULER_ENABLED": "0", "ZEN_STREAM_ENABLED": "0"})
+    try:
+        base = f"http://127.0.0.1:{args.port}"
+        token = login(base, args.email, args.password)
+        with httpx.Client(base_url=base, headers={"Authorization": f"Bearer {token}"}, timeout=60) as client:
+            print(f"[payload] GET /api/assignments?limit={args.rows}, {args.repeat} requests each")
+            print(f"  {'columns':<10} {'encoding':<9} {'wire KB':>9} {'json KB':>9} {'p50 ms':>8} {'p90 ms':>8}")
+            for label, fields in (("all", None), ("projected", args.fields)):
+                params = {"limit": args.rows}
+                if fields:
+                    params["fields"] = fields
+                for accept in ENCODINGS:
+                    m = measure(client, params, accept, args.repeat)
+                    print(
+                        f"  {label:<10} {m['encoding']:<9} {m['wire_bytes'] / 1024:>9.1f} "
+                        f"{m['json_bytes'] / 1024:>9.1f} {m['p50_ms']:>8.2f} {m['p90_ms']:>8.2f}"
+                    )
+    finally:
+        stop_server(proc)
+
+
+if __name__ == "__main__":
+    main()
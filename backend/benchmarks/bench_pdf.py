@@ -0,0 +1,114 @@
+"""
+Invoice PDF throughput in documents per second.
+
+No server or DB needed: renders synthetic invoices with the real layout
+(app.utils.pdf.render_invoice), first serially in-process, then through a
+spawned ProcessPoolExecutor at several worker counts (the same setup as the
+API and the monthly batch in app.utils.invoice_pdf). Finally it times
+cache hits (content hash plus a file-exists check).
+
+Usage (from backend/):
+    python -m benchmarks.bench_pdf
+    python -m benchmarks.bench_pdf --docs 2000 --items 150 --workers 1,2,4,8
+"""
+from __future__ import annotations
+
+import argparse
+import multiprocessing
+import os
+import random
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from app.utils.pdf import render_invoice
+
+
+def make_docs(n: int, items: int, seed: int = 7) -> list[dict]:
+    rnd = random.Random(seed)
+    docs = []
+    for i in range(n):
+        k = max(1, int(rnd.gauss(items, items / 3)))
+        rows = [
+            {
+                "assignment_code": f"VAL/2026/{rnd.randint(1, 99999):05d}",
+                "borrower_name": f"Borrower {rnd.randint(1, 10**6)}",
+                "branch_name": f"Branch {rnd.randint(1, 400)}",
+                "amount": rnd.choice((2500, 3500, 5000, 7500, 12000)),
+            }
+            for _ in range(k)
+        ]
+        docs.append(
+            {
+                "id": i + 1,
+                "invoice_number": f"INV/2026/{i + 1:04d}",
+                "bank_id": 1,
+                "branch_id": None,
+                "period_from": "2026-10-01",
+                "period_to": "2026-10-31",
+                "issue_date": "2026-10-31",
+                "status": "ISSUED",
+                "item_count": k,
+                "total_amount": sum(r["amount"] for r in rows),
+                "payee_account_name": "Zen Valuers",
+                "payee_account_number": "001122334455",
+                "payee_ifsc": "ZEN0000001",
+                "payee_bank_name": "State Bank",
+                "payee_branch_name": "Camp",
+                "payee_upi_id": "zen@upi",
+                "notes": "Payable within 15 days",
+                "bank_name": "State Bank",
+                "branch_name": None,
+                "items": rows,
+            }
+        )
+    return docs
+
+
+def main() -> None:
+    cpus = os.cpu_count() or 1
+    parser = argparse.ArgumentParser(description="Invoice PDF docs/sec")
+    parser.add_argument("--docs", type=int, default=500)
+    parser.add_argument("--items", type=int, default=60, help="mean line items per invoice")
+    parser.add_argument(
+        "--workers",
+        default=",".join(str(w) for w in sorted({1, 2, 4, cpus})),
+        help="comma-separated pool sizes",
+    )
+    args = parser.parse_args()
+
+    docs = make_docs(args.docs, args.items)
+    print(f"{args.docs} invoices, ~{args.items} items each, {cpus} CPUs")
+
+    t0 = time.perf_counter()
+    sizes = [len(render_invoice(d)) for d in docs]
+    serial = time.perf_counter() - t0
+    print(f"{'serial':<12} {args.docs / serial:>9.1f} docs/s  (avg {sum(sizes) / len(sizes) / 1024:.1f} KiB)")
+
+    for w in (int(x) for x in args.workers.split(",") if x.strip()):
+        with ProcessPoolExecutor(max_workers=w, mp_context=multiprocessing.get_context("spawn")) as pool:
+            list(pool.map(render_invoice, docs[:w]))  # warm up: spawn + import
+            t0 = time.perf_counter()
+            list(pool.map(render_invoice, docs, chunksize=max(1, len(docs) // (w * 4))))
+            elapsed = time.perf_counter() - t0
+        print(f"{f'pool x{w}':<12} {args.docs / elapsed:>9.1f} docs/s  ({serial / elapsed:.2f}x serial)")
+
+    # Cache hits: what an unchanged invoice costs after the first render
+    import app.utils.invoice_pdf as invoice_pdf
+
+    tmp = tempfile.mkdtemp(prefix="zen-pdf-bench-")
+    try:
+        invoice_pdf.CACHE_DIR = tmp
+        for d, size in zip(docs, sizes):
+            invoice_pdf._store(invoice_pdf.content_key(d), b"\0" * size)
+        t0 = time.perf_counter()
+        hits = sum(os.path.exists(invoice_pdf.cache_path(invoice_pdf.content_key(d))) for d in docs)
+        elapsed = time.perf_counter() - t0
+        print(f"{'cache hit':<12} {hits / elapsed:>9.1f} docs/s")
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
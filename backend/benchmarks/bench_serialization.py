@@ -0,0 +1,146 @@
+"""
+Microbenchmark: list-endpoint serialization, before vs after the lean path.
+
+  before: ORM objects -> List[AssignmentRead] validation -> jsonable dump -> stdlib json
+  after:  Core row tuples -> dicts -> orjson
+
+Usage (from backend/):
+    python -m benchmarks.bench_serialization                 # in-memory rows, no DB needed
+    python -m benchmarks.bench_serialization --rows 500 --repeat 200
+    python -m benchmarks.bench_serialization --db            # also time query + hydrate against DATABASE_URL
+
+Prints rows/sec for each path (higher is better).
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from collections import namedtuple
+from datetime import date, datetime, timedelta
+from typing import Callable, List
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+from app.models.assignment import Assignment
+from app.schemas.assignment import AssignmentRead
+from app.utils.fastjson import rows_to_dicts, schema_columns
+
+FIELDS = list(AssignmentRead.model_fields)
+Row = namedtuple("Row", FIELDS)
+LIST_ADAPTER = TypeAdapter(List[AssignmentRead])
+
+
+def _sample(i: int) -> dict:
+    now = datetime(2025, 1, 1) + timedelta(minutes=i)
+    return {
+        "id": i,
+        "assignment_code": f"VAL/2025/{i:04d}",
+        "case_type": "BANK",
+        "bank_id": 1 + i % 40,
+        "branch_id": 1 + i % 900,
+        "client_id": None,
+        "property_type_id": 1 + i % 6,
+        "bank_name": "State Bank of India",
+        "branch_name": f"Branch {i % 900}",
+        "valuer_client_name": None,
+        "property_type": "Residential Plot",
+        "borrower_name": f"Borrower {i}",
+        "phone": "9876543210",
+        "address": "Plot 12, Ward 4, Near Bus Stand, Mudhol, Bagalkot District, Karnataka " * 2,
+        "land_area": 1200.5,
+        "builtup_area": 950.0,
+        "status": "SITE_VISIT" if i % 3 else "COMPLETED",
+        "assigned_to": "field.valuer",
+        "assigned_to_user_id": 1 + i % 25,
+        "site_visit_date": date(2025, 1, 2),
+        "report_due_date": date(2025, 1, 9),
+        "fees": 3500,
+        "is_paid": bool(i % 2),
+        "notes": "Owner present at visit. Documents verified against sale deed." * 3,
+        "created_at": now,
+        "updated_at": now,
+    }
+
+
+def before(objs) -> bytes:
+    # What FastAPI does for response_model=List[AssignmentRead] + JSONResponse
+    validated = LIST_ADAPTER.validate_python(objs, from_attributes=True)
+    content = jsonable_encoder(LIST_ADAPTER.dump_python(validated, mode="json"))
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+def after(rows) -> bytes:
+    return orjson.dumps(rows_to_dicts(rows))
+
+
+def _rate(fn: Callable, payload, n_rows: int, repeat: int) -> float:
+    fn(payload)  # warm-up
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        fn(payload)
+    elapsed = time.perf_counter() - t0
+    return n_rows * repeat / elapsed
+
+
+def bench_memory(n_rows: int, repeat: int) -> None:
+    data = [_sample(i) for i in range(1, n_rows + 1)]
+    objs = [Assignment(**d) for d in data]
+    rows = [Row(**d) for d in data]
+
+    b = _rate(before, objs, n_rows, repeat)
+    a = _rate(after, rows, n_rows, repeat)
+    print(f"[serialize] rows={n_rows} repeat={repeat}")
+    print(f"  before (ORM + Pydantic + json): {b:>12,.0f} rows/sec")
+    print(f"  after  (rows + orjson):         {a:>12,.0f} rows/sec   ({a / b:.1f}x)")
+
+
+def bench_db(n_rows: int, repeat: int) -> None:
+    from app.db import SessionLocal
+
+    db = SessionLocal()
+    try:
+        def before_db(_):
+            objs = db.query(Assignment).order_by(Assignment.created_at.desc()).limit(n_rows).all()
+            db.expunge_all()
+            return before(objs)
+
+        def after_db(_):
+            rows = (
+                db.query(*schema_columns(Assignment, AssignmentRead))
+                .order_by(Assignment.created_at.desc())
+                .limit(n_rows)
+                .all()
+            )
+            return after(rows)
+
+        got = db.query(Assignment.id).limit(n_rows).count()
+        if not got:
+            print("[db] assignments table is empty; seed it first")
+            return
+
+        b = _rate(before_db, None, got, repeat)
+        a = _rate(after_db, None, got, repeat)
+        print(f"[query+serialize] rows={got} repeat={repeat}")
+        print(f"  before (ORM hydrate + Pydantic + json): {b:>12,.0f} rows/sec")
+        print(f"  after  (Core rows + orjson):            {a:>12,.0f} rows/sec   ({a / b:.1f}x)")
+    finally:
+        db.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="List serialization microbenchmark")
+    parser.add_argument("--rows", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=100)
+    parser.add_argument("--db", action="store_true", help="Also benchmark against DATABASE_URL")
+    args = parser.parse_args()
+
+    bench_memory(args.rows, args.repeat)
+    if args.db:
+        bench_db(args.rows, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
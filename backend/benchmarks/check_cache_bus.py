@@ -0,0 +1,123 @@
+"""
+Cross-process check of the cache invalidation bus (app/utils/cache.py).
+
+Starts two uvicorn servers (separate processes, like two workers or two
+hosts) against DATABASE_URL, warms the master-data caches on both, renames a
+bank through server A and reports:
+    - A serves the new name on the very next request (evicted at commit)
+    - how long until B serves it (NOTIFY round trip)
+    - cached vs uncached latency of GET /api/master/banks
+The bank's name is restored afterwards.
+
+Usage (from backend/):
+    python -m benchmarks.check_cache_bus
+    python -m benchmarks.check_cache_bus --rounds 20
+"""
+from __future__ import annotations
+
+import argparse
+import re
+import statistics
+import time
+import uuid
+
+import httpx
+
+from benchmarks.common import login, percentile, start_server, stop_server
+
+
+def bank_names(client: httpx.Client) -> dict:
+    r = client.get("/api/master/banks")
+    r.raise_for_status()
+    return {b["id"]: b["name"] for b in r.json()}
+
+
+def cache_hits(client: httpx.Client, namespace: str) -> int:
+    text = client.get("/api/metrics").text
+    m = re.search(rf'zen_cache_requests_total{{namespace="{re.escape(namespace)}",result="hit"}} (\d+)', text)
+    return int(m.group(1)) if m else 0
+
+
+def rename(client: httpx.Client, bank_id: int, name: str) -> None:
+    client.patch(f"/api/master/banks/{bank_id}", json={"name": name}).raise_for_status()
+
+
+def timed_get(client: httpx.Client, repeat: int) -> list:
+    out = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        client.get("/api/master/banks").raise_for_status()
+        out.append((time.perf_counter() - t0) * 1000)
+    return out
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Cache invalidation across processes")
+    parser.add_argument("--rounds", type=int, default=10)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--email", default="admin@zenops.in")
+    parser.add_argument("--password", default="admin123")
+    args = parser.parse_args()
+
+    env = {"ZEN_SCHEDULER_ENABLED": "0"}
+    servers = [start_server(args.port, env=env), start_server(args.port + 1, env=env)]
+    try:
+        base_a, base_b = (f"http://127.0.0.1:{args.port + i}" for i in range(2))
+        token = login(base_a, args.email, args.password)
+        headers = {"Authorization": f"Bearer {token}"}
+        with httpx.Client(base_url=base_a, headers=headers, timeout=30) as a, httpx.Client(
+            base_url=base_b, headers=headers, timeout=30
+        ) as b:
+            bank_id, original = next(iter(bank_names(a).items()))
+            # Caches only serve once the LISTEN connection is up
+            for _ in range(50):
+                hits_before = cache_hits(b, "master.banks")
+                bank_names(b)
+                if cache_hits(b, "master.banks") > hits_before:
+                    break
+                time.sleep(0.1)
+            else:
+                raise SystemExit("B never served banks from its cache (is the LISTEN connection up?)")
+
+            delays = []
+            stale_on_writer = 0
+            try:
+                for i in range(args.rounds):
+                    name = f"{original[:150]} cache-check-{uuid.uuid4().hex[:8]}"
+                    bank_names(a), bank_names(b)  # both cached
+                    rename(a, bank_id, name)
+                    t0 = time.perf_counter()
+                    if bank_names(a)[bank_id] != name:
+                        stale_on_writer += 1
+                    while bank_names(b)[bank_id] != name:
+                        if time.perf_counter() - t0 > 5:
+                            raise SystemExit(f"round {i}: B still served the old name after 5s")
+                        time.sleep(0.002)
+                    delays.append((time.perf_counter() - t0) * 1000)
+            finally:
+                rename(a, bank_id, original)
+
+            cached = timed_get(b, 50)
+            uncached = []
+            for _ in range(20):
+                rename(a, bank_id, original)  # same name, still invalidates
+                time.sleep(0.05)
+                uncached.extend(timed_get(b, 1))
+
+            print(f"[cache-bus] {args.rounds} renames through A, read back through B")
+            print(f"  writer (A) stale reads after commit: {stale_on_writer}")
+            print(
+                f"  B saw the change after: p50 {percentile(delays, 50):.1f} ms, "
+                f"max {max(delays):.1f} ms"
+            )
+            print(
+                f"  GET /api/master/banks on B: cached p50 {percentile(cached, 50):.2f} ms, "
+                f"after invalidation p50 {statistics.median(uncached):.2f} ms"
+            )
+    finally:
+        for proc in servers:
+            stop_server(proc)
+
+
+if __name__ == "__main__":
+    main()
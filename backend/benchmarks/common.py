@@ -0,0 +1,119 @@
+"""Shared helpers for the HTTP benchmarks (server lifecycle + load loop + stats). Needs requirements-bench.txt."""
+from __future__ import annotations
+
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Awaitable, Callable, Dict, Optional
+
+import httpx
+
+
+def percentile(values, p: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    idx = min(len(values) - 1, int(round(p / 100.0 * (len(values) - 1))))
+    return values[idx]
+
+
+def start_server(port: int, workers: int = 1, env: Optional[Dict[str, str]] = None) -> subprocess.Popen:
+    """Start `uvicorn app.main:app` (cwd must be backend/) and wait for /api/health."""
+    proc = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "app.main:app",
+            "--port", str(port), "--workers", str(workers), "--log-level", "warning",
+        ],
+        # Load generators would trip the per-user rate limits
+        env={"ZEN_RATE_LIMIT": "0", **os.environ, **(env or {})},
+        # The app's own log lines must not mix into a benchmark's stdout report
+        stdout=sys.stderr,
+    )
+    base = f"http://127.0.0.1:{port}"
+    for _ in range(150):
+        try:
+            if httpx.get(f"{base}/api/health", timeout=1).status_code == 200:
+                return proc
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.1)
+    proc.terminate()
+    raise RuntimeError("uvicorn did not start")
+
+
+def stop_server(proc: subprocess.Popen) -> None:
+    proc.terminate()
+    try:
+        proc.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+
+
+def login(base: str, email: str, password: str) -> str:
+    r = httpx.post(f"{base}/api/auth/login", json={"email": email, "password": password}, timeout=30)
+    r.raise_for_status()
+    return r.json()["access_token"]
+
+
+RequestFn = Callable[[httpx.AsyncClient, int], Awaitable[httpx.Response]]
+
+
+async def run_load(
+    base: str,
+    headers: Dict[str, str],
+    send: RequestFn,
+    *,
+    concurrency: int,
+    total: Optional[int] = None,
+    seconds: Optional[float] = None,
+    ok_status: tuple = (200,),
+) -> dict:
+    """
+    Fire `send(client, i)` from `concurrency` workers until `total` requests
+    (or `seconds`) are done. Returns latency percentiles (ms) and throughput.
+    """
+    latencies: list[float] = []
+    errors = 0
+    counter = 0
+    deadline = time.perf_counter() + seconds if seconds else None
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base, headers=headers, limits=limits, timeout=30) as client:
+        async def worker():
+            nonlocal errors, counter
+            while True:
+                if total is not None and counter >= total:
+                    return
+                if deadline is not None and time.perf_counter() >= deadline:
+                    return
+                i = counter
+                counter += 1
+
+                t0 = time.perf_counter()
+                try:
+                    r = await send(client, i)
+                    ok = r.status_code in ok_status
+                except httpx.HTTPError:
+                    ok = False
+                latencies.append((time.perf_counter() - t0) * 1000)
+                if not ok:
+                    errors += 1
+
+        t_start = time.perf_counter()
+        await asyncio.gather(*[worker() for _ in range(concurrency)])
+        elapsed = time.perf_counter() - t_start
+
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "seconds": round(elapsed, 4),
+        "rps": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        "mean_ms": round(statistics.fmean(latencies), 3) if latencies else 0.0,
+        "p50_ms": round(percentile(latencies, 50), 3),
+        "p90_ms": round(percentile(latencies, 90), 3),
+        "p99_ms": round(percentile(latencies, 99), 3),
+        "max_ms": round(max(latencies), 3) if latencies else 0.0,
+    }